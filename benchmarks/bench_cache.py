@@ -0,0 +1,110 @@
+"""
+Cache latency: Django's DatabaseCache, the SQLiteCache shared tier and the
+two-tier cache (per-process LRU in front of SQLiteCache), for the keys every
+page render reads plus a burst of writes past MAX_ENTRIES; then the size and
+load time of homepage_context built from model instances versus snapshots.
+
+    python benchmarks/bench_cache.py [--iterations N]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kiri_project.settings')
+    os.environ.setdefault('DEBUG', 'True')
+    import django
+    from django.conf import settings
+    django.setup()
+    workdir = tempfile.mkdtemp(prefix='kiri-bench-')
+    settings.DATABASES['default']['NAME'] = os.path.join(workdir, 'bench.sqlite3')
+    settings.CACHES['shared']['LOCATION'] = os.path.join(workdir, 'cache.sqlite3')
+    settings.CACHES['markdown']['LOCATION'] = os.path.join(workdir, 'markdown-cache.sqlite3')
+    settings.CACHES['database'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'kiri_cache_table',
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    }
+    settings.DEBUG = False
+
+    from django.core.cache import caches
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    call_command('createcachetable', verbosity=0)
+
+    backends = (('DatabaseCache', caches['database']), ('SQLiteCache', caches['shared']), ('TieredCache', caches['default']))
+    # Roughly what the context processors and homepage store
+    values = {
+        'active_projects_sidebar': [{'name': f'Project {i}', 'slug': f'project-{i}'} for i in range(5)],
+        'kiri_platforms_active': [{'name': f'P{i}', 'live_url': f'https://p{i}.kiri.ng'} for i in range(8)],
+        'homepage_context': {'projects': [{'name': f'Project {i}', 'stars': i} for i in range(40)]},
+    }
+    keys = list(values)
+
+    for label, backend in backends:
+        backend.set_many(values, 300)
+        seconds = min(timeit.repeat(lambda: [backend.get(k) for k in keys], number=args.iterations, repeat=3))
+        print(f"{label:<14} {seconds / args.iterations / len(keys) * 1e6:8.1f} us/get")
+
+    # Write churn: 3x MAX_ENTRIES distinct keys, so every backend has to cull
+    payload = 'x' * 2048
+    for label, backend in backends[:2]:
+        start = timeit.default_timer()
+        for i in range(6000):
+            backend.set(f'churn:{label}:{i}', payload, 300)
+        seconds = timeit.default_timer() - start
+        print(f"{label:<14} {seconds / 6000 * 1e6:8.1f} us/set under eviction")
+
+    homepage_payloads(args.iterations)
+
+
+def homepage_payloads(iterations):
+    from projects.models import Project
+    from publications.models import Publication
+    from kiri_project.sqlite_cache import SQLiteCache
+    from core.views import _homepage_context
+
+    Project.objects.bulk_create([
+        Project(
+            name=f"Project {i}", slug=f"project-{i}", description="Lorem ipsum dolor sit amet. " * 150,
+            github_repo_url=f"https://github.com/kiri-labs/project-{i}", tech_stack="Django, HTMX, SQLite",
+            is_featured=i < 8,
+        )
+        for i in range(40)
+    ])
+    Publication.objects.bulk_create([
+        Publication(
+            repo_name=f"pub-{i}", title=f"Publication {i}", slug=f"pub-{i}",
+            html_content="<p>Research notes.</p>" * 2000, github_url=f"https://github.com/kiri-labs/pub-{i}",
+        )
+        for i in range(10)
+    ])
+
+    featured = list(Project.objects.filter(is_featured=True).order_by('-created_at')[:8])
+    instances = {
+        'featured_projects': featured,
+        'latest_projects': list(Project.objects.order_by('-created_at')[:5]),
+        'latest_publications': list(Publication.objects.order_by('-published_at')[:4]),
+    }
+    compressing = SQLiteCache(':memory:', {'OPTIONS': {'COMPRESS_MIN_BYTES': 4096}})
+    for label, context in (('model instances', instances), ('snapshots', _homepage_context())):
+        stored = compressing._dumps(context)
+        seconds = min(timeit.repeat(lambda: compressing._loads(stored), number=iterations // 10, repeat=3))
+        print(
+            f"homepage_context, {label:<16} {len(pickle.dumps(context, -1)):>8} B pickled, "
+            f"{len(stored):>7} B stored, {seconds / (iterations // 10) * 1e6:7.1f} us/load"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Microbenchmark for publications.utils.process_markdown.
+
+Compares building a new Markdown instance per call (the old behaviour) with
+the pooled, reset() engine, a render-cache hit, and re-rendering a long
+article after a one-paragraph edit (block cache).
+
+    python benchmarks/bench_markdown.py [--iterations N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+
+settings.configure(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # publications.utils.RENDER_CACHE_ALIAS
+    "markdown": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "markdown"},
+})
+
+import markdown  # noqa: E402
+from publications.utils import (  # noqa: E402
+    MARKDOWN_EXTENSIONS, get_markdown_engine, process_markdown, rewrite_relative_links,
+)
+
+SAMPLE = """# Edge Inference Notes
+
+Short intro with a [relative link](docs/setup.md) and ![a diagram](img/arch.png).
+
+## Setup
+
+| Flag | Meaning |
+|------|---------|
+| `-q` | quiet   |
+
+```python
+def handler(event):
+    return {"status": 200, "body": event}
+```
+
+## Results
+
+A paragraph of prose that goes on for a while to resemble a typical README section.
+"""
+
+
+# A long technical article: many sections, each with a code sample
+ARTICLE_SECTION = """## Step {n}
+
+Some explanation of step {n} that runs for a sentence or two.
+
+```python
+def step_{n}(values):
+    total = sum(v * {n} for v in values if v % 2 == 0)
+    return {{"step": {n}, "total": total}}
+```
+"""
+ARTICLE = "# Article\n\n" + "\n".join(ARTICLE_SECTION.format(n=n) for n in range(30))
+_edits = iter(range(10 ** 9))
+
+
+def fresh_instance():
+    text = rewrite_relative_links("kiri-labs", "edge-notes", "main", SAMPLE)
+    return markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+
+
+def pooled_engine():
+    text = rewrite_relative_links("kiri-labs", "edge-notes", "main", SAMPLE)
+    return get_markdown_engine().convert(text)
+
+
+def setup_only_fresh():
+    return markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+
+
+def setup_only_pooled():
+    return get_markdown_engine()
+
+
+def cache_hit():
+    return process_markdown("kiri-labs", "edge-notes", "main", SAMPLE)
+
+
+def article_full_render():
+    text = ARTICLE.replace("step 0 that", f"step 0 (rev {next(_edits)}) that")
+    return get_markdown_engine().convert(text)
+
+
+def article_after_edit():
+    text = ARTICLE.replace("step 0 that", f"step 0 (rev {next(_edits)}) that")
+    return process_markdown("kiri-labs", "edge-notes", "main", text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    assert fresh_instance() == pooled_engine()
+    process_markdown("kiri-labs", "edge-notes", "main", SAMPLE)
+
+    cases = [
+        ("setup: new Markdown()", setup_only_fresh),
+        ("setup: pooled reset()", setup_only_pooled),
+        ("render: new instance", fresh_instance),
+        ("render: pooled engine", pooled_engine),
+        ("render: cache hit", cache_hit),
+        ("article: full render", article_full_render),
+        ("article: edit, blocks", article_after_edit),
+    ]
+    for label, fn in cases:
+        seconds = min(timeit.repeat(fn, number=args.iterations, repeat=3))
+        print(f"{label:<24} {seconds / args.iterations * 1e6:10.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
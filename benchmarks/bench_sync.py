@@ -0,0 +1,174 @@
+"""
+Sync benchmark against the offline GitHub stand-in (benchmarks/fake_github.py).
+
+Seeds a throwaway SQLite database with projects pointing at fake repositories,
+then times full runs of the project sync, sync_publications (cold, then
+incremental after some repos change) and GitHubService.fetch_user_public_repos.
+Reports wall time, API requests, DB write time and peak RSS per phase.
+
+    python benchmarks/bench_sync.py --repos 1500 --projects 1000 --latency 0.05
+    python benchmarks/bench_sync.py --rest        # no token: REST fallbacks only
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_github import FakeGitHub, serve  # noqa: E402
+
+
+class WriteTimer:
+    """connection.execute_wrapper that adds up time spent in INSERT/UPDATE/DELETE."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.statements = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.statements += 1
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def phase(label, fake, results):
+    from django.core.cache import cache
+    from django.db import connection
+    from projects.ratelimit import GitHubRateBudget
+
+    # Each phase starts from empty caches, like a fresh worker after expiry
+    cache.clear()
+    GitHubRateBudget._local.clear()
+    GitHubRateBudget._last_written.clear()
+
+    before = sum(v for k, v in fake.counts.items() if k.startswith(('GET', 'POST')))
+    not_modified = fake.counts['not_modified']
+    timer = WriteTimer()
+    start = time.perf_counter()
+    with connection.execute_wrapper(timer):
+        yield
+    wall = time.perf_counter() - start
+    results.append({
+        'phase': label,
+        'wall_s': wall,
+        'requests': sum(v for k, v in fake.counts.items() if k.startswith(('GET', 'POST'))) - before,
+        'not_modified': fake.counts['not_modified'] - not_modified,
+        'db_write_s': timer.seconds,
+        'db_writes': timer.statements,
+        'peak_rss_mb': peak_rss_mb(),
+    })
+
+
+def seed_projects(count, owner):
+    from projects.models import Project
+
+    Project.objects.bulk_create([
+        Project(
+            name=f"Project {n}",
+            slug=f"project-{n}",
+            description="Benchmark project",
+            github_repo_url=f"https://github.com/{owner}/repo-{n:05d}",
+        )
+        for n in range(count)
+    ], batch_size=500)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repos', type=int, default=1200, help="Repositories in the fake organization")
+    parser.add_argument('--projects', type=int, default=1000, help="Projects seeded against those repos")
+    parser.add_argument('--changed', type=float, default=0.1, help="Fraction of repos pushed between syncs")
+    parser.add_argument('--latency', type=float, default=0.03, help="Seconds added to every API response")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=None)
+    parser.add_argument('--rest', action='store_true', help="Run without a token (REST fallbacks)")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(repos=args.repos, latency=args.latency, rate_limit=10 ** 6, error_rate=args.error_rate)
+    server, base_url = serve(fake)
+
+    workdir = tempfile.mkdtemp(prefix='kiri-bench-')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kiri_project.settings')
+    os.environ.setdefault('DEBUG', 'True')
+    os.environ['GITHUB_API_URL'] = base_url
+    if args.rest:
+        os.environ.pop('GITHUB_TOKEN', None)
+    else:
+        os.environ['GITHUB_TOKEN'] = 'fake-token'
+
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.DATABASES['default']['NAME'] = os.path.join(workdir, 'bench.sqlite3')
+    settings.CACHES['shared']['LOCATION'] = os.path.join(workdir, 'cache.sqlite3')
+    settings.CACHES['markdown']['LOCATION'] = os.path.join(workdir, 'markdown-cache.sqlite3')
+    settings.DEBUG = False
+    if args.concurrency:
+        settings.GITHUB_SYNC_CONCURRENCY = args.concurrency
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+    from projects.models import Project
+    from projects.services import GitHubService
+    from kiri_project import tasks
+
+    seed_projects(min(args.projects, args.repos), fake.owner)
+    results = []
+
+    # Facebook posting for newly created publications is not part of the sync cost
+    with patch.object(tasks, 'post_to_facebook'):
+        with phase('projects: full sync', fake, results):
+            tasks._sync_projects(list(Project.objects.all()), force=True)
+
+        with phase('projects: re-sync (conditional)', fake, results):
+            tasks._sync_projects(list(Project.objects.all()), force=True)
+
+        with phase('publications: cold', fake, results):
+            tasks.sync_publications.call_local()
+
+        for n, name in enumerate(sorted(fake.repos)[:int(args.repos * args.changed)]):
+            fake.touch(
+                name,
+                pushed_at='2026-10-01T10:00:00Z',
+                readme=fake.repos[name]['readme'] + f"\nUpdate {n}.\n",
+            )
+        with phase(f'publications: {args.changed:.0%} changed', fake, results):
+            tasks.sync_publications.call_local()
+
+        with phase('user repos listing', fake, results):
+            repos = GitHubService.fetch_user_public_repos(fake.owner)
+        assert len(repos) == args.repos, len(repos)
+
+    server.shutdown()
+
+    mode = 'REST' if args.rest else 'GraphQL'
+    print(f"{args.repos} repos, {min(args.projects, args.repos)} projects, {args.latency * 1000:.0f} ms latency, {mode}")
+    print(f"{'phase':<34}{'wall s':>9}{'requests':>10}{'304s':>7}{'db write s':>12}{'writes':>8}{'peak MB':>9}")
+    for row in results:
+        print(
+            f"{row['phase']:<34}{row['wall_s']:>9.2f}{row['requests']:>10}{row['not_modified']:>7}"
+            f"{row['db_write_s']:>12.3f}{row['db_writes']:>8}{row['peak_rss_mb']:>9.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
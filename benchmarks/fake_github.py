@@ -0,0 +1,289 @@
+"""
+Offline stand-in for the parts of the GitHub API that Kiri uses.
+
+Serves REST (repos, readmes, user/org listings) and the two GraphQL query
+shapes built by projects.services.GitHubService, with configurable latency,
+page size, rate-limit headers, conditional requests (304) and error rates.
+Point the app at it with GITHUB_API_URL=http://127.0.0.1:<port>.
+
+    python benchmarks/fake_github.py --repos 1500 --latency 0.05 --port 8765
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+README_TEMPLATE = """# {name}
+
+Research notes for {name}.
+
+## Usage
+
+```python
+import {module}
+
+result = {module}.run(samples={n})
+print(result)
+```
+
+## Results
+
+| Run | Score |
+|-----|-------|
+| a   | {n}   |
+"""
+
+
+class FakeGitHub:
+    """In-memory repository data plus the knobs and counters of a fake API."""
+
+    def __init__(self, owner='kiri-labs', repos=1000, latency=0.0, per_page=100,
+                 rate_limit=5000, error_rate=0.0, seed=1):
+        self.owner = owner
+        self.latency = latency
+        self.per_page = per_page
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.rate_limit = rate_limit
+        self.remaining = {'core': rate_limit, 'graphql': rate_limit}
+        self.reset_at = int(time.time()) + 3600
+        self.repos = {}
+        for n in range(repos):
+            self.add_repo(f"repo-{n:05d}")
+
+    def add_repo(self, name, **fields):
+        n = len(self.repos)
+        readme = README_TEMPLATE.format(name=name, module=name.replace('-', '_'), n=n)
+        repo = {
+            'name': name,
+            'owner': {'login': self.owner},
+            'html_url': f"https://github.com/{self.owner}/{name}",
+            'description': f"Description of {name}",
+            'stargazers_count': n % 500,
+            'forks_count': n % 50,
+            'language': ('Python', 'Go', 'TypeScript')[n % 3],
+            'topics': ['kiri-article'] if n % 2 == 0 else [],
+            'pushed_at': '2026-09-01T10:00:00Z',
+            'created_at': '2026-01-01T10:00:00Z',
+            'default_branch': 'main',
+            'readme': readme,
+        }
+        repo.update(fields)
+        self.repos[name] = repo
+        return repo
+
+    def touch(self, name, **fields):
+        """Simulates a push: changes fields and, if given, the README."""
+        self.repos[name].update(fields)
+
+    @staticmethod
+    def etag(repo):
+        body = json.dumps({k: v for k, v in repo.items() if k != 'readme'}, sort_keys=True)
+        return f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+    @staticmethod
+    def readme_sha(repo):
+        return hashlib.sha1(repo['readme'].encode()).hexdigest()
+
+    def spend(self, resource, cost=1):
+        """Returns rate-limit headers, or None once the window is exhausted."""
+        with self.lock:
+            self.counts[f"{resource}_calls"] += 1
+            if self.remaining[resource] < cost:
+                return None
+            self.remaining[resource] -= cost
+            return self.rate_headers(resource)
+
+    def rate_headers(self, resource):
+        return {
+            'X-RateLimit-Limit': str(self.rate_limit),
+            'X-RateLimit-Remaining': str(self.remaining[resource]),
+            'X-RateLimit-Reset': str(self.reset_at),
+            'X-RateLimit-Resource': resource,
+        }
+
+    def should_fail(self):
+        return self.error_rate and self.random.random() < self.error_rate
+
+    # ── REST payloads ──
+
+    def rest_repo(self, repo):
+        return {k: v for k, v in repo.items() if k != 'readme'}
+
+    def listing(self, query):
+        page = int(query.get('page', ['1'])[0])
+        per_page = min(int(query.get('per_page', [str(self.per_page)])[0]), self.per_page)
+        names = sorted(self.repos)
+        return [self.rest_repo(self.repos[n]) for n in names[(page - 1) * per_page:page * per_page]]
+
+    # ── GraphQL payloads ──
+
+    def graphql_node(self, repo, query):
+        node = {
+            'name': repo['name'],
+            'description': repo['description'],
+            'url': repo['html_url'],
+            'stargazerCount': repo['stargazers_count'],
+            'forkCount': repo['forks_count'],
+            'pushedAt': repo['pushed_at'],
+            'createdAt': repo['created_at'],
+            'owner': {'login': repo['owner']['login']},
+            'primaryLanguage': {'name': repo['language']} if repo['language'] else None,
+            'defaultBranchRef': {'name': repo['default_branch']},
+            'repositoryTopics': {'nodes': [{'topic': {'name': t}} for t in repo['topics']]},
+        }
+        if 'readme:' in query:
+            blob = {'oid': self.readme_sha(repo)}
+            if re.search(r'readme:[^}]*\btext\b', query):
+                blob['text'] = repo['readme']
+            node['readme'] = blob
+            node['readmeLower'] = None
+        return node
+
+    def graphql(self, query, variables):
+        if 'organization(' in query:
+            names = sorted(self.repos)
+            start = int(variables.get('after') or 0)
+            first = int(variables.get('first') or 50)
+            page = names[start:start + first]
+            return {'organization': {'repositories': {
+                'pageInfo': {'hasNextPage': start + first < len(names), 'endCursor': str(start + first)},
+                'nodes': [self.graphql_node(self.repos[n], query) for n in page],
+            }}}
+
+        data = {}
+        for alias in re.findall(r'\b(r\d+): repository', query):
+            index = alias[1:]
+            repo = self.repos.get(variables.get(f'n{index}'))
+            data[alias] = self.graphql_node(repo, query) if repo else None
+        return data
+
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; without this, keep-alive
+        # clients wait out delayed ACKs on every response
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, status, payload=None, headers=None):
+            body = json.dumps(payload).encode() if payload is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def handle_request(self, method):
+            # Always consume the body so keep-alive connections stay in sync
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            if fake.latency:
+                time.sleep(fake.latency)
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split('/') if p]
+            if parts == ['graphql']:
+                route = '/graphql'
+            elif parts[:1] == ['repos']:
+                route = '/'.join(['', 'repos', ':owner', ':repo'] + parts[3:])
+            else:
+                route = '/'.join([''] + parts[:1] + [':name'] + parts[2:])
+            with fake.lock:
+                fake.counts[f"{method} {route}"] += 1
+
+            if fake.should_fail():
+                return self.send_json(502, {'message': 'Server Error'})
+
+            resource = 'graphql' if route == '/graphql' else 'core'
+            repo = fake.repos.get(parts[2]) if parts[:1] == ['repos'] and len(parts) >= 3 else None
+
+            # Conditional requests that match are free, as on GitHub
+            if repo is not None and len(parts) == 3 and self.headers.get('If-None-Match') == fake.etag(repo):
+                with fake.lock:
+                    fake.counts['not_modified'] += 1
+                return self.send_json(304, None, {'ETag': fake.etag(repo), **fake.rate_headers('core')})
+
+            headers = fake.spend(resource)
+            if headers is None:
+                return self.send_json(403, {'message': 'API rate limit exceeded'}, {
+                    **fake.rate_headers(resource), 'X-RateLimit-Remaining': '0',
+                })
+
+            if route == '/graphql':
+                if 'Authorization' not in self.headers:
+                    return self.send_json(401, {'message': 'Requires authentication'}, headers)
+                payload = json.loads(body or b'{}')
+                data = fake.graphql(payload.get('query', ''), payload.get('variables') or {})
+                return self.send_json(200, {'data': data}, headers)
+
+            if parts[:1] == ['repos']:
+                if repo is None:
+                    return self.send_json(404, {'message': 'Not Found'}, headers)
+                if parts[3:] == ['readme']:
+                    return self.send_json(200, {
+                        'content': base64.b64encode(repo['readme'].encode()).decode(),
+                        'encoding': 'base64',
+                        'sha': fake.readme_sha(repo),
+                    }, headers)
+                return self.send_json(200, fake.rest_repo(repo), {**headers, 'ETag': fake.etag(repo)})
+
+            if parts[:1] in (['users'], ['orgs']) and parts[2:] == ['repos']:
+                return self.send_json(200, fake.listing(parse_qs(url.query)), headers)
+
+            return self.send_json(404, {'message': 'Not Found'}, headers)
+
+        def do_GET(self):
+            self.handle_request('GET')
+
+        def do_POST(self):
+            self.handle_request('POST')
+
+    return Handler
+
+
+def serve(fake, host='127.0.0.1', port=0):
+    """Starts the fake API on a daemon thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repos', type=int, default=1000)
+    parser.add_argument('--owner', default='kiri-labs')
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--rate-limit', type=int, default=5000)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered 502")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    fake = FakeGitHub(args.owner, args.repos, args.latency, args.per_page, args.rate_limit, args.error_rate)
+    server, base_url = serve(fake, port=args.port)
+    print(f"Fake GitHub API for {args.repos} repos at {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(dict(fake.counts))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+PROJECT_VALUES = (
+    "NEW.id * 4, 'project', NEW.slug, NEW.status, NEW.name, NEW.description, "
+    "coalesce(NEW.topics, '') || ' ' || coalesce(NEW.tech_stack, '') || ' ' || "
+    "coalesce(NEW.language, '') || ' ' || coalesce(NEW.category, '')"
+)
+PUBLICATION_VALUES = (
+    "NEW.id * 4 + 1, 'publication', NEW.slug, '', NEW.title, "
+    "coalesce(NEW.description, '') || ' ' || NEW.body_text, coalesce(NEW.topics, '')"
+)
+COLUMNS = "(rowid, kind, ref, status, title, body, tags)"
+
+
+def changed(*fields):
+    return " OR ".join(f"OLD.{field} IS NOT NEW.{field}" for field in fields)
+
+
+def build_index(apps, schema_editor):
+    from core import search
+    search.rebuild(schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('projects', '0002_githubvalidator'),
+        ('publications', '0004_body_text'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            [
+                "CREATE VIRTUAL TABLE search_index USING fts5("
+                "kind UNINDEXED, ref UNINDEXED, status UNINDEXED, title, body, tags, "
+                "tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3')",
+
+                f"CREATE TRIGGER search_project_insert AFTER INSERT ON projects_project BEGIN "
+                f"INSERT INTO search_index {COLUMNS} VALUES ({PROJECT_VALUES}); END",
+                # Syncs rewrite every column; only re-index when searchable text changed
+                f"CREATE TRIGGER search_project_update AFTER UPDATE ON projects_project "
+                f"WHEN {changed('name', 'slug', 'status', 'description', 'topics', 'tech_stack', 'language', 'category')} BEGIN "
+                f"DELETE FROM search_index WHERE rowid = OLD.id * 4; "
+                f"INSERT INTO search_index {COLUMNS} VALUES ({PROJECT_VALUES}); END",
+                "CREATE TRIGGER search_project_delete AFTER DELETE ON projects_project BEGIN "
+                "DELETE FROM search_index WHERE rowid = OLD.id * 4; END",
+
+                f"CREATE TRIGGER search_publication_insert AFTER INSERT ON publications_publication BEGIN "
+                f"INSERT INTO search_index {COLUMNS} VALUES ({PUBLICATION_VALUES}); END",
+                f"CREATE TRIGGER search_publication_update AFTER UPDATE ON publications_publication "
+                f"WHEN {changed('title', 'slug', 'description', 'topics', 'body_text')} BEGIN "
+                f"DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1; "
+                f"INSERT INTO search_index {COLUMNS} VALUES ({PUBLICATION_VALUES}); END",
+                "CREATE TRIGGER search_publication_delete AFTER DELETE ON publications_publication BEGIN "
+                "DELETE FROM search_index WHERE rowid = OLD.id * 4 + 1; END",
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS search_project_insert",
+                "DROP TRIGGER IF EXISTS search_project_update",
+                "DROP TRIGGER IF EXISTS search_project_delete",
+                "DROP TRIGGER IF EXISTS search_publication_insert",
+                "DROP TRIGGER IF EXISTS search_publication_update",
+                "DROP TRIGGER IF EXISTS search_publication_delete",
+                "DROP TABLE IF EXISTS search_index",
+            ],
+        ),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
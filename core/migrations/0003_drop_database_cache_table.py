@@ -0,0 +1,14 @@
+from django.db import migrations
+
+
+# The cache now lives in its own SQLite file (kiri_project.sqlite_cache);
+# the DatabaseCache table it replaced is left empty in db.sqlite3.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_search_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL("DROP TABLE IF EXISTS kiri_cache_table", migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,148 @@
+"""
+Keyset (seek) pagination for list views.
+Pages are addressed by an opaque cursor holding the sort key of the row they
+start after (or end before), so every page is one indexed range scan: no
+OFFSET, and no COUNT(*) per request. The total shown is approximate, counted
+once and cached until the model's cache tag is bumped.
+"""
+import json
+import base64
+import binascii
+import hashlib
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+# Seconds the approximate total is kept; saves and syncs invalidate it sooner
+COUNT_TIMEOUT = 60 * 60
+
+
+def encode_cursor(direction, values):
+    raw = json.dumps([direction, *values], separators=(',', ':'), default=lambda value: value.isoformat())
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """(direction, values) of a cursor, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, *values = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+    if direction not in ('next', 'prev') or len(values) != size:
+        return None
+    return direction, values
+
+
+def seek(keyset, values, forward=True):
+    """
+    Q for rows strictly after `values` in `keyset` order (before, if not
+    `forward`): (a, b) after (x, y) is a > x OR (a = x AND b > y), per direction.
+    """
+    condition = Q()
+    for i, field in enumerate(keyset):
+        name = field.lstrip('-')
+        descending = field.startswith('-') == forward
+        term = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+        for previous, value in zip(keyset[:i], values):
+            term &= Q(**{previous.lstrip('-'): value})
+        condition |= term
+    return condition
+
+
+def reverse_ordering(keyset):
+    return [field[1:] if field.startswith('-') else f"-{field}" for field in keyset]
+
+
+class KeysetPage:
+    """The slice of a KeysetPaginationMixin list; quacks enough like a Page for the list templates."""
+
+    def __init__(self, object_list, keyset, has_previous, has_next, count):
+        self.object_list = object_list
+        self.keyset = keyset
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _values(self, obj):
+        return [getattr(obj, field.lstrip('-')) for field in self.keyset]
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+    @property
+    def previous_cursor(self):
+        if not (self._has_previous and self.object_list):
+            return ''
+        return encode_cursor('prev', self._values(self.object_list[0]))
+
+    @property
+    def next_cursor(self):
+        if not (self._has_next and self.object_list):
+            return ''
+        return encode_cursor('next', self._values(self.object_list[-1]))
+
+
+class KeysetPaginationMixin:
+    """
+    For ListViews: pages through get_queryset() in `keyset` order, whose last
+    field must be unique, using a `?cursor=` instead of `?page=`. The context
+    keeps page_obj / is_paginated, with page_obj.next_cursor,
+    previous_cursor and an approximate count.
+    """
+
+    keyset = ('-created_at', '-id')
+    cursor_kwarg = 'cursor'
+
+    def get_keyset(self, queryset):
+        return self.keyset
+
+    def paginate_queryset(self, queryset, page_size):
+        keyset = list(self.get_keyset(queryset))
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        position = decode_cursor(cursor, len(keyset)) if cursor else None
+        if cursor and position is None:
+            raise Http404("Invalid cursor")
+
+        try:
+            if position is None:
+                rows = list(queryset.order_by(*keyset)[:page_size + 1])
+                has_previous, has_next = False, len(rows) > page_size
+                rows = rows[:page_size]
+            elif position[0] == 'next':
+                rows = list(queryset.filter(seek(keyset, position[1])).order_by(*keyset)[:page_size + 1])
+                has_previous, has_next = True, len(rows) > page_size
+                rows = rows[:page_size]
+            else:
+                rows = list(queryset.filter(seek(keyset, position[1], forward=False))
+                            .order_by(*reverse_ordering(keyset))[:page_size + 1])
+                has_previous, has_next = len(rows) > page_size, True
+                rows = rows[:page_size][::-1]
+        except (ValidationError, ValueError, TypeError):
+            # Well-formed, but holding values of the wrong type
+            raise Http404("Invalid cursor")
+
+        page = KeysetPage(rows, keyset, has_previous, has_next, self.approximate_count(queryset))
+        return None, page, page.object_list, page.has_other_pages()
+
+    def approximate_count(self, queryset):
+        """Rows in `queryset`, cached by its SQL until the model's cache tag is bumped."""
+        from kiri_project.caching import get_or_compute, model_tag
+
+        if queryset.query.is_empty():
+            return 0
+        model = queryset.model
+        sql = hashlib.sha1(str(queryset.order_by().query).encode()).hexdigest()[:16]
+        return get_or_compute(f"list_count:{model._meta.label}:{sql}", queryset.count, COUNT_TIMEOUT, tags=(model_tag(model),))
@@ -0,0 +1,143 @@
+"""
+Full-text search over projects and publications (SQLite FTS5).
+
+The search_index virtual table is kept in sync by triggers on the projects
+and publications tables (created in core/migrations/0002_search_index.py),
+so bulk updates from GitHub syncs are indexed too. Triggers are plain SQL
+(they also fire from sqlite3 shells): publication bodies are indexed from
+Publication.body_text, which html_to_text() fills when html_content is
+written. Tools are searched in memory (tools/search.py).
+Queries are ranked by bm25, the last term matches as a prefix for
+typeahead, and hits carry escaped, <mark>-highlighted titles and snippets.
+"""
+import re
+import html
+from collections import namedtuple
+from django.db import connection
+from django.utils.html import escape
+
+# rowid = object id * ROWID_STRIDE + kind code, so triggers can address a row without a lookup
+ROWID_STRIDE = 4
+KIND_CODES = {'project': 0, 'publication': 1}
+
+# bm25 weights, in column order: kind, ref, status (unindexed), title, body, tags
+BM25_WEIGHTS = (0.0, 0.0, 0.0, 10.0, 1.0, 4.0)
+# Highlight markers, swapped for <mark> after the text is escaped
+MARK_START, MARK_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+# Query terms beyond this are ignored
+MAX_TERMS = 8
+
+TOKEN_RE = re.compile(r'\w+')
+SKIPPED_ELEMENTS_RE = re.compile(r'<(script|style)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Rows as rebuild() inserts them; the triggers in core/migrations/0002_search_index.py build the same from NEW
+PROJECT_COLUMNS = (
+    "{t}.id * 4, 'project', {t}.slug, {t}.status, {t}.name, {t}.description, "
+    "coalesce({t}.topics, '') || ' ' || coalesce({t}.tech_stack, '') || ' ' || "
+    "coalesce({t}.language, '') || ' ' || coalesce({t}.category, '')"
+)
+PUBLICATION_COLUMNS = (
+    "{t}.id * 4 + 1, 'publication', {t}.slug, '', {t}.title, "
+    "coalesce({t}.description, '') || ' ' || {t}.body_text, coalesce({t}.topics, '')"
+)
+PROJECT_ROWS = f"SELECT {PROJECT_COLUMNS.format(t='projects_project')} FROM projects_project"
+PUBLICATION_ROWS = f"SELECT {PUBLICATION_COLUMNS.format(t='publications_publication')} FROM publications_publication"
+
+# Cache tags (kiri_project.caching) bumped when indexed rows change
+CONTENT_TAGS = ('projects.Project', 'publications.Publication')
+
+Hit = namedtuple('Hit', 'kind ref object_id title snippet')
+
+
+def html_to_text(value):
+    """Plain text of rendered HTML (stored as Publication.body_text)."""
+    if not value:
+        return ''
+    text = TAG_RE.sub(' ', SKIPPED_ELEMENTS_RE.sub(' ', value))
+    return WHITESPACE_RE.sub(' ', html.unescape(text)).strip()
+
+
+def normalize_query(text):
+    """The words of a query, lowercased: queries that search the same normalize the same."""
+    return ' '.join(TOKEN_RE.findall(text.lower()))
+
+
+def fts_query(text):
+    """
+    Turns user input into an FTS5 query: every word must match, the last one
+    as a prefix. Words are quoted, so FTS5 operators in the input are inert.
+    Returns '' when there is nothing to search for.
+    """
+    terms = TOKEN_RE.findall(text.lower())[:MAX_TERMS]
+    if not terms:
+        return ''
+    return ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+
+def _marked(value):
+    return escape(value).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def unmarked(value):
+    """A hit's title or snippet as plain text."""
+    return re.sub(r'</?mark>', '', html.unescape(value))
+
+
+def search(text, kinds=None, limit=15, active_projects_only=True):
+    """
+    Best matches for `text` across `kinds` (default: all), best first.
+    Titles and snippets are HTML-escaped with matches wrapped in <mark>.
+    """
+    query = fts_query(text)
+    if not query:
+        return []
+
+    sql = (
+        "SELECT kind, ref, rowid, "
+        "highlight(search_index, 3, %s, %s), "
+        "snippet(search_index, 4, %s, %s, '…', %s) "
+        "FROM search_index WHERE search_index MATCH %s"
+    )
+    params = [MARK_START, MARK_END, MARK_START, MARK_END, SNIPPET_TOKENS, query]
+    if kinds:
+        sql += f" AND kind IN ({', '.join(['%s'] * len(kinds))})"
+        params.extend(kinds)
+    if active_projects_only:
+        sql += " AND (kind != 'project' OR status = 'active')"
+    sql += f" ORDER BY bm25(search_index, {', '.join(map(str, BM25_WEIGHTS))}) LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        Hit(kind, ref, rowid // ROWID_STRIDE, _marked(title), _marked(snippet))
+        for kind, ref, rowid, title, snippet in rows
+    ]
+
+
+def matching_ids(text, kind, limit=500):
+    """Ids of the best `limit` matches of one kind, best first (None if `text` has no searchable words)."""
+    query = fts_query(text)
+    if not query:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM search_index WHERE search_index MATCH %s AND kind = %s "
+            f"ORDER BY bm25(search_index, {', '.join(map(str, BM25_WEIGHTS))}) LIMIT %s",
+            [query, kind, limit],
+        )
+        return [rowid // ROWID_STRIDE for (rowid,) in cursor.fetchall()]
+
+
+def rebuild(using='default'):
+    """Re-indexes every project and publication from scratch."""
+    from django.db import connections
+
+    with connections[using].cursor() as cursor:
+        cursor.execute("DELETE FROM search_index")
+        cursor.execute(f"INSERT INTO search_index (rowid, kind, ref, status, title, body, tags) {PROJECT_ROWS}")
+        cursor.execute(f"INSERT INTO search_index (rowid, kind, ref, status, title, body, tags) {PUBLICATION_ROWS}")
@@ -0,0 +1,137 @@
+"""
+Static search index for the client-side Spotlight.
+All active projects, publications and tools are written as one compact JSON
+file named after its content hash (search-index.<hash>.json) in
+SEARCH_INDEX_ROOT, which WhiteNoise serves with immutable caching
+(kiri_project.middleware). The browser fetches it once per version and
+searches locally; /api/search/ advertises the current version and remains the
+fallback.
+
+The version is a registered cache value ('search_index_version'), so the
+warm_cache huey task republishes the file whenever projects or publications
+change, and on every deploy.
+"""
+import os
+import re
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+import unicodedata
+from django.conf import settings
+from django.utils.text import Truncator
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME_RE = re.compile(r'search-index\.([0-9a-f]{12})\.json')
+# Older files are kept for pages still holding their URL
+KEEP_VERSIONS = 3
+DESCRIPTION_CHARS = 100
+# Column order of every item; `text` is the normalized words searched on
+FIELDS = ('type', 'title', 'description', 'url', 'icon', 'text')
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def keywords(*values):
+    """Distinct lowercase words of `values`, accents stripped (matching the Spotlight's query normalization)."""
+    text = unicodedata.normalize('NFKD', ' '.join(value for value in values if value)).lower()
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(dict.fromkeys(TOKEN_RE.findall(text)))
+
+
+def build():
+    """The index payload: every active project, then publications, then tools."""
+    from projects.models import Project
+    from publications.models import Publication
+    from tools.search import tool_index
+
+    items = []
+    projects = Project.objects.filter(status=Project.Status.ACTIVE).only(
+        'slug', 'name', 'description', 'topics', 'tech_stack', 'language', 'category',
+    )
+    for project in projects:
+        items.append([
+            'Project', project.name, Truncator(project.description).chars(DESCRIPTION_CHARS),
+            project.get_absolute_url(), 'fa-diagram-project',
+            keywords(project.name, project.description, project.topics, project.tech_stack,
+                     project.language, project.get_category_display()),
+        ])
+    for publication in Publication.objects.only('slug', 'title', 'description', 'topics'):
+        items.append([
+            'Publication', publication.title, Truncator(publication.description).chars(DESCRIPTION_CHARS),
+            publication.get_absolute_url(), 'fa-book',
+            keywords(publication.title, publication.description, publication.topics),
+        ])
+    for tool in tool_index().entries:
+        items.append([
+            'Tool', tool.name, tool.summary, tool.url, tool.icon,
+            keywords(tool.name, tool.description, tool.category),
+        ])
+    return {'fields': FIELDS, 'items': items}
+
+
+def index_url(version):
+    return f"{settings.SEARCH_INDEX_URL}search-index.{version}.json"
+
+
+def publish():
+    """
+    Writes the current index (and a gzipped copy) unless a file with the same
+    content already exists, prunes old versions, and returns the version.
+    """
+    content = json.dumps(build(), ensure_ascii=False, separators=(',', ':')).encode()
+    version = hashlib.sha256(content).hexdigest()[:12]
+    root = settings.SEARCH_INDEX_ROOT
+    path = os.path.join(root, f"search-index.{version}.json")
+
+    if not os.path.exists(path):
+        os.makedirs(root, exist_ok=True)
+        _write(path + '.gz', gzip.compress(content, mtime=0))
+        # The plain file last: its presence marks the version complete
+        _write(path, content)
+        logger.info(f"Published search index {version} ({len(content)} bytes)")
+    else:
+        os.utime(path)
+    _prune(root)
+    return version
+
+
+def _write(path, content):
+    """Atomically, so WhiteNoise never serves a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _prune(root):
+    names = [name for name in os.listdir(root) if INDEX_NAME_RE.fullmatch(name)]
+    names.sort(key=lambda name: os.path.getmtime(os.path.join(root, name)), reverse=True)
+    for name in names[KEEP_VERSIONS:]:
+        for path in (os.path.join(root, name), os.path.join(root, name + '.gz')):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def current():
+    """
+    (version, url) of the published index, publishing it first if there is
+    none, or (None, None) if it can't be written.
+    """
+    from kiri_project.caching import get_cached
+
+    try:
+        version = get_cached('search_index_version')
+    except OSError as e:
+        logger.error(f"Could not publish the search index: {e}")
+        return None, None
+    return version, index_url(version)
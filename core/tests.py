@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -9,6 +9,37 @@ class CoreTests(TestCase):
         response = self.client.get(reverse('core:home'))
         self.assertEqual(response.status_code, 200)
 
+    def test_home_page_caches_snapshots(self):
+        import pickle
+        from django.core.cache import cache
+        from projects.models import Project
+        from publications.models import Publication
+        from kiri_project.snapshots import ProjectSnapshot, PublicationSnapshot
+
+        cache.clear()
+        project = Project.objects.create(
+            name="Snapshot Project", description="word " * 100, is_featured=True,
+            github_repo_url="https://github.com/kiri-labs/snapshot", tech_stack="Django, HTMX",
+        )
+        publication = Publication.objects.create(
+            repo_name="snap-pub", title="Snapshot Paper", slug="snapshot-paper",
+            html_content="<p>long</p>" * 1000, github_url="https://github.com/kiri-labs/snap-pub",
+        )
+
+        response = self.client.get(reverse('core:home'))
+        self.assertContains(response, "Snapshot Project")
+        self.assertContains(response, "https://opengraph.githubassets.com/1/kiri-labs/snapshot")
+        self.assertContains(response, publication.get_absolute_url())
+
+        context = cache.get('homepage_context')[0]
+        featured = context['featured_projects'][0]
+        self.assertIsInstance(featured, ProjectSnapshot)
+        self.assertIsInstance(context['latest_publications'][0], PublicationSnapshot)
+        self.assertEqual(featured.tech_stack_list, ['Django', 'HTMX'])
+        self.assertEqual(featured.get_absolute_url(), project.get_absolute_url())
+        self.assertFalse(hasattr(featured, '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(featured)).get_category_display(), project.get_category_display())
+
     def test_health_check(self):
         response = self.client.get(reverse('core:health'))
         self.assertEqual(response.status_code, 200)
@@ -40,3 +71,617 @@ class NativeTaskTests(TestCase):
         self.assertIsInstance(sync_github_stats, TaskWrapper)
         self.assertIsInstance(cleanup_tmp_files, TaskWrapper)
         self.assertIsInstance(prune_cache_table, TaskWrapper)
+
+
+class GitHubWebhookTests(TestCase):
+    SECRET = 'webhook-secret'
+
+    def _post(self, event, payload, secret=SECRET):
+        import hashlib
+        import hmac
+        import json
+        body = json.dumps(payload).encode()
+        signature = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        with self.settings(GITHUB_WEBHOOK_SECRET=self.SECRET):
+            return self.client.post(
+                reverse('core:github_webhook'), data=body, content_type='application/json',
+                headers={'X-GitHub-Event': event, 'X-Hub-Signature-256': signature},
+            )
+
+    def _repository(self, name, owner='kiri-labs', **extra):
+        return dict({
+            'name': name, 'full_name': f'{owner}/{name}', 'owner': {'login': owner},
+            'default_branch': 'main', 'stargazers_count': 0, 'forks_count': 0,
+        }, **extra)
+
+    def test_rejects_bad_signature(self):
+        response = self._post('star', {'repository': self._repository('demo')}, secret='wrong')
+        self.assertEqual(response.status_code, 403)
+
+    def test_star_updates_matching_project(self):
+        from projects.models import Project
+        project = Project.objects.create(
+            name='Demo', description='d', github_repo_url='https://github.com/Kiri-Labs/demo'
+        )
+        response = self._post('star', {
+            'action': 'created', 'repository': self._repository('demo', stargazers_count=42, forks_count=5),
+        })
+        self.assertEqual(response.json()['handled'], True)
+        project.refresh_from_db()
+        self.assertEqual((project.stars_count, project.forks_count), (42, 5))
+
+    def test_push_rerenders_only_when_readme_changes(self):
+        from unittest.mock import patch
+        payload = {
+            'ref': 'refs/heads/main',
+            'repository': self._repository('edge-notes', pushed_at=1790000000),
+            'commits': [{'id': 'c1', 'added': [], 'modified': ['src/main.py'], 'removed': []}],
+            'head_commit': {'id': 'c1'},
+        }
+        with patch('kiri_project.tasks.sync_publication_repo') as mock_sync:
+            self._post('push', payload)
+            self.assertFalse(mock_sync.called)
+
+            payload['commits'].append({'id': 'c2', 'added': [], 'modified': ['README.md'], 'removed': []})
+            payload['head_commit'] = {'id': 'c2'}
+            self._post('push', payload)
+            mock_sync.assert_called_once_with('edge-notes')
+
+    def test_push_with_truncated_commit_list_syncs(self):
+        from unittest.mock import patch
+        from django.utils import timezone
+        from publications.models import Publication
+        pushed = timezone.now() - timezone.timedelta(days=3)
+        Publication.objects.create(
+            repo_name='long-push', title='Long Push', slug='long-push', html_content='<p>x</p>',
+            github_url='https://github.com/kiri-labs/long-push', pushed_at=pushed,
+        )
+        commits = [{'id': f'c{i}', 'added': [], 'modified': ['src/main.py'], 'removed': []} for i in range(20)]
+        payloads = [
+            # GitHub lists at most 20 commits
+            {'commits': commits, 'head_commit': {'id': 'c19'}},
+            # Force push back to an older commit
+            {'commits': [], 'head_commit': {'id': 'c3'}},
+        ]
+        with patch('kiri_project.tasks.sync_publication_repo') as mock_sync:
+            for payload in payloads:
+                self._post('push', dict(payload, ref='refs/heads/main',
+                                        repository=self._repository('long-push', pushed_at=1790000000)))
+        self.assertEqual(mock_sync.call_count, 2)
+        self.assertEqual(Publication.objects.get(repo_name='long-push').pushed_at, pushed)
+
+
+class HttpClientTests(TestCase):
+    def setUp(self):
+        from kiri_project import http_client
+        http_client.reset()
+        self.addCleanup(http_client.reset)
+
+    def test_calls_to_one_host_reuse_pooled_connections(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from kiri_project import http_client
+
+        client_ports = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                client_ports.add(self.client_address[1])
+                status = 500 if self.path == '/broken' else 200
+                self.send_response(status)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        with self.settings(HTTP_RETRIES=0):
+            for _ in range(20):
+                self.assertEqual(http_client.get(f"{base}/repos", timeout=5).status_code, 200)
+            self.assertEqual(http_client.get(f"{base}/broken", timeout=5).status_code, 500)
+
+        # Sequential calls share one keep-alive connection
+        self.assertEqual(len(client_ports), 1)
+        host_stats = http_client.stats()[f"127.0.0.1:{server.server_address[1]}"]
+        self.assertEqual((host_stats['requests'], host_stats['errors']), (21, 1))
+
+
+class CircuitBreakerTests(TestCase):
+    URL = 'https://api.example.test/repos/kiri-labs/demo'
+
+    def setUp(self):
+        from django.core.cache import cache
+        from kiri_project import circuit, http_client
+        cache.clear()
+        circuit.reset()
+        http_client.reset()
+        self.addCleanup(circuit.reset)
+        self.addCleanup(http_client.reset)
+
+    def test_opens_after_failures_and_fails_fast_across_processes(self):
+        import requests
+        from unittest.mock import patch
+        from kiri_project import circuit, http_client
+
+        with self.settings(CIRCUIT_FAILURE_THRESHOLD=3, HTTP_RETRIES=0), \
+                patch.object(requests.Session, 'request', side_effect=requests.Timeout('slow')) as mock_request:
+            for _ in range(3):
+                with self.assertRaises(requests.Timeout):
+                    http_client.get(self.URL, timeout=10)
+            with self.assertRaises(circuit.CircuitOpenError):
+                http_client.get(self.URL, timeout=10)
+            self.assertEqual(mock_request.call_count, 3)
+
+            # A fresh process picks the open state up from the shared cache
+            circuit.reset()
+            self.assertTrue(circuit.breaker_for(self.URL).is_open())
+
+        self.assertEqual(http_client.stats()['api.example.test']['rejected'], 1)
+        status = self.client.get(reverse('core:health')).json()['circuits']['api.example.test']
+        self.assertEqual(status['state'], 'open')
+
+    def test_half_open_probe_closes_circuit(self):
+        import requests
+        from unittest.mock import MagicMock, patch
+        from kiri_project import circuit, http_client
+
+        breaker = circuit.breaker_for(self.URL)
+        with self.settings(CIRCUIT_FAILURE_THRESHOLD=1, CIRCUIT_RESET_SECONDS=0):
+            breaker.record_failure()
+            self.assertTrue(breaker.allow())
+            # Only one probe at a time while half-open
+            self.assertFalse(breaker.allow())
+            # A failed probe re-opens the circuit; the next probe succeeds
+            breaker.record_failure()
+            with patch.object(requests.Session, 'request', return_value=MagicMock(status_code=200)):
+                self.assertEqual(http_client.get(self.URL).status_code, 200)
+        self.assertEqual(breaker.status()['state'], 'closed')
+
+
+class TieredCacheTests(TransactionTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        # Start each test with a coherence check
+        cache._next_check = 0.0
+
+    def _other_worker(self, *writes):
+        """Writes straight to the shared tier from another connection, as another worker process would."""
+        import threading
+        from django.core.cache import caches
+
+        worker = threading.Thread(target=lambda: [caches['shared'].set(key, value) for key, value in writes])
+        worker.start()
+        worker.join()
+
+    def test_local_hits_until_another_process_writes(self):
+        import time
+        from unittest.mock import patch
+        from django.core.cache import caches
+
+        tier, shared = caches['default'], caches['shared']
+        tier.set('tier-key', 'v1')
+        with patch.object(shared, 'get_many_with_expiry', wraps=shared.get_many_with_expiry) as mock_shared:
+            self.assertEqual(tier.get('tier-key'), 'v1')
+            self.assertFalse(mock_shared.called)
+
+        self._other_worker(('tier-key', 'v2'))
+        # Checked once per COHERENCE_INTERVAL
+        later = time.monotonic() + tier._check_interval
+        with patch('kiri_project.cache.time.monotonic', return_value=later):
+            self.assertEqual(tier.get('tier-key'), 'v2')
+
+    def test_volatile_writes_keep_local_copies(self):
+        import time
+        from unittest.mock import patch
+        from django.core.cache import caches
+
+        tier, shared = caches['default'], caches['shared']
+        tier.set('tier-key', 'v1')
+        self._other_worker(('lock:tier-key', 1), ('github_ratelimit:core', {'remaining': 10}))
+        tier.set('warming:tier-key', 1)
+
+        later = time.monotonic() + tier._check_interval
+        with patch('kiri_project.cache.time.monotonic', return_value=later), \
+                patch.object(shared, 'get_many_with_expiry', wraps=shared.get_many_with_expiry) as mock_shared:
+            self.assertEqual(tier.get('tier-key'), 'v1')
+            self.assertFalse(mock_shared.called)
+
+    def test_local_copy_expires_with_the_shared_entry(self):
+        import time
+        from django.core.cache import caches
+
+        tier, shared = caches['default'], caches['shared']
+        shared.set('short-key', 'v1', 5)
+        shared.set('long-key', 'v1', 3600)
+        self.assertEqual(tier.get_many(['short-key', 'long-key']), {'short-key': 'v1', 'long-key': 'v1'})
+
+        now = time.monotonic()
+        self.assertLessEqual(tier._local[tier._local_key('short-key', None)][0], now + 5)
+        self.assertGreater(tier._local[tier._local_key('long-key', None)][0], now + tier._local_timeout - 5)
+
+    def test_local_tier_is_bounded(self):
+        from kiri_project.cache import TieredCache
+
+        tier = TieredCache('shared', {'OPTIONS': {'LOCAL_MAX_ENTRIES': 2, 'LOCAL_EXCLUDE_PREFIXES': ['skip:']}})
+        for i in range(3):
+            tier.set(f'bounded-{i}', i)
+        tier.set('skip:me', 1)
+        self.assertEqual(tier.local_stats()['entries'], 2)
+        self.assertEqual(tier.get('bounded-0'), 0)
+
+
+class SQLiteCacheTests(TestCase):
+    def setUp(self):
+        import tempfile
+        from kiri_project.sqlite_cache import SQLiteCache
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.cache = SQLiteCache(
+            f"{directory}/cache.sqlite3",
+            {'OPTIONS': {'MAX_ENTRIES': 10, 'CULL_BATCH': 2, 'ACCESS_RESOLUTION': 0}},
+        )
+
+    def test_cache_api(self):
+        cache = self.cache
+        self.assertTrue(cache.add('key', 1))
+        self.assertFalse(cache.add('key', 2))
+        self.assertEqual(cache.incr('key', 4), 5)
+        cache.set_many({'a': [1], 'b': {'x': None}})
+        self.assertEqual(cache.get_many(['a', 'b', 'missing']), {'a': [1], 'b': {'x': None}})
+        self.assertTrue(cache.delete('a'))
+        self.assertFalse(cache.has_key('a'))
+
+        cache.set('expired', 1, 0)
+        self.assertIsNone(cache.get('expired'))
+        self.assertTrue(cache.add('expired', 2))
+        self.assertEqual(cache.prune(), 0)
+        cache.touch('expired', 0)
+        self.assertEqual(cache.prune(), 1)
+
+    def test_large_values_are_compressed(self):
+        from kiri_project.sqlite_cache import SQLiteCache
+
+        compressing = SQLiteCache(self.cache._location, {'OPTIONS': {'COMPRESS_MIN_BYTES': 1024}})
+        compressing.set('big', 'x' * 100_000)
+        compressing.set('small', 'x')
+        row_sizes = dict(compressing._connection().execute("SELECT cache_key, length(value) FROM cache_entry"))
+        self.assertLess(row_sizes[':1:big'], 1024)
+        self.assertEqual(compressing.get('big'), 'x' * 100_000)
+        # Readable whatever the threshold of the reading process
+        self.assertEqual(self.cache.get('big'), 'x' * 100_000)
+        self.assertEqual(compressing.get('small'), 'x')
+
+    def test_eviction_drops_least_recently_used(self):
+        import time
+        cache = self.cache
+        for i in range(10):
+            cache.set(f'key-{i}', i)
+            time.sleep(0.002)
+        # Reading key-0 makes key-1 the least recently used entry
+        self.assertEqual(cache.get('key-0'), 0)
+        cache.set('key-10', 10)
+
+        self.assertEqual(cache.entry_count(), 8)
+        self.assertEqual(cache.get('key-0'), 0)
+        self.assertIsNone(cache.get('key-1'))
+        self.assertEqual(cache.get('key-10'), 10)
+
+    def test_prune_task_uses_shared_cache(self):
+        from django.core.cache import caches
+        from kiri_project.tasks import prune_cache_table
+
+        caches['shared'].set('stale', 1)
+        caches['shared'].touch('stale', 0)
+        prune_cache_table.call_local()
+        self.assertFalse(caches['shared'].has_key('stale'))
+
+
+class GetOrComputeTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_concurrent_misses_compute_once(self):
+        import time
+        import threading
+        from kiri_project.caching import get_or_compute
+
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'projects': 3}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('hot-key', compute, 60)))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'projects': 3}] * 6)
+
+    def test_previous_value_served_while_another_caller_recomputes(self):
+        from unittest.mock import MagicMock
+        from django.core.cache import cache
+        from kiri_project.caching import get_or_compute
+
+        self.assertEqual(get_or_compute('hot-key', lambda: 'v1', 60), 'v1')
+        # Invalidated, and another process is already rebuilding it
+        cache.delete('hot-key')
+        cache.add('lock:hot-key', 'other-worker', 30)
+        compute = MagicMock(return_value='v2')
+        self.assertEqual(get_or_compute('hot-key', compute, 60), 'v1')
+        compute.assert_not_called()
+
+        cache.delete('lock:hot-key')
+        self.assertEqual(get_or_compute('hot-key', compute, 60), 'v2')
+
+    def test_stale_value_served_while_warm_task_refreshes(self):
+        from unittest.mock import patch
+        from django.core.cache import cache
+        from kiri_project import caching
+        from kiri_project.tasks import warm_cache
+
+        registry = {'hot-key': caching.CachedValue('builtins.len', 60, 3600, ())}
+        with patch.dict(caching.CACHED_VALUES, registry, clear=True):
+            caching.store('hot-key', 'old', 3600, soft_timeout=60)
+            self.assertEqual(caching.get_cached('hot-key'), 'old')
+
+            cache.set('hot-key', ('old', 0, {}), 3600)  # past its soft timeout
+            with patch('kiri_project.tasks.warm_cache') as enqueue, self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(caching.get_cached('hot-key'), 'old')
+                self.assertEqual(caching.get_cached('hot-key'), 'old')
+            # Queued once, after commit
+            enqueue.assert_called_once_with(['hot-key'])
+
+            with patch.object(caching, 'import_string', return_value=lambda: 'new'):
+                warm_cache.call_local(['hot-key'])
+            self.assertEqual(caching.get_cached('hot-key'), 'new')
+            self.assertIsNone(cache.get('warming:hot-key'))
+
+    def test_model_changes_bump_tags_and_warm_dependent_values(self):
+        from unittest.mock import patch
+        from django.core.cache import cache
+        from kiri_project import caching
+        from kiri_project.tasks import warm_cache
+        from projects.models import Project
+
+        warm_cache.call_local(['active_projects_sidebar'])
+        self.assertEqual(caching.get_cached('active_projects_sidebar'), [])
+
+        homepage_tags = caching.CACHED_VALUES['homepage_context'].tags
+        caching.store('homepage_context', 'old', 3600, soft_timeout=3600, versions=caching.tag_versions(homepage_tags))
+        with patch('kiri_project.tasks.warm_cache') as enqueue, self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(name="Tagged Project", description="d", status=Project.Status.ACTIVE)
+        queued = set(enqueue.call_args[0][0])
+        self.assertEqual(queued, {'homepage_context', 'search_index_version'})
+        self.assertIsNotNone(cache.get(f"tag:{caching.model_tag(Project)}"))
+
+        # Navigation is rebuilt as the change commits; other values are served stale until warmed
+        self.assertEqual(caching.get_cached('active_projects_sidebar'), [{'name': "Tagged Project", 'slug': project.slug}])
+        with patch('kiri_project.tasks.warm_cache'), self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(caching.get_cached('homepage_context'), 'old')
+
+    def test_unregistered_value_recomputed_after_tag_bump(self):
+        from unittest.mock import MagicMock
+        from django.core.cache import cache
+        from kiri_project import caching
+
+        compute = MagicMock(side_effect=['v1', 'v2'])
+        self.assertEqual(caching.get_or_compute('tagged', compute, 60, tags=('projects.Project:1',)), 'v1')
+        self.assertEqual(caching.get_or_compute('tagged', compute, 60, tags=('projects.Project:1',)), 'v1')
+        cache.set('tag:projects.Project:1', 123, None)
+        self.assertEqual(caching.get_or_compute('tagged', compute, 60, tags=('projects.Project:1',)), 'v2')
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        from core import views
+        from projects.models import Project
+        from publications.models import Publication
+
+        views._search_responses.clear()
+
+        self.project = Project.objects.create(
+            name="Kiri Translator", description="Offline translation for Igbo and Yoruba",
+            tech_stack="Django, HTMX", status=Project.Status.ACTIVE,
+        )
+        self.publication = Publication.objects.create(
+            repo_name="tone-paper", title="Tonal Languages", slug="tonal-languages",
+            html_content="<h1>Intro</h1><p>We study <b>tone</b> marking in Igbo &amp; Yoruba.</p><script>var igbo;</script>",
+            github_url="https://github.com/kiri-labs/tone-paper",
+        )
+
+    def test_prefix_and_body_matches_ranked_by_title(self):
+        from core import search
+
+        hits = search.search("transl")
+        self.assertEqual([(hit.kind, hit.ref) for hit in hits][:1], [('project', self.project.slug)])
+        self.assertIn('<mark>Translator</mark>', hits[0].title)
+
+        kinds = {hit.kind for hit in search.search("igbo yoruba")}
+        self.assertEqual(kinds, {'project', 'publication'})
+        # Markup and scripts are not indexed
+        self.assertEqual(search.search("intro igbo")[0].ref, self.publication.slug)
+        self.assertEqual(search.search("var"), [])
+
+    def test_triggers_follow_updates_and_deletes(self):
+        from core import search
+        from projects.models import Project
+
+        Project.objects.filter(pk=self.project.pk).update(name="Nwa Dictionary")
+        self.assertEqual(search.matching_ids("dictionary", 'project'), [self.project.pk])
+        self.assertEqual(search.matching_ids("kiri", 'project'), [])
+
+        Project.objects.filter(pk=self.project.pk).update(status=Project.Status.ARCHIVED)
+        self.assertEqual(search.search("dictionary"), [])
+
+        self.publication.delete()
+        self.assertEqual(search.search("tonal"), [])
+
+    def test_triggers_are_plain_sql(self):
+        from django.db import connection
+        from core import search
+        from publications.models import Publication
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'search_%'")
+            triggers = [sql for (sql,) in cursor.fetchall()]
+        self.assertEqual(len(triggers), 6)
+        self.assertFalse(any('kiri_' in sql for sql in triggers))
+
+        # Bulk writes (which skip save()) index the body_text they carry
+        Publication.objects.filter(pk=self.publication.pk).update(body_text="Vowel harmony in Yoruba")
+        self.assertEqual(search.matching_ids("harmony", 'publication'), [self.publication.pk])
+
+    def test_query_syntax_is_inert_and_output_escaped(self):
+        from core import search
+
+        self.assertEqual(search.fts_query('tone" OR NEAR(x'), '"tone" "or" "near" "x"*')
+        self.assertEqual(search.search('*"()'), [])
+        self.project.name = "<b>Kiri</b> Translator"
+        self.project.save()
+        self.assertIn('&lt;b&gt;<mark>Kiri</mark>&lt;/b&gt;', search.search("kiri")[0].title)
+
+    def test_spotlight_api_and_project_list(self):
+        from tools.registry import TOOLS
+
+        slug, tool = next(iter(TOOLS.items()))
+        response = self.client.get(reverse('core:global_search'), {'q': tool['name']})
+        self.assertIn(reverse('tools:tool_detail', args=[slug]), [r['url'] for r in response.json()['results']])
+
+        results = self.client.get(reverse('core:global_search'), {'q': 'yoruba'}).json()['results']
+        result = next(r for r in results if r['type'] == 'Project')
+        self.assertEqual(result['url'], self.project.get_absolute_url())
+        self.assertNotIn('<mark>', result['description'])
+        self.assertIn('<mark>Yoruba</mark>', result['snippet'])
+
+        response = self.client.get(reverse('projects:list'), {'q': 'htmx'})
+        self.assertEqual(list(response.context['projects']), [self.project])
+
+
+class StaticSearchIndexTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.cache import cache
+        from django.test import override_settings
+        from core import views
+        from projects.models import Project
+
+        views._search_responses.clear()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.enterContext(override_settings(SEARCH_INDEX_ROOT=root))
+        cache.clear()
+        self.root = root
+        self.project = Project.objects.create(name="Kiri Translátor", description="Offline translation", topics="nlp")
+        Project.objects.create(name="Old Archive", description="Gone", status=Project.Status.ARCHIVED)
+
+    def test_publish_writes_versioned_index(self):
+        import os
+        import json
+        from core import static_search
+
+        version = static_search.publish()
+        with open(os.path.join(self.root, f"search-index.{version}.json")) as f:
+            index = json.load(f)
+        self.assertTrue(os.path.exists(os.path.join(self.root, f"search-index.{version}.json.gz")))
+
+        rows = [dict(zip(index['fields'], item)) for item in index['items']]
+        titles = {row['title'] for row in rows}
+        self.assertIn("Kiri Translátor", titles)
+        self.assertNotIn("Old Archive", titles)
+        self.assertEqual({row['type'] for row in rows}, {'Project', 'Tool'})
+        project = next(row for row in rows if row['type'] == 'Project')
+        self.assertEqual(project['url'], self.project.get_absolute_url())
+        self.assertEqual(project['text'], "kiri translator offline translation nlp other")
+
+        self.assertEqual(static_search.publish(), version)
+        self.project.name = "Kiri Dictionary"
+        self.project.save()
+        self.assertNotEqual(static_search.publish(), version)
+
+    def test_old_versions_are_pruned(self):
+        import os
+        from core import static_search
+
+        for n in range(static_search.KEEP_VERSIONS + 2):
+            self.project.name = f"Project {n}"
+            self.project.save()
+            latest = static_search.publish()
+        files = [name for name in os.listdir(self.root) if name.endswith('.json')]
+        self.assertEqual(len(files), static_search.KEEP_VERSIONS)
+        self.assertIn(f"search-index.{latest}.json", files)
+
+    def test_api_exposes_index_served_immutable(self):
+        response = self.client.get(reverse('core:global_search'))
+        index = response.json()['index']
+        self.assertEqual(index['url'], f"/search-index/search-index.{index['version']}.json")
+
+        response = self.client.get(index['url'], HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        self.assertEqual(self.client.get('/search-index/search-index.000000000000.json').status_code, 404)
+        self.assertEqual(self.client.get('/search-index/../db.sqlite3').status_code, 404)
+
+        # Search results name the version too
+        self.assertEqual(self.client.get(reverse('core:global_search'), {'q': 'kiri'}).json()['index'], index)
+
+
+class SearchApiCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from core import views
+
+        cache.clear()
+        views._search_responses.clear()
+
+    def test_normalized_queries_share_a_cached_response(self):
+        from unittest.mock import patch
+        from core import views
+
+        url = reverse('core:global_search')
+        with patch('core.views._search_results', wraps=views._search_results) as compute:
+            first = self.client.get(url, {'q': 'Json  Form'})
+            second = self.client.get(url, {'q': ' json form'})
+        self.assertEqual(compute.call_count, 1)
+        compute.assert_called_with('json form')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['Cache-Control'], 'public, max-age=60')
+        self.assertEqual(first['ETag'], second['ETag'])
+
+        response = self.client.get(url, {'q': 'json form'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_content_changes_miss_the_cache(self):
+        from unittest.mock import patch
+        from projects.models import Project
+
+        url = reverse('core:global_search')
+        before = self.client.get(url, {'q': 'kiri'})
+        self.assertEqual(before.json()['results'], [])
+
+        with patch('kiri_project.tasks.warm_cache'), self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(name="Kiri Cached", description="d", status=Project.Status.ACTIVE)
+        after = self.client.get(url, {'q': 'kiri'}, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual([result['title'] for result in after.json()['results']], ["Kiri Cached"])
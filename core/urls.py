@@ -1,5 +1,6 @@
 from django.urls import path
 from . import views
+from . import webhooks
 
 app_name = 'core'
 
@@ -12,4 +13,5 @@ urlpatterns = [
     path('refund/', views.refund_policy, name='refund_policy'),
     path('health/', views.health, name='health'),
     path('api/search/', views.global_search, name='global_search'),
+    path('api/webhooks/github/', webhooks.github_webhook, name='github_webhook'),
 ]
\ No newline at end of file
@@ -1,64 +1,82 @@
+import json
+from django.conf import settings
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_not_required
 from django.http import JsonResponse, HttpResponse
-from django.core.cache import cache
+from kiri_project.caching import MicroCache
+
+# Spotlight API responses, by content version and normalized query
+_search_responses = MicroCache(settings.SEARCH_CACHE_SECONDS, settings.SEARCH_CACHE_ENTRIES)
 
 
 @login_not_required
 def home(request):
-    """Homepage with dynamic content from database. Cached for 5 minutes."""
-    context = cache.get('homepage_context')
-    if context is None:
-        from projects.models import Project
-        from django.db.models import Count, Sum
-
-        all_projects = Project.objects.all()
-
-        # Featured projects (manually flagged), then by most recent
-        featured_projects = list(
-            all_projects.filter(is_featured=True).order_by('-created_at')[:8]
-        )
-
-        # Dynamic stats
-        from publications.models import Publication
-        stats = {
-            'total_projects': all_projects.count(),
-            'total_publications': Publication.objects.count(),
-        }
-
-        # Dynamic tool count from registry
-        try:
-            from tools.registry import TOOLS
-            stats['total_tools'] = len(TOOLS)
-        except ImportError:
-            stats['total_tools'] = 30
-
-        # Categories with counts
-        categories = list(
-            all_projects.values('category')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:8]
-        )
-
-        # Latest projects
-        latest_projects = list(all_projects.order_by('-created_at')[:5])
-        
-        # Latest publications
-        from publications.models import Publication
-        latest_publications = list(Publication.objects.order_by('-published_at')[:4])
-
-        context = {
-            "featured_projects": featured_projects,
-            "stats": stats,
-            "categories": categories,
-            "latest_projects": latest_projects,
-            "latest_publications": latest_publications,
-        }
-        cache.set('homepage_context', context, 300)
+    """Homepage with dynamic content from database. Cached, and re-warmed in the background when stale."""
+    from kiri_project.caching import get_cached
 
+    context = get_cached('homepage_context')
     return render(request, "home.html", context)
 
 
+def _homepage_context():
+    """
+    Featured and latest projects / publications plus site stats for the
+    homepage. Rows are cached as snapshots holding only what the cards render.
+    """
+    from projects.models import Project
+    from django.db.models import Count, Sum
+    from kiri_project.snapshots import ProjectSnapshot, PublicationSnapshot
+
+    all_projects = Project.objects.all()
+    card_projects = all_projects.only(*ProjectSnapshot.FIELDS)
+
+    # Featured projects (manually flagged), then by most recent
+    featured_projects = [
+        ProjectSnapshot.from_project(p)
+        for p in card_projects.filter(is_featured=True).order_by('-created_at')[:8]
+    ]
+
+    # Dynamic stats
+    from publications.models import Publication
+    stats = {
+        'total_projects': all_projects.count(),
+        'total_publications': Publication.objects.count(),
+    }
+
+    # Dynamic tool count from registry
+    try:
+        from tools.registry import TOOLS
+        stats['total_tools'] = len(TOOLS)
+    except ImportError:
+        stats['total_tools'] = 30
+
+    # Categories with counts
+    categories = list(
+        all_projects.values('category')
+        .annotate(count=Count('id'))
+        .order_by('-count')[:8]
+    )
+
+    # Latest projects
+    latest_projects = [ProjectSnapshot.from_project(p) for p in card_projects.order_by('-created_at')[:5]]
+
+    # Latest publications
+    from publications.models import Publication
+    latest_publications = [
+        PublicationSnapshot.from_publication(p)
+        for p in Publication.objects.only(*PublicationSnapshot.FIELDS).order_by('-published_at')[:4]
+    ]
+
+    context = {
+        "featured_projects": featured_projects,
+        "stats": stats,
+        "categories": categories,
+        "latest_projects": latest_projects,
+        "latest_publications": latest_publications,
+    }
+    return context
+
+
 @login_not_required
 def about(request):
     """About page."""
@@ -94,9 +112,13 @@ def refund_policy(request):
 @login_not_required
 def health(request):
     """Health check endpoint for deployment verification."""
+    from kiri_project import circuit, http_client
+
     return JsonResponse({
         "status": "ok",
         "service": "kiri",
+        "circuits": circuit.upstream_status(),
+        "outbound": http_client.stats(),
     })
 
 
@@ -112,52 +134,69 @@ def silent_asset(request, filename):
 def global_search(request):
     """
     Unified JSON API endpoint for 'Spotlight' search.
-    Aggregates Projects, Publications, and Tools.
+    Projects and Publications come ranked from the full-text index (core/search.py),
+    Tools from the precompiled in-memory index (tools/search.py).
+    `title_html` and `snippet` are escaped, with matches wrapped in <mark>.
+
+    The Spotlight searches the static index (core/static_search.py) in the
+    browser once it has loaded; every response names its current version.
+
+    Responses are micro-cached per normalized query and content version, and
+    sent with an ETag and a short public max-age so CDNs can absorb typeahead.
     """
-    query = request.GET.get('q', '').strip()
-    if not query:
-        return JsonResponse({"results": []})
-        
+    import hashlib
+    from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+    from core import search, static_search
+    from kiri_project.caching import tag_versions
+
+    version, url = static_search.current()
+    query = search.normalize_query(request.GET.get('q', ''))
+    # Tools only change with a deploy, which starts new processes
+    key = (tuple(tag_versions(search.CONTENT_TAGS).values()), version, query)
+    cached = _search_responses.get(key)
+    if cached is None:
+        results = _search_results(query) if query else []
+        content = json.dumps({"results": results, "index": {"version": version, "url": url}}).encode()
+        cached = (content, quote_etag(hashlib.sha1(content).hexdigest()))
+        _search_responses.set(key, cached)
+
+    content, etag = cached
+    response = HttpResponse(content, content_type="application/json")
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.SEARCH_CACHE_SECONDS)
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def _search_results(query):
+    """Spotlight results for a normalized query: ranked projects and publications, then tools."""
+    from django.urls import reverse
+    from django.utils.text import Truncator
+    from core import search
+    from tools.search import tool_index
+
+    tools = tool_index().search(query, limit=5)
     results = []
-    
-    # 1. Projects
-    from projects.models import Project
-    projects = Project.objects.filter(status=Project.Status.ACTIVE, name__icontains=query)[:5]
-    for p in projects:
-        results.append({
-            "type": "Project",
-            "title": p.name,
-            "description": p.description[:100] + "..." if len(p.description) > 100 else p.description,
-            "url": p.get_absolute_url(),
-            "icon": "fa-diagram-project"
+    for hit in search.search(query, kinds=('project', 'publication'), limit=15 - len(tools)):
+        if hit.kind == 'project':
+            result = {"type": "Project", "url": reverse('projects:detail', kwargs={'slug': hit.ref}), "icon": "fa-diagram-project"}
+        else:
+            result = {"type": "Publication", "url": reverse('publications:detail', kwargs={'slug': hit.ref}), "icon": "fa-book"}
+        result.update({
+            "title": search.unmarked(hit.title),
+            "title_html": hit.title,
+            "description": Truncator(search.unmarked(hit.snippet)).chars(100),
+            "snippet": hit.snippet,
         })
-        
-    # 2. Publications
-    from publications.models import Publication
-    pubs = Publication.objects.filter(title__icontains=query)[:5]
-    for pub in pubs:
+        results.append(result)
+
+    for tool in tools:
         results.append({
-            "type": "Publication",
-            "title": pub.title,
-            "description": pub.description[:100] + "..." if len(pub.description) > 100 else pub.description,
-            "url": pub.get_absolute_url(),
-            "icon": "fa-book"
+            "type": "Tool",
+            "title": tool.name,
+            "title_html": tool.name_html,
+            "description": tool.summary,
+            "snippet": tool.summary_html,
+            "url": tool.url,
+            "icon": tool.icon,
         })
-        
-    # 3. Tools
-    try:
-        from tools.registry import TOOLS
-        from django.urls import reverse
-        for tool_id, tool_data in TOOLS.items():
-            if query.lower() in tool_data['name'].lower() or query.lower() in tool_data.get('description', '').lower():
-                results.append({
-                    "type": "Tool",
-                    "title": tool_data['name'],
-                    "description": tool_data.get('description', '')[:100] + "..." if len(tool_data.get('description', '')) > 100 else tool_data.get('description', ''),
-                    "url": reverse('tools:tool_detail', args=[tool_id]),
-                    "icon": tool_data.get('icon', 'fa-toolbox')
-                })
-    except ImportError:
-        pass
-        
-    return JsonResponse({"results": results[:15]})
+    return results
@@ -0,0 +1,218 @@
+"""
+GitHub webhook receiver.
+Applies push, repository, star and release events to the affected Project or
+Publication rows so updates land in seconds; the periodic syncs in
+kiri_project.tasks remain as a low-frequency safety net.
+"""
+import hmac
+import json
+import hashlib
+import logging
+import re
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.contrib.auth.decorators import login_not_required
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from kiri_project.caching import invalidate_model
+
+logger = logging.getLogger(__name__)
+
+# README files at the repository root, in any casing/extension GitHub renders
+README_PATH = re.compile(r'^readme(\.[a-z0-9]+)?$', re.IGNORECASE)
+# Push payloads list at most this many commits; longer pushes are truncated
+PUSH_COMMITS_LIMIT = 20
+
+
+def verify_signature(body, signature, secret):
+    """Checks an X-Hub-Signature-256 header against the shared secret."""
+    if not secret or not signature or not signature.startswith('sha256='):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.removeprefix('sha256='))
+
+
+def _matching_projects(full_name):
+    """Projects whose github_repo_url points at `owner/repo`."""
+    from projects.models import Project
+    from projects.services import GitHubService
+
+    owner, _, repo = full_name.partition('/')
+    target = (owner.lower(), repo.lower())
+    candidates = Project.objects.filter(github_repo_url__icontains=repo)
+    return [
+        p for p in candidates
+        if tuple(part.lower() for part in (GitHubService.parse_repo_url(p.github_repo_url) or ())) == target
+    ]
+
+
+def _is_publication_repo(repository):
+    from kiri_project.tasks import PUBLICATIONS_ORG
+    return repository['owner']['login'].lower() == PUBLICATIONS_ORG.lower()
+
+
+def _timestamp(value):
+    """Webhook payloads send pushed_at as epoch seconds, other timestamps as ISO strings."""
+    from django.utils.dateparse import parse_datetime
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+    return parse_datetime(value) if value else None
+
+
+def handle_star(payload):
+    """Star counts change often; update the matching projects in place."""
+    from projects.models import Project
+
+    repository = payload['repository']
+    projects = _matching_projects(repository['full_name'])
+    if not projects:
+        return False
+    Project.objects.filter(pk__in=[p.pk for p in projects]).update(
+        stars_count=repository.get('stargazers_count', 0),
+        forks_count=repository.get('forks_count', 0),
+    )
+    invalidate_model(Project)
+    return True
+
+
+def handle_repository(payload):
+    """Metadata edits, renames, creation and deletion of a repository."""
+    from projects.utils import apply_project_metadata, save_synced_projects
+    from publications.models import Publication
+    from kiri_project.tasks import sync_publication_repo
+
+    action = payload.get('action')
+    repository = payload['repository']
+    handled = False
+
+    projects = _matching_projects(repository['full_name'])
+    if projects and action not in ('deleted', 'transferred'):
+        data = {
+            'stars_count': repository.get('stargazers_count', 0),
+            'forks_count': repository.get('forks_count', 0),
+            'language': repository.get('language') or '',
+            'description': repository.get('description') or '',
+            'topics': repository.get('topics', []),
+        }
+        for project in projects:
+            apply_project_metadata(project, data)
+        save_synced_projects(projects)
+        handled = True
+
+    if _is_publication_repo(repository):
+        if action == 'deleted':
+            Publication.objects.filter(repo_name=repository['name']).delete()
+        elif action == 'renamed':
+            old_name = payload.get('changes', {}).get('repository', {}).get('name', {}).get('from')
+            if old_name:
+                Publication.objects.filter(repo_name=old_name).delete()
+            sync_publication_repo(repository['name'])
+        elif action == 'created':
+            sync_publication_repo(repository['name'])
+        else:
+            Publication.objects.filter(repo_name=repository['name']).update(
+                description=repository.get('description') or "Research publication by Kiri Research Labs.",
+                topics=",".join(repository.get('topics', [])),
+            )
+        invalidate_model(Publication)
+        handled = True
+
+    return handled
+
+
+def _lists_every_commit(payload):
+    """
+    True if a push payload's `commits` covers the whole push: fewer than the
+    limit GitHub truncates at, and ending at head_commit (force pushes and
+    resets may not list it at all).
+    """
+    commits = payload.get('commits', [])
+    head = payload.get('head_commit')
+    if len(commits) >= PUSH_COMMITS_LIMIT:
+        return False
+    return head is None or any(commit.get('id') == head.get('id') for commit in commits)
+
+
+def handle_push(payload):
+    """
+    Re-render a publication only when a push to its default branch touched the
+    README, or when the payload can't tell (see _lists_every_commit).
+    """
+    from publications.models import Publication
+    from kiri_project.tasks import sync_publication_repo
+
+    repository = payload['repository']
+    if not _is_publication_repo(repository):
+        return False
+    if payload.get('ref') != f"refs/heads/{repository.get('default_branch', 'main')}":
+        return False
+
+    touched = set()
+    for commit in payload.get('commits', []):
+        for key in ('added', 'modified', 'removed'):
+            touched.update(commit.get(key, []))
+
+    if not _lists_every_commit(payload) or any(README_PATH.match(path) for path in touched):
+        sync_publication_repo(repository['name'])
+    else:
+        pushed_at = _timestamp(repository.get('pushed_at'))
+        if pushed_at:
+            Publication.objects.filter(repo_name=repository['name']).update(
+                published_at=pushed_at, pushed_at=pushed_at,
+            )
+            invalidate_model(Publication)
+    return True
+
+
+def handle_release(payload):
+    """A published release may change language and topics; refresh the project."""
+    from kiri_project.tasks import sync_selected_projects
+
+    if payload.get('action') != 'published':
+        return False
+    projects = _matching_projects(payload['repository']['full_name'])
+    if not projects:
+        return False
+    sync_selected_projects([p.pk for p in projects], force=True)
+    return True
+
+
+HANDLERS = {
+    'star': handle_star,
+    'repository': handle_repository,
+    'push': handle_push,
+    'release': handle_release,
+}
+
+
+@csrf_exempt
+@require_POST
+@login_not_required
+def github_webhook(request):
+    """Receives signed GitHub webhook deliveries."""
+    secret = getattr(settings, 'GITHUB_WEBHOOK_SECRET', '')
+    if not verify_signature(request.body, request.headers.get('X-Hub-Signature-256', ''), secret):
+        return JsonResponse({"error": "invalid signature"}, status=403)
+
+    event = request.headers.get('X-GitHub-Event', '')
+    if event == 'ping':
+        return JsonResponse({"status": "pong"})
+
+    handler = HANDLERS.get(event)
+    if handler is None:
+        return JsonResponse({"status": "ignored", "event": event})
+
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "invalid payload"}, status=400)
+
+    try:
+        handled = handler(payload)
+    except (KeyError, TypeError) as e:
+        logger.warning(f"Malformed GitHub '{event}' webhook: {e}")
+        return JsonResponse({"error": "malformed payload"}, status=400)
+
+    logger.info(f"GitHub webhook '{event}' for {payload.get('repository', {}).get('full_name')}: handled={handled}")
+    return JsonResponse({"status": "ok", "event": event, "handled": handled})
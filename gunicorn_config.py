@@ -35,3 +35,7 @@ graceful_timeout = 30
 # Preload application for shared memory (reduces per-worker memory)
 preload_app = True
 
+def post_fork(server, worker):
+    # Outbound connection pools must not be shared with the preloading master
+    from kiri_project import http_client
+    http_client.reset()
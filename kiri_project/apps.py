@@ -14,6 +14,10 @@ class KiriProjectConfig(AppConfig):
         from django.db.backends.signals import connection_created
         connection_created.connect(configure_sqlite_connection)
 
+        # Cached values are invalidated by their models' save / delete signals
+        from kiri_project.caching import connect_signals
+        connect_signals()
+
 
 def configure_sqlite_connection(sender, connection, **kwargs):
     """
@@ -0,0 +1,264 @@
+"""
+Two-tier cache backend.
+A bounded, per-process LRU sits in front of the shared cache (SQLiteCache,
+or a DatabaseCache), so hot keys read by every page render (context processors,
+homepage context) cost microseconds instead of a query each.
+
+Coherence across gunicorn workers and the huey consumer comes from the
+shared tier's generation counter (SQLiteCache.generation), which advances
+whenever any process writes a key that may be held locally: when another
+process moves it, every local copy is dropped. It is read at most once per
+COHERENCE_INTERVAL, so another process's write can take that long to show.
+"""
+import time
+import pickle
+import threading
+from collections import OrderedDict
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.db import connections, router
+
+
+class TieredCache(BaseCache):
+    """
+    LOCATION names the cache alias used as the shared tier. OPTIONS:
+    LOCAL_MAX_ENTRIES / LOCAL_MAX_BYTES bound the local tier,
+    LOCAL_MAX_ITEM_BYTES keeps large values out of it, LOCAL_TIMEOUT caps how
+    long a local copy is trusted, LOCAL_EXCLUDE_PREFIXES lists keys that
+    always go to the shared tier, and COHERENCE_INTERVAL is how often (in
+    seconds) other processes' writes are checked for. Keys read from the
+    shared tier are kept locally no longer than their shared TTL, so only a
+    shared tier that reports it (SQLiteCache.get_many_with_expiry) fills the
+    local tier on reads.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = location
+        self._max_local_entries = options.get('LOCAL_MAX_ENTRIES', 256)
+        self._max_local_bytes = options.get('LOCAL_MAX_BYTES', 4 * 1024 * 1024)
+        self._max_item_bytes = options.get('LOCAL_MAX_ITEM_BYTES', 256 * 1024)
+        self._local_timeout = options.get('LOCAL_TIMEOUT', 60)
+        self._exclude = tuple(options.get('LOCAL_EXCLUDE_PREFIXES', ()))
+        self._check_interval = options.get('COHERENCE_INTERVAL', 1)
+
+        # Shared by every thread of the process: local key -> (expires_at, pickled value)
+        self._local = OrderedDict()
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+        # Last shared generation seen, and when to look again
+        self._generation = None
+        self._next_check = 0.0
+        # DatabaseCache shared tiers: data_version is per connection, so per thread
+        self._seen = threading.local()
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # ── Local tier ──
+
+    def _shared_connection(self):
+        model = getattr(self.shared, 'cache_model_class', None)
+        if model is None:
+            return None
+        connection = connections[router.db_for_read(model)]
+        return connection if connection.vendor == 'sqlite' else None
+
+    def _local_usable(self):
+        """
+        True if the local tier may be used for this call. Once per
+        COHERENCE_INTERVAL, drops every local copy first if another process has
+        written since. A shared tier with a `generation()` (SQLiteCache) is asked
+        directly; a DatabaseCache is checked through its connection's
+        `PRAGMA data_version` and bypassed inside a transaction, which may still
+        be rolled back.
+        """
+        generation = getattr(self.shared, 'generation', None)
+        if generation is not None:
+            now = time.monotonic()
+            if now >= self._next_check:
+                self._next_check = now + self._check_interval
+                self._observe(generation())
+            return True
+
+        connection = self._shared_connection()
+        if connection is None or connection.in_atomic_block:
+            return False
+        now = time.monotonic()
+        if now >= getattr(self._seen, 'next_check', 0.0):
+            self._seen.next_check = now + self._check_interval
+            # Straight on the sqlite3 connection: Django's cursor wrapping costs more than the pragma
+            connection.ensure_connection()
+            raw = connection.connection
+            version = (id(raw), raw.execute("PRAGMA data_version").fetchone()[0])
+            if getattr(self._seen, 'version', None) != version:
+                self._seen.version = version
+                self.clear_local()
+        return True
+
+    def _observe(self, generation):
+        with self._lock:
+            changed, self._generation = generation != self._generation, generation
+        if changed:
+            self.clear_local()
+
+    def _wrote(self):
+        """
+        Called after each write to the shared tier: if the generation only moved
+        by this write, the local tier is still current, so it is kept.
+        """
+        last_write = getattr(self.shared, 'last_write', None)
+        written = last_write() if last_write else None
+        if written:
+            with self._lock:
+                if self._generation == written[0]:
+                    self._generation = written[1]
+
+    def _local_key(self, key, version):
+        return self.make_and_validate_key(key, version=version)
+
+    def _cacheable(self, key):
+        return not (self._exclude and key.startswith(self._exclude))
+
+    def _remember(self, key, version, value, timeout):
+        local_key = self._local_key(key, version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        if not self._cacheable(key) or len(pickled) > self._max_item_bytes or timeout is not None and timeout <= 0:
+            self._forget([local_key])
+            return
+
+        ttl = self._local_timeout if timeout is None else min(timeout, self._local_timeout)
+        with self._lock:
+            previous = self._local.pop(local_key, None)
+            if previous:
+                self._local_bytes -= len(previous[1])
+            self._local[local_key] = (time.monotonic() + ttl, pickled)
+            self._local_bytes += len(pickled)
+            while len(self._local) > self._max_local_entries or self._local_bytes > self._max_local_bytes:
+                _, (_, evicted) = self._local.popitem(last=False)
+                self._local_bytes -= len(evicted)
+
+    def _forget(self, local_keys):
+        with self._lock:
+            for local_key in local_keys:
+                entry = self._local.pop(local_key, None)
+                if entry:
+                    self._local_bytes -= len(entry[1])
+
+    def clear_local(self):
+        """Empties this process's local tier."""
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+
+    def _timeout_seconds(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    # ── Cache API ──
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        local = self._local_usable()
+        result, missing = {}, keys
+        if local:
+            missing = []
+            now = time.monotonic()
+            with self._lock:
+                for key in keys:
+                    local_key = self._local_key(key, version)
+                    entry = self._local.get(local_key)
+                    if entry and entry[0] > now:
+                        self._local.move_to_end(local_key)
+                        result[key] = entry[1]
+                    else:
+                        missing.append(key)
+            result = {key: pickle.loads(pickled) for key, pickled in result.items()}
+
+        if missing:
+            with_expiry = getattr(self.shared, 'get_many_with_expiry', None)
+            if with_expiry is None:
+                # Without the shared TTL a local copy could outlive the entry: read through only
+                fetched = self.shared.get_many(missing, version=version)
+            else:
+                fetched = {}
+                for key, (value, ttl) in with_expiry(missing, version=version).items():
+                    fetched[key] = value
+                    if local:
+                        self._remember(key, version, value, ttl)
+            result.update(fetched)
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._wrote()
+        if self._local_usable():
+            self._remember(key, version, value, self._timeout_seconds(timeout))
+        else:
+            self._forget([self._local_key(key, version)])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        self._wrote()
+        local = self._local_usable()
+        for key, value in data.items():
+            if local and key not in failed:
+                self._remember(key, version, value, self._timeout_seconds(timeout))
+            else:
+                self._forget([self._local_key(key, version)])
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        self._wrote()
+        if added and self._local_usable():
+            self._remember(key, version, value, self._timeout_seconds(timeout))
+        else:
+            self._forget([self._local_key(key, version)])
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._forget([self._local_key(key, version)])
+        touched = self.shared.touch(key, timeout, version=version)
+        self._wrote()
+        return touched
+
+    def delete(self, key, version=None):
+        self._forget([self._local_key(key, version)])
+        deleted = self.shared.delete(key, version=version)
+        self._wrote()
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self._forget([self._local_key(key, version) for key in keys])
+        self.shared.delete_many(keys, version=version)
+        self._wrote()
+
+    def has_key(self, key, version=None):
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._forget([self._local_key(key, version)])
+        value = self.shared.incr(key, delta, version=version)
+        self._wrote()
+        return value
+
+    def clear(self):
+        self.clear_local()
+        self.shared.clear()
+        self._wrote()
+
+    def local_stats(self):
+        """Size of this process's local tier."""
+        with self._lock:
+            return {'entries': len(self._local), 'bytes': self._local_bytes}
@@ -0,0 +1,256 @@
+"""
+Cache helpers shared by views, context processors and tasks.
+get_or_compute() protects hot keys such as homepage_context from stampedes:
+when the key is missing, one caller (in any thread or gunicorn / huey
+process) recomputes it under a lock held in the shared cache, while the
+others serve the previous value or briefly wait for the new one.
+
+Values registered in CACHED_VALUES also carry a soft timeout and the tags
+(model labels) they are built from. Once stale, or once one of their tags
+has been bumped by a save / delete / sync, they are still served while the
+warm_cache huey task recomputes them, so visitors never pay for a cold cache.
+Eager values (the navigation shown on every page) are instead rebuilt as
+soon as a tag bump commits, so a renamed or hidden project never lingers in
+menus until the task has run.
+"""
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "lock:"
+STALE_PREFIX = "stale:"
+WARMING_PREFIX = "warming:"
+TAG_PREFIX = "tag:"
+# How long a stale copy outlives its key, so invalidated values can still be served during a recompute
+STALE_TIMEOUT = 60 * 60 * 24
+
+HOUR = 60 * 60
+CachedValue = namedtuple('CachedValue', 'compute soft_timeout timeout tags eager', defaults=(False,))
+
+# Past the soft timeout a value is served while it is refreshed in the
+# background; past the hard one it is gone and the next visitor recomputes it.
+# Tag bumps trigger the refresh as soon as the data changes, so the timeouts
+# only bound how stale a missed invalidation can get.
+CACHED_VALUES = {
+    'homepage_context': CachedValue(
+        'core.views._homepage_context', 6 * HOUR, 24 * HOUR,
+        ('projects.Project', 'publications.Publication'),
+    ),
+    'active_projects_sidebar': CachedValue(
+        'kiri_project.context_processors._active_projects', 24 * HOUR, 7 * 24 * HOUR, ('projects.Project',), eager=True,
+    ),
+    'ecosystem_platforms_active': CachedValue(
+        'kiri_project.context_processors._ecosystem_platforms', 24 * HOUR, 7 * 24 * HOUR, ('core.EcosystemPlatform',),
+        eager=True,
+    ),
+    'kiri_platforms_active': CachedValue(
+        'kiri_project.context_processors._kiri_platforms', 24 * HOUR, 7 * 24 * HOUR, ('projects.Project',), eager=True,
+    ),
+    # Publishes the client-side search index file and caches its version
+    'search_index_version': CachedValue(
+        'core.static_search.publish', 24 * HOUR, 7 * 24 * HOUR, ('projects.Project', 'publications.Publication'),
+    ),
+}
+
+
+def model_tag(model):
+    """'app_label.Model'."""
+    return model._meta.label
+
+
+def get_cached(key):
+    """Returns a registered value (see CACHED_VALUES), refreshing it in the background once it goes stale."""
+    spec = CACHED_VALUES[key]
+    return get_or_compute(key, import_string(spec.compute), spec.timeout, spec.soft_timeout, tags=spec.tags)
+
+
+def get_or_compute(key, compute, timeout, soft_timeout=None, tags=(), lock_timeout=30, wait=2.0):
+    """
+    Returns the cached value for `key`, calling `compute()` to rebuild it if
+    it is missing. Only the caller holding the key's lock computes; the others
+    return the last value (kept under `stale:<key>` for STALE_TIMEOUT) or, if
+    there is none, poll for up to `wait` seconds before computing themselves.
+
+    A registered key older than `soft_timeout`, or built before one of its
+    `tags` was bumped, is returned as is and warmed. An unregistered key whose
+    tags were bumped is recomputed.
+    """
+    found = cache.get_many([key, *(TAG_PREFIX + tag for tag in tags)])
+    entry = found.get(key)
+    versions = {tag: found.get(TAG_PREFIX + tag, 0) for tag in tags}
+    if entry is not None:
+        value, fresh_until, built_from = entry
+        changed = built_from != versions
+        if key in CACHED_VALUES:
+            if changed or (fresh_until is not None and time.time() >= fresh_until):
+                warm(key)
+            return value
+        if not changed:
+            return value
+
+    lock_key = f"{LOCK_PREFIX}{key}"
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, lock_timeout):
+        stale = cache.get(f"{STALE_PREFIX}{key}")
+        if stale is not None:
+            return stale
+        value = _wait_for(key, wait)
+        if value is not None:
+            return value
+        logger.warning(f"Gave up waiting for {key} to be recomputed; computing it here")
+        return compute()
+
+    try:
+        value = compute()
+        store(key, value, timeout, soft_timeout, versions)
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    return value
+
+
+def store(key, value, timeout, soft_timeout=None, versions=None):
+    """
+    Caches `value` with its soft expiry and the tag versions it was built
+    from (read before computing), plus the stale copy served during recomputes.
+    """
+    fresh_until = time.time() + soft_timeout if soft_timeout else None
+    cache.set(key, (value, fresh_until, versions or {}), timeout)
+    cache.set(f"{STALE_PREFIX}{key}", value, STALE_TIMEOUT)
+
+
+def _wait_for(key, wait):
+    deadline = time.monotonic() + wait
+    delay = 0.02
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        delay = min(delay * 2, 0.2)
+    return None
+
+
+def warm(*keys):
+    """
+    Queues a background recompute of registered keys once the current
+    transaction commits. Keys already queued are skipped.
+    """
+    from django.db import transaction
+
+    def enqueue():
+        from kiri_project.tasks import warm_cache
+
+        queued = [key for key in keys if cache.add(f"{WARMING_PREFIX}{key}", 1, 60)]
+        if not queued:
+            return
+        try:
+            warm_cache(queued)
+        except Exception as e:
+            logger.error(f"Could not queue cache warming for {', '.join(queued)}: {e}")
+            cache.delete_many([f"{WARMING_PREFIX}{key}" for key in queued])
+
+    transaction.on_commit(enqueue)
+
+
+def refresh(key):
+    """Recomputes and stores a registered key now (run by the warm_cache task)."""
+    spec = CACHED_VALUES[key]
+    # Cleared first, so a change committed while this runs queues another refresh
+    cache.delete(f"{WARMING_PREFIX}{key}")
+    versions = tag_versions(spec.tags)
+    store(key, import_string(spec.compute)(), spec.timeout, spec.soft_timeout, versions)
+
+
+def tag_versions(tags):
+    """Current version of each tag (0 until first bumped)."""
+    found = cache.get_many([TAG_PREFIX + tag for tag in tags])
+    return {tag: found.get(TAG_PREFIX + tag, 0) for tag in tags}
+
+
+def invalidate(*tags):
+    """
+    Bumps `tags` once the current transaction commits, so readers can't
+    rebuild from rows that aren't visible yet, then rebuilds the eager
+    registered values built from them and warms the others.
+    """
+    from django.db import transaction
+
+    def bump():
+        cache.set_many({TAG_PREFIX + tag: time.time_ns() for tag in tags}, None)
+        dependent = [key for key, spec in CACHED_VALUES.items() if set(tags).intersection(spec.tags)]
+        for key in dependent:
+            if CACHED_VALUES[key].eager:
+                try:
+                    refresh(key)
+                except Exception as e:
+                    logger.error(f"Failed to rebuild cache key {key}: {e}")
+                    warm(key)
+        background = [key for key in dependent if not CACHED_VALUES[key].eager]
+        if background:
+            warm(*background)
+
+    transaction.on_commit(bump)
+
+
+def invalidate_model(model):
+    """Invalidates a model's tag (for bulk writes, which send no signals)."""
+    invalidate(model_tag(model))
+
+
+def _model_changed(sender, instance, **kwargs):
+    invalidate_model(sender)
+
+
+def connect_signals():
+    """Invalidates tagged values on post_save / post_delete of every model a registered value is built from."""
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    labels = {tag for spec in CACHED_VALUES.values() for tag in spec.tags}
+    for label in labels:
+        model = apps.get_model(label)
+        post_save.connect(_model_changed, sender=model, dispatch_uid=f"cache-tags:{label}:save")
+        post_delete.connect(_model_changed, sender=model, dispatch_uid=f"cache-tags:{label}:delete")
+
+
+class MicroCache:
+    """
+    A small per-process LRU for values only worth keeping for seconds, such as
+    search API responses. Put a content version (e.g. from tag_versions()) in
+    the keys so that changes miss at once instead of waiting out the timeout.
+    """
+
+    def __init__(self, timeout, max_entries):
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
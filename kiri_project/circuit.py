@@ -0,0 +1,207 @@
+"""
+Circuit breakers for outbound upstreams (GitHub, the Facebook Graph API).
+After repeated failures a host's circuit opens and calls fail immediately
+instead of waiting out their timeouts; once the cool-down passes a single
+half-open probe decides whether it closes again. Transitions are shared
+across gunicorn and huey processes through the cache.
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import urlparse
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    CACHE_PREFIX = "circuit"
+    # Seconds between reads of the shared state, so calls don't each query the cache
+    SYNC_INTERVAL = 2
+
+    def __init__(self, host):
+        self.host = host
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_until = 0
+        self.changed_at = 0
+        self.probing = False
+        self._synced_at = 0
+        # A transition made on a fetch worker, published by flush()
+        self._pending = False
+        self._lock = threading.Lock()
+
+    @property
+    def key(self):
+        return f"{self.CACHE_PREFIX}:{self.host}"
+
+    @staticmethod
+    def failure_threshold():
+        return getattr(settings, 'CIRCUIT_FAILURE_THRESHOLD', 5)
+
+    @staticmethod
+    def reset_seconds():
+        return getattr(settings, 'CIRCUIT_RESET_SECONDS', 60)
+
+    def _sync(self, force=False):
+        """Adopts a newer transition published by another process."""
+        now = time.time()
+        if _in_worker() or (not force and now - self._synced_at < self.SYNC_INTERVAL):
+            return
+        self._synced_at = now
+        try:
+            from django.core.cache import cache
+            shared = cache.get(self.key)
+        except Exception as e:
+            logger.debug(f"Circuit state for {self.host} unavailable: {e}")
+            return
+        if not shared:
+            return
+        with self._lock:
+            if shared['changed_at'] > self.changed_at:
+                self.state = shared['state']
+                self.opened_until = shared['opened_until']
+                self.changed_at = shared['changed_at']
+                self.failures = 0
+                self.probing = False
+
+    def _publish(self):
+        if _in_worker():
+            self._pending = True
+            return
+        self._pending = False
+        try:
+            from django.core.cache import cache
+            cache.set(self.key, {
+                'state': self.state,
+                'opened_until': self.opened_until,
+                'changed_at': self.changed_at,
+            }, self.reset_seconds() * 10)
+        except Exception as e:
+            logger.debug(f"Could not share circuit state for {self.host}: {e}")
+
+    def allow(self):
+        """True if a call may go out now. In half-open state only one probe at a time is allowed."""
+        self._sync()
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.time() < self.opened_until:
+                    return False
+                self.state = HALF_OPEN
+                self.probing = False
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def is_open(self):
+        """True while calls would be rejected; does not start a probe."""
+        self._sync()
+        return self.state == OPEN and time.time() < self.opened_until
+
+    def record_success(self):
+        with self._lock:
+            recovered = self.state != CLOSED
+            self.failures = 0
+            self.probing = False
+            if recovered:
+                self.state = CLOSED
+                self.changed_at = time.time()
+        if recovered:
+            logger.info(f"Circuit for {self.host} closed; upstream recovered")
+            self._publish()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            tripped = self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold())
+            if tripped:
+                self.state = OPEN
+                self.opened_until = time.time() + self.reset_seconds()
+                self.changed_at = time.time()
+        if tripped:
+            logger.warning(
+                f"Circuit for {self.host} opened after {self.failures} failures; "
+                f"failing fast until {self.retry_at():%H:%M:%S} UTC"
+            )
+            self._publish()
+
+    def retry_at(self):
+        """When the next half-open probe may run (aware UTC datetime)."""
+        return datetime.fromtimestamp(max(self.opened_until, time.time()), tz=dt_timezone.utc)
+
+    def status(self):
+        self._sync(force=True)
+        state = self.state
+        if state == OPEN and time.time() >= self.opened_until:
+            state = HALF_OPEN
+        status = {'state': state, 'failures': self.failures}
+        if state == OPEN:
+            status['retry_at'] = self.retry_at().isoformat()
+        return status
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_thread = threading.local()
+
+
+@contextmanager
+def worker():
+    """Marks the current thread as a fetch worker: breakers neither read nor write the cache from it."""
+    _thread.in_worker = True
+    try:
+        yield
+    finally:
+        _thread.in_worker = False
+
+
+def _in_worker():
+    return getattr(_thread, 'in_worker', False)
+
+
+def flush():
+    """Publishes the transitions fetch workers made (see run_concurrently)."""
+    for breaker in list(_breakers.values()):
+        if breaker._pending:
+            breaker._publish()
+
+
+def breaker_for(url_or_host):
+    """The process-wide breaker for a URL's host."""
+    host = urlparse(url_or_host).netloc if '://' in url_or_host else url_or_host
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+
+def upstream_status():
+    """Circuit state of every configured upstream plus any host called by this process."""
+    hosts = {
+        urlparse(getattr(settings, 'GITHUB_API_URL', 'https://api.github.com')).netloc,
+        'graph.facebook.com',
+    }
+    hosts.update(_breakers)
+    return {host: breaker_for(host).status() for host in sorted(hosts)}
+
+
+def reset():
+    """Forgets local breaker state (tests)."""
+    with _breakers_lock:
+        _breakers.clear()
@@ -19,57 +19,51 @@ def kiri_settings(request):
 def ecosystem_platforms(request):
     """
     Inject active ecosystem platforms into all templates.
-    Cached for 5 minutes to avoid repeated DB queries.
+    Cached (see kiri_project.caching) to avoid repeated DB queries.
     """
-    from django.core.cache import cache
-    
-    cache_key = 'ecosystem_platforms_active'
-    platforms = cache.get(cache_key)
-    if platforms is None:
-        from core.models import EcosystemPlatform
-        platforms = list(
-            EcosystemPlatform.objects.filter(is_active=True)
-            .values('name', 'url', 'icon_class', 'short_description')
-        )
-        cache.set(cache_key, platforms, 300)
-    return {'ecosystem_platforms': platforms}
+    from kiri_project.caching import get_cached
+    return {'ecosystem_platforms': get_cached('ecosystem_platforms_active')}
+
+
+def _ecosystem_platforms():
+    from core.models import EcosystemPlatform
+    return list(
+        EcosystemPlatform.objects.filter(is_active=True)
+        .values('name', 'url', 'icon_class', 'short_description')
+    )
 
 
 def active_projects(request):
     """
     Inject active projects into all templates for sidebar navigation.
-    Cached for 5 minutes.
+    Cached, and re-warmed when projects change.
     """
-    from django.core.cache import cache
-    
-    cache_key = 'active_projects_sidebar'
-    projects = cache.get(cache_key)
-    if projects is None:
-        from projects.models import Project
-        projects = list(
-            Project.objects.filter(status=Project.Status.ACTIVE)
-            .values('name', 'slug')
-            .order_by('-created_at')[:5]  # Limit to 5 or so to avoid huge sidebar, they can still go to the Project page for more
-        )
-        cache.set(cache_key, projects, 300)
-    return {'active_projects': projects}
+    from kiri_project.caching import get_cached
+    return {'active_projects': get_cached('active_projects_sidebar')}
+
+
+def _active_projects():
+    from projects.models import Project
+    return list(
+        Project.objects.filter(status=Project.Status.ACTIVE)
+        .values('name', 'slug')
+        .order_by('-created_at')[:5]  # Limit to 5 or so to avoid huge sidebar, they can still go to the Project page for more
+    )
 
 
 def kiri_platforms(request):
     """
     Inject kiri platforms (projects on kiri.ng subdomains).
-    Cached for 24 hours.
+    Cached for 24 hours, and re-warmed when projects change.
     """
-    from django.core.cache import cache
-    
-    cache_key = 'kiri_platforms_active'
-    platforms = cache.get(cache_key)
-    if platforms is None:
-        from projects.models import Project
-        projects = list(
-            Project.objects.filter(status=Project.Status.ACTIVE, live_url__icontains='kiri.ng')
-            .values('name', 'live_url')
-        )
-        platforms = sorted([p for p in projects if p['live_url'] and 'kiri.ng' in p['live_url']], key=lambda x: x['name'])
-        cache.set(cache_key, platforms, 86400) # 24 hours
-    return {'kiri_platforms': platforms}
+    from kiri_project.caching import get_cached
+    return {'kiri_platforms': get_cached('kiri_platforms_active')}
+
+
+def _kiri_platforms():
+    from projects.models import Project
+    projects = list(
+        Project.objects.filter(status=Project.Status.ACTIVE, live_url__icontains='kiri.ng')
+        .values('name', 'live_url')
+    )
+    return sorted([p for p in projects if p['live_url'] and 'kiri.ng' in p['live_url']], key=lambda x: x['name'])
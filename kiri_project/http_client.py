@@ -0,0 +1,131 @@
+"""
+Shared outbound HTTP client.
+One keep-alive requests.Session per host (api.github.com, graph.facebook.com, ...)
+with a small connection pool, jittered retries for idempotent calls and
+per-host latency / error counters.
+"""
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_sessions = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def _retry_policy():
+    """Retries connection failures and 502/503/504 on GET/HEAD only, with jittered backoff."""
+    return Retry(
+        total=getattr(settings, 'HTTP_RETRIES', 2),
+        connect=getattr(settings, 'HTTP_RETRIES', 2),
+        read=0,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        backoff_factor=0.3,
+        backoff_jitter=0.3,
+        raise_on_status=False,
+        # Rate-limit responses are handled by GitHubRateBudget, not by sleeping here
+        respect_retry_after_header=False,
+    )
+
+
+def get_session(host):
+    """Returns the shared session for `host`, creating it on first use."""
+    session = _sessions.get(host)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            pool_size = getattr(settings, 'HTTP_POOL_MAXSIZE', 4)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=_retry_policy())
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[host] = session
+    return session
+
+
+def _entry(host):
+    """Counters for `host`; call with _lock held."""
+    return _stats.setdefault(host, {'requests': 0, 'errors': 0, 'rejected': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+
+
+def _record(host, elapsed, failed):
+    with _lock:
+        entry = _entry(host)
+        entry['requests'] += 1
+        entry['errors'] += int(failed)
+        entry['total_ms'] += elapsed * 1000
+        entry['max_ms'] = max(entry['max_ms'], elapsed * 1000)
+
+
+def request(method, url, **kwargs):
+    """
+    Sends a request through the host's pooled session and records its latency.
+    Raises CircuitOpenError (a requests.ConnectionError) without calling the
+    host while its circuit breaker is open.
+    """
+    from .circuit import CircuitOpenError, breaker_for
+
+    host = urlparse(url).netloc
+    breaker = breaker_for(host)
+    if not breaker.allow():
+        with _lock:
+            _entry(host)['rejected'] += 1
+        raise CircuitOpenError(f"Circuit open for {host}; retry after {breaker.retry_at():%H:%M:%S} UTC")
+
+    start = time.perf_counter()
+    try:
+        response = get_session(host).request(method, url, **kwargs)
+    except requests.RequestException:
+        _record(host, time.perf_counter() - start, failed=True)
+        breaker.record_failure()
+        raise
+    failed = response.status_code >= 500
+    _record(host, time.perf_counter() - start, failed=failed)
+    if failed:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def stats():
+    """Per-host counters for this process: requests, errors, circuit rejections, average and max latency."""
+    with _lock:
+        return {
+            host: {
+                'requests': entry['requests'],
+                'errors': entry['errors'],
+                'avg_ms': round(entry['total_ms'] / entry['requests'], 1) if entry['requests'] else 0.0,
+                'max_ms': round(entry['max_ms'], 1),
+                'rejected': entry['rejected'],
+            }
+            for host, entry in _stats.items()
+        }
+
+
+def reset():
+    """Closes every pooled session and clears the counters (used by tests and after fork)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _stats.clear()
@@ -0,0 +1,39 @@
+"""
+WhiteNoise, extended to serve the client-side search index.
+Index files are written at runtime (core/static_search.py), after WhiteNoise
+has scanned its directories, so they are looked up per request. Their names
+carry a content hash, so they are cached forever like hashed static files.
+"""
+import os
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+from whitenoise.responders import NotARegularFileError
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.search_index_prefix = settings.SEARCH_INDEX_URL
+        self.search_index_root = os.path.abspath(settings.SEARCH_INDEX_ROOT)
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.search_index_prefix):
+            static_file = self.find_search_index_file(request.path_info)
+            if static_file is not None:
+                return self.serve(static_file, request)
+            return self.get_response(request)
+        return super().__call__(request)
+
+    def find_search_index_file(self, url):
+        from core.static_search import INDEX_NAME_RE
+
+        name = url[len(self.search_index_prefix):]
+        if not INDEX_NAME_RE.fullmatch(name):
+            return None
+        try:
+            return self.get_static_file(os.path.join(self.search_index_root, name), url)
+        except NotARegularFileError:
+            return None
+
+    def immutable_file_test(self, path, url):
+        return url.startswith(self.search_index_prefix) or super().immutable_file_test(path, url)
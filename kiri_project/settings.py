@@ -5,6 +5,9 @@ Optimized for Google Cloud 1GB RAM VM deployment.
 
 import os
 import sys
+import atexit
+import shutil
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -14,6 +17,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Security
 DEBUG = os.environ.get("DEBUG", "False") == "True"
+IS_TESTING = 'test' in sys.argv
+# Test runs keep their cache files and search index in one directory, removed on exit
+TEST_FILES_DIR = tempfile.mkdtemp(prefix="kiri-test-") if IS_TESTING else None
+if TEST_FILES_DIR:
+    atexit.register(shutil.rmtree, TEST_FILES_DIR, ignore_errors=True)
 SECRET_KEY = os.environ.get("SECRET_KEY", "django-insecure-dev-key-for-development-only")
 
 if not DEBUG and SECRET_KEY == "django-insecure-dev-key-for-development-only":
@@ -56,7 +64,7 @@ SITE_ID = 1
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "kiri_project.middleware.WhiteNoiseMiddleware",
     "axes.middleware.AxesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -104,16 +112,55 @@ DATABASES = {
     }
 }
 
-# ── Caching — Database Backend ──
+# ── Caching — SQLite Backend ──
+# The shared cache has its own database file so cache churn stays out of db.sqlite3's WAL;
+# each test run gets a fresh one
+CACHE_DB_PATH = (
+    os.path.join(TEST_FILES_DIR, "cache.sqlite3") if IS_TESTING
+    else os.environ.get("CACHE_DB_PATH", str(BASE_DIR / "cache.sqlite3"))
+)
+# Rendered READMEs get a file (and size limit) of their own, so they never evict page contexts or locks
+MARKDOWN_CACHE_DB_PATH = os.path.join(os.path.dirname(CACHE_DB_PATH), "markdown-cache.sqlite3")
+
+# Keys never copied into a process's local tier, so writing them doesn't invalidate its copies:
+# budget, circuit, lock and warming state must be read fresh
+CACHE_LOCAL_EXCLUDE_PREFIXES = ["github_ratelimit:", "circuit:", "github_deferred:", "lock:", "warming:"]
+
 CACHES = {
+    # Per-process LRU in front of the shared SQLite cache (see kiri_project.cache)
     "default": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
-        "LOCATION": "kiri_cache_table",
+        "BACKEND": "kiri_project.cache.TieredCache",
+        "LOCATION": "shared",
         "TIMEOUT": 60 * 15,
         "OPTIONS": {
-            "MAX_ENTRIES": 2000
+            "LOCAL_MAX_ENTRIES": 256,
+            "LOCAL_MAX_BYTES": 4 * 1024 * 1024,
+            "LOCAL_TIMEOUT": 60,
+            "LOCAL_EXCLUDE_PREFIXES": CACHE_LOCAL_EXCLUDE_PREFIXES,
+            "COHERENCE_INTERVAL": 1,
+        },
+    },
+    "shared": {
+        "BACKEND": "kiri_project.sqlite_cache.SQLiteCache",
+        "LOCATION": CACHE_DB_PATH,
+        "TIMEOUT": 60 * 15,
+        "OPTIONS": {
+            "MAX_ENTRIES": 2000,
+            # Page contexts compress several-fold
+            "COMPRESS_MIN_BYTES": 4096,
+            "UNTRACKED_PREFIXES": CACHE_LOCAL_EXCLUDE_PREFIXES,
         }
-    }
+    },
+    # Rendered README documents and blocks (see publications.utils), behind their own per-process LRU
+    "markdown": {
+        "BACKEND": "kiri_project.sqlite_cache.SQLiteCache",
+        "LOCATION": MARKDOWN_CACHE_DB_PATH,
+        "TIMEOUT": 60 * 60 * 24 * 7,
+        "OPTIONS": {
+            "MAX_ENTRIES": 5000,
+            "COMPRESS_MIN_BYTES": 4096,
+        }
+    },
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -136,6 +183,17 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Client-side Spotlight index (core/static_search.py): written at runtime with a
+# content-hash filename and served by WhiteNoise (kiri_project.middleware)
+SEARCH_INDEX_URL = "/search-index/"
+SEARCH_INDEX_ROOT = (
+    os.path.join(TEST_FILES_DIR, "search_index") if IS_TESTING
+    else os.environ.get("SEARCH_INDEX_ROOT", str(BASE_DIR / "search_index"))
+)
+# Spotlight API responses: seconds kept in each process's micro-cache and in CDNs / browsers
+SEARCH_CACHE_SECONDS = int(os.environ.get("SEARCH_CACHE_SECONDS", 60))
+SEARCH_CACHE_ENTRIES = 1024
+
 WHITENOISE_CUSTOM_HEADERS = [
     (r'.*', {
         'Cross-Origin-Resource-Policy': 'cross-origin',
@@ -191,12 +249,37 @@ TASKS = {
     },
 }
 
+# ── GitHub Sync ──
+# REST/GraphQL API root; point at benchmarks/fake_github.py for offline load tests
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+# Upper bound on simultaneous GitHub requests made by a single sync run
+GITHUB_SYNC_CONCURRENCY = int(os.environ.get("GITHUB_SYNC_CONCURRENCY", "4"))
+# Minimum projects per polling run; raised automatically so every project is
+# refreshed at least every GITHUB_SYNC_MAX_AGE_HOURS
+GITHUB_SYNC_BATCH_SIZE = int(os.environ.get("GITHUB_SYNC_BATCH_SIZE", "20"))
+GITHUB_SYNC_MAX_AGE_HOURS = int(os.environ.get("GITHUB_SYNC_MAX_AGE_HOURS", "24"))
+# Shared secret for the GitHub webhook receiver (push / repository / star / release)
+GITHUB_WEBHOOK_SECRET = os.environ.get("GITHUB_WEBHOOK_SECRET", "")
+# With webhooks delivering updates, polling only runs as a low-frequency safety net
+GITHUB_POLL_INTERVAL_HOURS = int(os.environ.get("GITHUB_POLL_INTERVAL_HOURS", "6" if GITHUB_WEBHOOK_SECRET else "1"))
+GITHUB_POLL_HOURS = "*" if GITHUB_POLL_INTERVAL_HOURS <= 1 else f"*/{GITHUB_POLL_INTERVAL_HOURS}"
+# Calls background syncs leave untouched for admin actions and management commands
+GITHUB_RATELIMIT_RESERVE = int(os.environ.get("GITHUB_RATELIMIT_RESERVE", "100"))
+
+# ── Outbound HTTP ──
+# Keep-alive connections per upstream host; sized to GITHUB_SYNC_CONCURRENCY
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", str(GITHUB_SYNC_CONCURRENCY)))
+# Retries for idempotent (GET/HEAD) calls on connection errors and 502/503/504
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+# Consecutive failures (errors, timeouts, 5xx) that open a host's circuit, and
+# how long it stays open before a half-open probe
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = int(os.environ.get("CIRCUIT_RESET_SECONDS", "60"))
+
 # ── General & Security ──
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 SITE_URL = os.environ.get("SITE_URL", "https://kiri.ng")
 
-IS_TESTING = 'test' in sys.argv
-
 if not DEBUG or IS_TESTING:
     SECURE_SSL_REDIRECT = not IS_TESTING
     SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -0,0 +1,77 @@
+"""
+Compact, read-only stand-ins for model instances in cached template contexts.
+A snapshot carries only the fields the cards render, with derived values
+(preview images, tech stack lists, choice labels) computed once when the
+context is built, and pickles as a plain tuple.
+"""
+from django.urls import reverse
+from django.utils.text import Truncator
+
+
+class Snapshot:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {getattr(self, self.__slots__[1])}>"
+
+
+class ProjectSnapshot(Snapshot):
+    """Project card / sidebar entry (templates/partials/home)."""
+
+    __slots__ = (
+        'slug', 'name', 'description', 'language', 'status', 'status_display',
+        'category', 'category_display', 'live_url', 'preview_image_url',
+        'tech_stack_list', 'created_at',
+    )
+    # Columns read to build one
+    FIELDS = (
+        'slug', 'name', 'description', 'language', 'status', 'category', 'live_url',
+        'custom_image_url', 'github_repo_url', 'huggingface_url', 'tech_stack', 'created_at',
+    )
+
+    @classmethod
+    def from_project(cls, project, description_words=20):
+        return cls(
+            project.slug,
+            project.name,
+            Truncator(project.description).words(description_words),
+            project.language,
+            project.status,
+            project.get_status_display(),
+            project.category,
+            project.get_category_display(),
+            project.live_url,
+            project.preview_image_url,
+            project.tech_stack_list,
+            project.created_at,
+        )
+
+    def get_status_display(self):
+        return self.status_display
+
+    def get_category_display(self):
+        return self.category_display
+
+    def get_absolute_url(self):
+        return reverse("projects:detail", kwargs={"slug": self.slug})
+
+
+class PublicationSnapshot(Snapshot):
+    """Publication sidebar entry."""
+
+    __slots__ = ('slug', 'title', 'published_at')
+    FIELDS = __slots__
+
+    @classmethod
+    def from_publication(cls, publication):
+        return cls(publication.slug, publication.title, publication.published_at)
+
+    def get_absolute_url(self):
+        return reverse('publications:detail', kwargs={'slug': self.slug})
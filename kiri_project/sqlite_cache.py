@@ -0,0 +1,364 @@
+"""
+SQLite cache backend.
+Entries live in their own database file (its own WAL, so cache churn never
+queues behind app writes to db.sqlite3) in a WITHOUT ROWID table keyed by a
+64-bit hash of the cache key. Expiry and last access are integer epoch
+milliseconds with an index each, and a trigger-maintained row count lets eviction delete a bounded
+batch of expired, then least recently used, entries instead of Django's
+COUNT(*) scan and random cull. A generation counter advances with every
+write or delete of a tracked key, for the tiered cache's coherence check.
+"""
+import os
+import time
+import zlib
+import pickle
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Stored expiry for entries without a timeout
+NEVER = 2 ** 62
+
+# Prefix of zlib-compressed values (pickles themselves start with b'\x80')
+COMPRESSED = b'z'
+# Rows per multi-row statement (5 parameters each, well under SQLite's variable limit)
+BATCH_ROWS = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key_hash INTEGER PRIMARY KEY,
+    cache_key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires INTEGER NOT NULL,
+    accessed INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires);
+CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed);
+CREATE TABLE IF NOT EXISTS cache_count (id INTEGER PRIMARY KEY CHECK (id = 1), entries INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_count VALUES (1, (SELECT COUNT(*) FROM cache_entry));
+CREATE TRIGGER IF NOT EXISTS cache_entry_added AFTER INSERT ON cache_entry
+    BEGIN UPDATE cache_count SET entries = entries + 1; END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_removed AFTER DELETE ON cache_entry
+    BEGIN UPDATE cache_count SET entries = entries - 1; END;
+CREATE TABLE IF NOT EXISTS cache_generation (id INTEGER PRIMARY KEY CHECK (id = 1), generation INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_generation VALUES (1, 0);
+"""
+
+UPSERT = (
+    "INSERT INTO cache_entry (key_hash, cache_key, value, expires, accessed) VALUES {rows} "
+    "ON CONFLICT (key_hash) DO UPDATE SET cache_key = excluded.cache_key, value = excluded.value, "
+    "expires = excluded.expires, accessed = excluded.accessed"
+)
+
+
+def now_ms():
+    return time.time_ns() // 1_000_000
+
+
+def key_hash(cache_key):
+    """Signed 64-bit hash of a full cache key (the table's primary key)."""
+    return int.from_bytes(hashlib.blake2b(cache_key.encode(), digest_size=8).digest(), 'big', signed=True)
+
+
+class SQLiteCache(BaseCache):
+    """
+    LOCATION is the database file path (or a `file:` URI). OPTIONS:
+    MAX_ENTRIES bounds the table, CULL_BATCH is how far below MAX_ENTRIES an
+    eviction pass goes (default 5% of it), ACCESS_RESOLUTION is how stale an
+    entry's last-access time may get before a read refreshes it,
+    COMPRESS_MIN_BYTES zlib-compresses pickles at least that large (0 turns
+    compression off), TIMEOUT is SQLite's busy timeout in seconds, and
+    UNTRACKED_PREFIXES lists keys whose writes leave generation() alone.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._location = str(location)
+        self._cull_batch = options.get('CULL_BATCH', max(1, self._max_entries // 20))
+        # Reads only write back access times older than this, so hot keys don't turn every read into a write
+        self._access_resolution = options.get('ACCESS_RESOLUTION', 300) * 1000
+        self._busy_timeout = options.get('TIMEOUT', 5)
+        self._compress_min_bytes = options.get('COMPRESS_MIN_BYTES', 0)
+        self._untracked = tuple(options.get('UNTRACKED_PREFIXES', ()))
+        self._local = threading.local()
+
+    # ── Connections ──
+
+    def _connection(self):
+        """This thread's connection, reopened after a fork."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(
+            self._location,
+            timeout=self._busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            uri=self._location.startswith('file:'),
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        if not connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'cache_generation'").fetchone():
+            with self._transaction(connection):
+                for statement in self._schema_statements():
+                    connection.execute(statement)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _schema_statements():
+        # Trigger bodies contain ';', so split on the statement terminator at line end only
+        return [statement for statement in SCHEMA.split(';\n') if statement.strip()]
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection):
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def generation(self):
+        """
+        Advances whenever any process writes or deletes a tracked key; the
+        tiered cache uses it to invalidate its per-process copies. Expiry,
+        eviction and access-time write-backs leave it alone.
+        """
+        return self._connection().execute("SELECT generation FROM cache_generation").fetchone()[0]
+
+    def last_write(self):
+        """(generation before, generation after) of this thread's last tracked write, if not yet asked for."""
+        written = getattr(self._local, 'written', None)
+        self._local.written = None
+        return written
+
+    # ── Helpers ──
+
+    def _keys(self, keys, version):
+        """Maps key_hash -> (key, full cache key)."""
+        result = {}
+        for key in keys:
+            cache_key = self.make_and_validate_key(key, version=version)
+            result[key_hash(cache_key)] = (key, cache_key)
+        return result
+
+    def _dumps(self, value):
+        data = pickle.dumps(value, self.pickle_protocol)
+        if self._compress_min_bytes and len(data) >= self._compress_min_bytes:
+            return COMPRESSED + zlib.compress(data)
+        return data
+
+    @staticmethod
+    def _loads(data):
+        if data[:1] == COMPRESSED:
+            data = zlib.decompress(memoryview(data)[1:])
+        return pickle.loads(data)
+
+    def _expiry(self, timeout):
+        expires = self.get_backend_timeout(timeout)
+        return NEVER if expires is None else int(expires * 1000)
+
+    def _cull(self, connection, now):
+        """Brings the table back under MAX_ENTRIES: expired rows first, then the least recently used."""
+        entries = connection.execute("SELECT entries FROM cache_count").fetchone()[0]
+        if entries <= self._max_entries:
+            return
+        excess = entries - self._max_entries + self._cull_batch
+        removed = connection.execute(
+            "DELETE FROM cache_entry WHERE key_hash IN "
+            "(SELECT key_hash FROM cache_entry WHERE expires <= ? ORDER BY expires LIMIT ?)",
+            (now, excess),
+        ).rowcount
+        if removed < excess:
+            connection.execute(
+                "DELETE FROM cache_entry WHERE key_hash IN "
+                "(SELECT key_hash FROM cache_entry ORDER BY accessed LIMIT ?)",
+                (excess - removed,),
+            )
+
+    def _tracked(self, keys):
+        return any(not key.startswith(self._untracked) for key in keys) if self._untracked else bool(keys)
+
+    def _advance(self, connection):
+        """Advances the generation inside the caller's write transaction."""
+        generation = connection.execute(
+            "UPDATE cache_generation SET generation = generation + 1 RETURNING generation"
+        ).fetchone()[0]
+        self._local.written = (generation - 1, generation)
+
+    def _write_rows(self, rows, tracked):
+        now = now_ms()
+        with self._transaction(self._connection()) as connection:
+            if tracked:
+                self._advance(connection)
+            for start in range(0, len(rows), BATCH_ROWS):
+                batch = rows[start:start + BATCH_ROWS]
+                connection.execute(
+                    UPSERT.format(rows=', '.join(['(?, ?, ?, ?, ?)'] * len(batch))),
+                    [value for row in batch for value in row],
+                )
+            self._cull(connection, now)
+
+    # ── Cache API ──
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        return {key: value for key, (value, _) in self.get_many_with_expiry(keys, version=version).items()}
+
+    def get_many_with_expiry(self, keys, version=None):
+        """Like get_many, but maps each key to (value, seconds left, or None if it never expires)."""
+        key_map = self._keys(keys, version)
+        if not key_map:
+            return {}
+
+        connection = self._connection()
+        now = now_ms()
+        result, stale = {}, []
+        hashes = list(key_map)
+        for start in range(0, len(hashes), BATCH_ROWS * 5):
+            batch = hashes[start:start + BATCH_ROWS * 5]
+            rows = connection.execute(
+                f"SELECT key_hash, cache_key, value, expires, accessed FROM cache_entry "
+                f"WHERE key_hash IN ({', '.join('?' * len(batch))}) AND expires > ?",
+                [*batch, now],
+            )
+            for row_hash, cache_key, value, expires, accessed in rows:
+                key, expected = key_map[row_hash]
+                if cache_key != expected:
+                    continue
+                result[key] = (self._loads(value), None if expires == NEVER else (expires - now) / 1000)
+                if accessed < now - self._access_resolution:
+                    stale.append(row_hash)
+
+        if stale:
+            try:
+                connection.execute(
+                    f"UPDATE cache_entry SET accessed = ? WHERE key_hash IN ({', '.join('?' * len(stale))})",
+                    [now, *stale],
+                )
+            except sqlite3.OperationalError:
+                # A busy database only costs LRU precision
+                pass
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires, now = self._expiry(timeout), now_ms()
+        rows = []
+        for key, value in data.items():
+            cache_key = self.make_and_validate_key(key, version=version)
+            rows.append((key_hash(cache_key), cache_key, self._dumps(value), expires, now))
+        if rows:
+            self._write_rows(rows, self._tracked(data))
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        cache_key = self.make_and_validate_key(key, version=version)
+        now = now_ms()
+        with self._transaction(self._connection()) as connection:
+            added = connection.execute(
+                UPSERT.format(rows='(?, ?, ?, ?, ?)') +
+                " WHERE cache_entry.expires <= ? OR cache_entry.cache_key != excluded.cache_key",
+                (key_hash(cache_key), cache_key, self._dumps(value),
+                 self._expiry(timeout), now, now),
+            ).rowcount
+            if added:
+                if self._tracked([key]):
+                    self._advance(connection)
+                self._cull(connection, now)
+        return bool(added)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        cache_key = self.make_and_validate_key(key, version=version)
+        with self._transaction(self._connection()) as connection:
+            touched = connection.execute(
+                "UPDATE cache_entry SET expires = ? WHERE key_hash = ? AND cache_key = ? AND expires > ?",
+                (self._expiry(timeout), key_hash(cache_key), cache_key, now_ms()),
+            ).rowcount
+            if touched and self._tracked([key]):
+                self._advance(connection)
+        return bool(touched)
+
+    def delete(self, key, version=None):
+        cache_key = self.make_and_validate_key(key, version=version)
+        with self._transaction(self._connection()) as connection:
+            deleted = connection.execute(
+                "DELETE FROM cache_entry WHERE key_hash = ? AND cache_key = ?",
+                (key_hash(cache_key), cache_key),
+            ).rowcount
+            if deleted and self._tracked([key]):
+                self._advance(connection)
+        return bool(deleted)
+
+    def delete_many(self, keys, version=None):
+        key_map = self._keys(keys, version)
+        if not key_map:
+            return
+        hashes = list(key_map)
+        with self._transaction(self._connection()) as connection:
+            if self._tracked([key for key, _ in key_map.values()]):
+                self._advance(connection)
+            for start in range(0, len(hashes), BATCH_ROWS * 5):
+                batch = hashes[start:start + BATCH_ROWS * 5]
+                connection.execute(
+                    f"DELETE FROM cache_entry WHERE key_hash IN ({', '.join('?' * len(batch))})",
+                    batch,
+                )
+
+    def has_key(self, key, version=None):
+        cache_key = self.make_and_validate_key(key, version=version)
+        return self._connection().execute(
+            "SELECT 1 FROM cache_entry WHERE key_hash = ? AND cache_key = ? AND expires > ?",
+            (key_hash(cache_key), cache_key, now_ms()),
+        ).fetchone() is not None
+
+    def incr(self, key, delta=1, version=None):
+        """Atomic across processes: the read and the write share one IMMEDIATE transaction."""
+        cache_key = self.make_and_validate_key(key, version=version)
+        with self._transaction(self._connection()) as connection:
+            row = connection.execute(
+                "SELECT value FROM cache_entry WHERE key_hash = ? AND cache_key = ? AND expires > ?",
+                (key_hash(cache_key), cache_key, now_ms()),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = self._loads(row[0]) + delta
+            connection.execute(
+                "UPDATE cache_entry SET value = ? WHERE key_hash = ?",
+                (self._dumps(value), key_hash(cache_key)),
+            )
+            if self._tracked([key]):
+                self._advance(connection)
+        return value
+
+    def clear(self):
+        with self._transaction(self._connection()) as connection:
+            connection.execute("DELETE FROM cache_entry")
+            self._advance(connection)
+
+    def prune(self):
+        """Deletes every expired entry (an index range scan); returns how many were removed."""
+        return self._connection().execute(
+            "DELETE FROM cache_entry WHERE expires <= ?", (now_ms(),)
+        ).rowcount
+
+    def entry_count(self):
+        return self._connection().execute("SELECT entries FROM cache_count").fetchone()[0]
+
+    def close(self, **kwargs):
+        # Connections are per thread and kept open across requests
+        pass
@@ -2,52 +2,133 @@ import os
 import logging
 import time
 import requests
-from huey.contrib.djhuey import db_task, db_periodic_task
+from huey.contrib.djhuey import db_task, db_periodic_task, on_startup
 from huey import crontab
 from django.conf import settings
 from django.utils import timezone
 from django.utils.text import slugify
+from kiri_project import http_client
 
 logger = logging.getLogger(__name__)
 
+# GitHub organization whose repositories are synced as publications
+PUBLICATIONS_ORG = 'kiri-labs'
 
-@db_periodic_task(crontab(minute='0', hour='*'))
+# Publication fields written by sync_publications: cheap metadata, and the
+# rendered README (with its plain text for search), which is only rewritten
+# when its blob SHA changes
+PUBLICATION_SYNC_FIELDS = [
+    'title', 'slug', 'description',
+    'github_url', 'topics', 'published_at', 'pushed_at',
+]
+PUBLICATION_CONTENT_FIELDS = ['html_content', 'body_text', 'readme_sha']
+
+# Stands in for README text whose download failed: the stored README, its SHA
+# and pushed_at are then left as they are. A repo confirmed to have no README
+# (REST /readme answered 404) has '' as its text; None means not downloaded.
+README_UNAVAILABLE = object()
+
+
+@db_periodic_task(crontab(minute='0', hour=settings.GITHUB_POLL_HOURS))
 def sync_github_stats():
     """
     Syncs stars, forks, and description from GitHub for all projects.
-    Uses centralized GitHubService with batching to avoid rate limits.
+    Each run picks the stalest projects (featured and active first), sized
+    to keep every project fresh within the remaining rate-limit budget.
     """
-    from projects.models import Project
-    from projects.utils import sync_project_metadata
+    from projects.ratelimit import GitHubRateBudget
+    from projects.utils import select_stale_projects
 
     logger.info("Starting GitHub stats sync...")
 
-    BATCH_SIZE = 20
-    total_projects = Project.objects.count()
-    if total_projects == 0:
+    if _github_circuit_open(sync_github_stats):
+        return
+    if not GitHubRateBudget.can_spend() and not GitHubRateBudget.can_spend(resource='graphql'):
+        _defer_until_reset(sync_github_stats)
+        return
+
+    projects = select_stale_projects()
+    if not projects:
         return
 
-    num_batches = (total_projects + BATCH_SIZE - 1) // BATCH_SIZE
-    current_hour = timezone.now().hour
-    current_minute = timezone.now().minute
-    batch_index = (current_hour * 2 + (current_minute // 30)) % num_batches
-    batch_offset = batch_index * BATCH_SIZE
+    updated_count, errors = _sync_projects(projects)
+    logger.info(f"GitHub Sync Complete. Updated: {updated_count}, Errors: {errors}")
+
+
+@db_task()
+def sync_selected_projects(project_ids, force=False):
+    """
+    Syncs specific projects, e.g. an admin sync deferred by the rate-limit
+    budget or a webhook event. `force` skips the one-hour freshness check.
+    """
+    from projects.models import Project
+
+    projects = list(Project.objects.filter(pk__in=project_ids))
+    updated_count, errors = _sync_projects(projects, interactive=True, force=force)
+    logger.info(f"Selected project sync complete. Updated: {updated_count}, Errors: {errors}")
+
+
+def _sync_projects(projects, interactive=False, force=False):
+    """
+    Fetches GitHub metadata for `projects` and applies it.
+    Returns (updated_count, errors).
+    """
+    from projects.utils import apply_project_metadata, fetch_projects_data, needs_sync, save_synced_projects
 
-    projects = Project.objects.all().order_by('id')[batch_offset:batch_offset + BATCH_SIZE]
+    batch_data = fetch_projects_data(projects, interactive=interactive)
 
-    updated_count = 0
+    # Apply phase: collect changes in memory, then write them in one transaction
+    synced = []
     errors = 0
 
     for project in projects:
+        data = batch_data.get(project.github_repo_url)
         try:
-            if sync_project_metadata(project):
+            if (force or needs_sync(project)) and apply_project_metadata(project, data):
                 logger.info(f"Synced {project.name}")
-                updated_count += 1
+                synced.append(project)
         except Exception as e:
             logger.error(f"Error syncing {project.name}: {e}")
             errors += 1
 
-    logger.info(f"GitHub Sync Complete. Updated: {updated_count}, Errors: {errors}")
+    try:
+        save_synced_projects(synced)
+    except Exception as e:
+        logger.error(f"Error saving synced projects: {e}")
+        errors += len(synced)
+        synced = []
+
+    updated_count = len(synced)
+    return updated_count, errors
+
+
+def _defer_until_reset(task, args=None, resource='core', resume_at=None, reason='GitHub rate limit'):
+    """
+    Re-queues a task for just after the GitHub rate-limit window resets (or
+    `resume_at`), instead of waiting for the next cron tick. Only one deferral
+    per task is queued per window.
+    """
+    from django.core.cache import cache
+    from projects.ratelimit import GitHubRateBudget
+
+    resume_at = resume_at or GitHubRateBudget.resume_at(resource)
+    timeout = max(int((resume_at - timezone.now()).total_seconds()), 1)
+    key = f"github_deferred:{task.name}" + (f":{args!r}" if args else '')
+    if cache.add(key, resume_at.isoformat(), timeout):
+        task.schedule(args=args or (), eta=resume_at)
+        logger.warning(f"{task.name} deferred until {resume_at.isoformat()} ({reason})")
+
+
+def _github_circuit_open(task, args=None):
+    """Defers `task` and returns True while GitHub's circuit breaker is open."""
+    from kiri_project.circuit import breaker_for
+    from projects.services import GitHubService
+
+    breaker = breaker_for(GitHubService.api_url(''))
+    if not breaker.is_open():
+        return False
+    _defer_until_reset(task, args, resume_at=breaker.retry_at(), reason='GitHub circuit open')
+    return True
 
 
 @db_periodic_task(crontab(minute='0', hour='1'))
@@ -95,119 +176,411 @@ def cleanup_tmp_files():
     logger.info(f"Cleanup Complete. Deleted {deleted_count} files. Errors: {errors}")
 
 
+@db_task()
+def warm_cache(keys):
+    """Recomputes registered cache values (kiri_project.caching.CACHED_VALUES) ahead of visitors."""
+    from kiri_project.caching import refresh
+
+    for key in keys:
+        try:
+            refresh(key)
+        except Exception as e:
+            logger.error(f"Failed to warm cache key {key}: {e}")
+
+
+@on_startup()
+def warm_cache_on_startup():
+    """Queues a warm-up of every registered cache value when the consumer starts (i.e. after a deploy)."""
+    from kiri_project.caching import CACHED_VALUES, warm
+
+    warm(*CACHED_VALUES)
+
+
 @db_periodic_task(crontab(minute='0', hour='3'))
 def prune_cache_table():
-    """Prune expired entries from the database cache to prevent unbounded growth."""
-    from django.db import connection
+    """Prune expired entries from the shared and markdown SQLite caches to prevent unbounded growth."""
+    from django.core.cache import caches
 
-    logger.info("Pruning database cache table...")
-    with connection.cursor() as cursor:
-        cursor.execute(
-            "DELETE FROM kiri_cache_table WHERE expires < datetime('now')"
-        )
-        deleted = cursor.rowcount
+    logger.info("Pruning cache database...")
+    deleted = caches['shared'].prune() + caches['markdown'].prune()
     logger.info(f"Cache pruning complete. Removed {deleted} expired entries")
 
 
-@db_periodic_task(crontab(minute='30'))
+@db_periodic_task(crontab(minute='30', hour=settings.GITHUB_POLL_HOURS))
 def sync_publications():
     """
     Fetches all repositories from the 'kiri-labs' organization and syncs them as publications.
     """
+    from django.db import transaction
     from publications.models import Publication
-    from publications.utils import process_markdown
+    from kiri_project.caching import invalidate_model
+    from kiri_project.circuit import CircuitOpenError
+    from projects.ratelimit import GitHubRateBudget, RateLimitExceeded
+    from projects.services import GitHubService
 
-    logger.info("Starting Publications sync for Organization: kiri-labs...")
+    logger.info(f"Starting Publications sync for Organization: {PUBLICATIONS_ORG}...")
 
-    headers = {
-        'Accept': 'application/vnd.github.v3+json',
-        'User-Agent': 'Kiri-Research-Labs',
-    }
-    github_token = os.environ.get('GITHUB_TOKEN', '')
-    if github_token:
-        headers['Authorization'] = f'token {github_token}'
+    if _github_circuit_open(sync_publications):
+        return
+    if not GitHubRateBudget.can_spend() and not GitHubRateBudget.can_spend(resource='graphql'):
+        _defer_until_reset(sync_publications)
+        return
 
     try:
-        page = 1
-        updated_count = 0
-        synced_repos = []
-
-        while True:
-            # Fetch all repos (including private/internal if token allows)
-            url = f"https://api.github.com/orgs/kiri-labs/repos?per_page=100&page={page}&type=all"
-            response = requests.get(url, headers=headers, timeout=15)
-            
-            if response.status_code != 200:
-                logger.error(f"GitHub API Error: {response.status_code} - {response.text}")
-                break
-            
-            repos = response.json()
-            if not repos or not isinstance(repos, list):
-                break
-
-            for repo_data in repos:
-                repo_name = repo_data['name']
-                owner_login = repo_data['owner']['login']
-                
-                # Fetch README content
-                readme_url = f"https://api.github.com/repos/{owner_login}/{repo_name}/readme"
-                readme_resp = requests.get(readme_url, headers=headers, timeout=10)
-                
-                html_content = ""
-                if readme_resp.status_code == 200:
-                    import base64
-                    readme_json = readme_resp.json()
-                    raw_markdown = base64.b64decode(readme_json['content']).decode('utf-8')
-                    default_branch = repo_data.get('default_branch', 'main')
-                    html_content = process_markdown(owner_login, repo_name, default_branch, raw_markdown)
-                
-                # Metadata extraction
-                title_str = repo_name.replace('-', ' ').title()
-                slug = slugify(repo_name)
-                description = repo_data.get('description', '') or "Research publication by Kiri Research Labs."
-                topics = ",".join(repo_data.get('topics', []))
-                published_at = repo_data.get('pushed_at') or repo_data.get('created_at')
-
-                pub, created = Publication.objects.update_or_create(
-                    repo_name=repo_name,
-                    defaults={
-                        'title': title_str,
-                        'slug': slug,
-                        'description': description,
-                        'html_content': html_content,
-                        'github_url': repo_data['html_url'],
-                        'topics': topics,
-                        'published_at': published_at,
-                        'last_synced_at': timezone.now()
-                    }
-                )
-
-                synced_repos.append(repo_name)
-                updated_count += 1
-                
-                if created:
-                    try:
-                        post_to_facebook('publication', pub.id)
-                    except Exception as fb_err:
-                        logger.error(f"Failed to queue FB post for {repo_name}: {fb_err}")
-
-            if len(repos) < 100:
-                break
-            page += 1
-
-        # Pruning: Delete local publications that are no longer in the organization repos
-        deleted_count = 0
-        if synced_repos:
-            stale_entries = Publication.objects.exclude(repo_name__in=synced_repos)
-            deleted_count = stale_entries.count()
-            stale_entries.delete()
+        existing = {pub.repo_name: pub for pub in Publication.objects.defer('html_content')}
+
+        # GraphQL lists every repo with its README blob SHA in a handful of round
+        # trips; README text is then downloaded only where the SHA changed
+        repos = GitHubService.fetch_org_repos_graphql(PUBLICATIONS_ORG, readme_text=False)
+        try:
+            if repos is None:
+                repos = _fetch_org_repos_rest(PUBLICATIONS_ORG, known=existing)
+            else:
+                _fill_changed_readmes(repos, existing)
+        except RateLimitExceeded:
+            # Don't blank READMEs we could not fetch; finish after the reset
+            _defer_until_reset(sync_publications)
+            return
+        except CircuitOpenError:
+            _github_circuit_open(sync_publications)
+            return
 
-        logger.info(f"Publications Sync Complete. Updated: {updated_count}. Deleted: {deleted_count}")
+        # Render phase: only new or changed READMEs go through process_markdown,
+        # and all the CPU work happens before any write lock is taken
+        rendered, metadata_only, skipped = {}, {}, 0
+        for repo_data in repos:
+            repo_name = repo_data['name']
+            pub = existing.get(repo_name)
+            readme, readme_sha = repo_data.get('readme'), repo_data.get('readme_sha', '')
+            # A new or changed README whose text could not be downloaded; an empty
+            # SHA only means "README removed" once REST has confirmed it (readme == '')
+            unavailable = readme is README_UNAVAILABLE or (
+                readme is None and (pub is None or readme_sha != pub.readme_sha)
+            )
+            if unavailable and pub is None:
+                logger.warning(f"README for new repo {repo_name} could not be downloaded; adding it on the next sync")
+                skipped += 1
+                continue
+            if not unavailable and (pub is None or readme_sha != pub.readme_sha):
+                rendered[repo_name] = _publication_fields(repo_data)
+                continue
+
+            fields = _publication_metadata(repo_data)
+            if unavailable:
+                logger.warning(f"README for {repo_name} could not be downloaded; keeping current content")
+                # The REST sync skips READMEs whose pushed_at is unchanged, so only move it once one is fetched
+                fields['pushed_at'] = pub.pushed_at
+            if any(getattr(pub, field) != value for field, value in fields.items()):
+                metadata_only[repo_name] = fields
+            else:
+                skipped += 1
+
+        # Write phase: one short transaction for every insert, update and prune
+        now = timezone.now()
+        to_create, to_render, to_touch = [], [], []
+        for repo_name, fields in list(rendered.items()) + list(metadata_only.items()):
+            pub = existing.get(repo_name)
+            if pub is None:
+                pub = Publication(repo_name=repo_name)
+                to_create.append(pub)
+            elif repo_name in rendered:
+                to_render.append(pub)
+            else:
+                to_touch.append(pub)
+            for field, value in fields.items():
+                setattr(pub, field, value)
+            pub.last_synced_at = now
+            pub.updated_at = now
+
+        synced_repos = [repo_data['name'] for repo_data in repos]
+        timestamps = ['last_synced_at', 'updated_at']
+        deleted_count = 0
+        with transaction.atomic():
+            created = Publication.objects.bulk_create(to_create, batch_size=100)
+            Publication.objects.bulk_update(
+                to_render, PUBLICATION_SYNC_FIELDS + PUBLICATION_CONTENT_FIELDS + timestamps, batch_size=100
+            )
+            Publication.objects.bulk_update(to_touch, PUBLICATION_SYNC_FIELDS + timestamps, batch_size=100)
+            # Pruning: Delete local publications that are no longer in the organization repos
+            if synced_repos:
+                deleted_count, _ = Publication.objects.exclude(repo_name__in=synced_repos).delete()
+        if to_create or to_render or to_touch or deleted_count:
+            invalidate_model(Publication)
+
+        for pub in created:
+            try:
+                post_to_facebook('publication', pub.id)
+            except Exception as fb_err:
+                logger.error(f"Failed to queue FB post for {pub.repo_name}: {fb_err}")
+
+        logger.info(
+            f"Publications Sync Complete. Re-rendered: {len(rendered)}. "
+            f"Metadata updated: {len(metadata_only)}. Skipped: {skipped}. Deleted: {deleted_count}"
+        )
+        return {
+            'rendered': len(rendered),
+            'metadata_updated': len(metadata_only),
+            'skipped': skipped,
+            'deleted': deleted_count,
+        }
 
     except Exception as e:
         logger.error(f"Critical error in publications sync: {e}")
 
 
+def _fill_changed_readmes(repos, existing):
+    """
+    Downloads README text, in place, only for repos whose blob SHA differs
+    from the stored publication. GraphQL first, REST for anything it missed.
+    GraphQL only looks for README.md / readme.md, so a repo where it finds no
+    blob is asked REST's `/readme` (which resolves any README name) whenever
+    it has been pushed to since the last sync.
+    """
+    from django.utils.dateparse import parse_datetime
+    from projects.services import GitHubService, run_concurrently
+
+    changed, unnamed = [], []
+    for repo_data in repos:
+        if repo_data.get('readme') is not None:
+            continue
+        pub = existing.get(repo_data['name'])
+        if repo_data.get('readme_sha'):
+            if pub is None or pub.readme_sha != repo_data['readme_sha']:
+                changed.append(repo_data)
+        elif pub is not None and repo_data.get('pushed_at') and pub.pushed_at == parse_datetime(repo_data['pushed_at']):
+            # No push since the last sync, so whatever README it has is the stored one
+            repo_data['readme_sha'] = pub.readme_sha
+        else:
+            unnamed.append(repo_data)
+    if not changed and not unnamed:
+        return
+
+    missing = list(unnamed)
+    if changed:
+        texts = GitHubService.fetch_repos_graphql([r['html_url'] for r in changed], with_readme=True) or {}
+        for repo_data in changed:
+            data = texts.get(repo_data['html_url'])
+            if data and data.get('readme') is not None:
+                repo_data['readme'] = data['readme']
+                repo_data['readme_sha'] = data['readme_sha']
+            else:
+                missing.append(repo_data)
+
+    headers = GitHubService._headers()
+    readmes = run_concurrently(
+        lambda repo_data: _fetch_readme_rest(repo_data['owner_login'], repo_data['name'], headers),
+        missing,
+    )
+    for repo_data, (readme, readme_sha) in zip(missing, readmes):
+        repo_data['readme'] = readme
+        if readme is not README_UNAVAILABLE:
+            repo_data['readme_sha'] = readme_sha
+
+
+def _fetch_readme_rest(owner, repo_name, headers):
+    """
+    Fetches and decodes a repo README over REST. Returns (text, blob_sha),
+    ('', '') if the repo has no README, or (README_UNAVAILABLE, '') if the
+    request failed.
+    """
+    import base64
+    from kiri_project.circuit import CircuitOpenError
+    from projects.ratelimit import GitHubRateBudget, RateLimitExceeded
+    from projects.services import GitHubService
+
+    readme_url = GitHubService.api_url(f"repos/{owner}/{repo_name}/readme")
+    if not GitHubRateBudget.can_spend():
+        raise RateLimitExceeded(readme_url)
+    try:
+        readme_resp = http_client.get(readme_url, headers=headers, timeout=10)
+        GitHubRateBudget.record(readme_resp)
+    except CircuitOpenError:
+        # Stop the run rather than treat every remaining README as missing
+        raise
+    except requests.RequestException as e:
+        logger.error(f"README fetch failed for {repo_name}: {e}")
+        return README_UNAVAILABLE, ''
+    if readme_resp.status_code in [403, 429]:
+        raise RateLimitExceeded(readme_url)
+    if readme_resp.status_code == 404:
+        return '', ''
+    if readme_resp.status_code != 200:
+        logger.error(f"README fetch failed for {repo_name}: HTTP {readme_resp.status_code}")
+        return README_UNAVAILABLE, ''
+    readme_json = readme_resp.json()
+    return base64.b64decode(readme_json['content']).decode('utf-8'), readme_json.get('sha', '')
+
+
+def _normalize_rest_repo(repo_data, readme, readme_sha):
+    """Maps a REST repo payload onto the dicts returned by GitHubService.fetch_org_repos_graphql."""
+    return {
+        'name': repo_data['name'],
+        'owner_login': repo_data['owner']['login'],
+        'html_url': repo_data['html_url'],
+        'description': repo_data.get('description', ''),
+        'topics': repo_data.get('topics', []),
+        'pushed_at': repo_data.get('pushed_at'),
+        'created_at': repo_data.get('created_at'),
+        'default_branch': repo_data.get('default_branch', 'main'),
+        'readme': readme,
+        'readme_sha': readme_sha,
+    }
+
+
+def _fetch_org_repos_rest(org, known=None):
+    """
+    REST fallback for sync_publications: one call per org page plus one
+    `/readme` call per repo whose pushed_at differs from the `known`
+    publication (a README cannot change without a push).
+    Returns normalized repo dicts like GitHubService.fetch_org_repos_graphql.
+    """
+    from django.utils.dateparse import parse_datetime
+    from projects.ratelimit import GitHubRateBudget
+    from projects.services import GitHubService, run_concurrently
+
+    headers = GitHubService._headers()
+    known = known or {}
+    repos = []
+    page = 1
+
+    def fetch_readme(repo_data):
+        pub = known.get(repo_data['name'])
+        pushed_at = parse_datetime(repo_data['pushed_at']) if repo_data.get('pushed_at') else None
+        if pub is not None and pushed_at and pub.pushed_at == pushed_at:
+            return None, pub.readme_sha
+        return _fetch_readme_rest(repo_data['owner']['login'], repo_data['name'], headers)
+
+    while True:
+        # Fetch all repos (including private/internal if token allows)
+        url = GitHubService.api_url(f"orgs/{org}/repos?per_page=100&page={page}&type=all")
+        response = http_client.get(url, headers=headers, timeout=15)
+        GitHubRateBudget.record(response)
+
+        if response.status_code != 200:
+            logger.error(f"GitHub API Error: {response.status_code} - {response.text}")
+            break
+
+        batch = response.json()
+        if not batch or not isinstance(batch, list):
+            break
+
+        # README requests for the whole page run concurrently
+        readmes = run_concurrently(fetch_readme, batch)
+        for repo_data, (readme, readme_sha) in zip(batch, readmes):
+            repos.append(_normalize_rest_repo(repo_data, readme, readme_sha))
+
+        if len(batch) < 100:
+            break
+        page += 1
+
+    return repos
+
+
+def _fetch_repo_rest(owner, repo_name):
+    """REST fallback for a single publication repo. Returns a normalized dict or None."""
+    from projects.ratelimit import GitHubRateBudget
+    from projects.services import GitHubService
+
+    headers = GitHubService._headers()
+    response = http_client.get(GitHubService.api_url(f"repos/{owner}/{repo_name}"), headers=headers, timeout=15)
+    GitHubRateBudget.record(response)
+    if response.status_code != 200:
+        logger.error(f"GitHub API Error for {owner}/{repo_name}: {response.status_code}")
+        return None
+
+    readme, readme_sha = _fetch_readme_rest(owner, repo_name, headers)
+    return _normalize_rest_repo(response.json(), readme, readme_sha)
+
+
+def _publication_metadata(repo_data):
+    """Cheap Publication field values for a normalized repo dict (no README rendering)."""
+    from django.utils.dateparse import parse_datetime
+
+    repo_name = repo_data['name']
+    pushed_at = parse_datetime(repo_data['pushed_at']) if repo_data.get('pushed_at') else None
+    created_at = parse_datetime(repo_data['created_at']) if repo_data.get('created_at') else None
+    return {
+        'title': repo_name.replace('-', ' ').title(),
+        'slug': slugify(repo_name),
+        'description': repo_data.get('description', '') or "Research publication by Kiri Research Labs.",
+        'github_url': repo_data['html_url'],
+        'topics': ",".join(repo_data.get('topics', [])),
+        'published_at': pushed_at or created_at or timezone.now(),
+        'pushed_at': pushed_at,
+    }
+
+
+def _publication_fields(repo_data):
+    """Renders a normalized repo dict into Publication field values, README included."""
+    from core.search import html_to_text
+    from publications.utils import process_markdown
+
+    fields = _publication_metadata(repo_data)
+    html_content = ""
+    raw_markdown = repo_data.get('readme')
+    if raw_markdown:
+        default_branch = repo_data.get('default_branch') or 'main'
+        html_content = process_markdown(repo_data['owner_login'], repo_data['name'], default_branch, raw_markdown)
+
+    fields['html_content'] = html_content
+    # Written here as well as in Publication.save(): bulk writes skip save()
+    fields['body_text'] = html_to_text(html_content)
+    fields['readme_sha'] = repo_data.get('readme_sha', '')
+    return fields
+
+
+@db_task()
+def sync_publication_repo(repo_name):
+    """
+    Re-fetches and re-renders a single publication, e.g. when a webhook
+    reports that a push touched its README. Creates it if it is new.
+    """
+    from kiri_project.circuit import CircuitOpenError
+    from publications.models import Publication
+    from projects.ratelimit import RateLimitExceeded
+    from projects.services import GitHubService
+
+    if _github_circuit_open(sync_publication_repo, args=(repo_name,)):
+        return
+
+    repo_url = f"https://github.com/{PUBLICATIONS_ORG}/{repo_name}"
+    repo_data = (GitHubService.fetch_repos_graphql([repo_url], with_readme=True) or {}).get(repo_url)
+    try:
+        if repo_data is None:
+            repo_data = _fetch_repo_rest(PUBLICATIONS_ORG, repo_name)
+        elif repo_data.get('readme') is None:
+            # GraphQL only looks for README.md / readme.md (and omits large blobs); REST resolves any README
+            repo_data['readme'], repo_data['readme_sha'] = _fetch_readme_rest(
+                PUBLICATIONS_ORG, repo_name, GitHubService._headers(),
+            )
+    except RateLimitExceeded:
+        _defer_until_reset(sync_publication_repo, args=(repo_name,))
+        return
+    except CircuitOpenError:
+        _github_circuit_open(sync_publication_repo, args=(repo_name,))
+        return
+    except requests.RequestException as e:
+        logger.error(f"Re-sync of publication {repo_name} failed: {e}")
+        return
+    if repo_data is None:
+        return
+    if repo_data.get('readme') is README_UNAVAILABLE:
+        logger.warning(f"README for {repo_name} could not be downloaded; keeping current content")
+        return
+
+    pub, created = Publication.objects.update_or_create(
+        repo_name=repo_data['name'],
+        defaults=dict(_publication_fields(repo_data), last_synced_at=timezone.now()),
+    )
+    logger.info(f"Publication '{pub.repo_name}' re-synced")
+
+    if created:
+        try:
+            post_to_facebook('publication', pub.id)
+        except Exception as fb_err:
+            logger.error(f"Failed to queue FB post for {pub.repo_name}: {fb_err}")
+
+
 @db_task()
 def post_to_facebook(content_type, object_id):
     """
@@ -254,7 +627,7 @@ def post_to_facebook(content_type, object_id):
         }
         payload = {"message": message}
         
-        response = requests.post(url, headers=headers, data=payload, timeout=12)
+        response = http_client.post(url, headers=headers, data=payload, timeout=12)
         
         if response.status_code != 200:
             logger.error(f"Facebook API failed: {response.status_code} - {response.text}")
@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import Project
 
 
@@ -43,9 +43,35 @@ class ProjectAdmin(admin.ModelAdmin):
 
     @admin.action(description='Sync from GitHub')
     def sync_github(self, request, queryset):
+        from .ratelimit import GitHubRateBudget
         from .utils import sync_project_metadata
+        from kiri_project.circuit import breaker_for
+        from .services import GitHubService
+        projects = list(queryset)
+        breaker = breaker_for(GitHubService.api_url(''))
+        if breaker.is_open():
+            # Don't hold a gunicorn thread on an upstream that is failing
+            from kiri_project.tasks import sync_selected_projects
+            sync_selected_projects.schedule(args=([p.pk for p in projects],), eta=breaker.retry_at())
+            self.message_user(
+                request,
+                f"GitHub is failing right now. Sync of {len(projects)} projects deferred until {breaker.retry_at():%H:%M} UTC.",
+                messages.WARNING,
+            )
+            return
+        if not GitHubRateBudget.can_spend(len(projects), interactive=True):
+            from kiri_project.tasks import sync_selected_projects
+            resume_at = GitHubRateBudget.resume_at()
+            sync_selected_projects.schedule(args=([p.pk for p in projects],), eta=resume_at)
+            self.message_user(
+                request,
+                f"GitHub rate limit nearly exhausted. Sync of {len(projects)} projects deferred until {resume_at:%H:%M} UTC.",
+                messages.WARNING,
+            )
+            return
+
         count = 0
-        for project in queryset:
+        for project in projects:
             if sync_project_metadata(project):
                 count += 1
         self.message_user(request, f"Synced {count} projects.")
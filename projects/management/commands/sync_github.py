@@ -0,0 +1,201 @@
+import re
+import time
+import argparse
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.text import slugify
+from kiri_project.caching import invalidate_model
+
+AGE_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+# Projects fetched and written per refresh round
+CHUNK_SIZE = 100
+
+
+def parse_age(value):
+    """Parses '30m', '6h' or '2d' into a timedelta (bare numbers are hours)."""
+    match = re.fullmatch(r'(\d+)([mhd]?)', value.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid age '{value}' (use e.g. 30m, 6h, 2d)")
+    amount, unit = match.groups()
+    return timedelta(**{AGE_UNITS[unit or 'h']: int(amount)})
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports or refreshes projects from GitHub. With an OWNER, every public repo "
+        "of that user or organization is created or refreshed from the paginated "
+        "listing (no per-repo calls; imported projects are not posted to Facebook). "
+        "Without one, existing projects are re-fetched in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'owner', nargs='?',
+            help="GitHub user or organization to import repositories from",
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=None,
+            help="Simultaneous GitHub requests when refreshing (default: GITHUB_SYNC_CONCURRENCY); "
+                 "an OWNER import reads its listing one page at a time",
+        )
+        parser.add_argument(
+            '--only-stale', type=parse_age, default=None, metavar='AGE',
+            help="Only touch projects not synced within AGE, e.g. 30m, 6h, 2d",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Fetch and report changes without writing projects, validators or cached responses",
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help="Process at most this many repositories / projects",
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.verbosity = options['verbosity']
+        self.timings = {'fetch': 0.0, 'apply': 0.0, 'write': 0.0}
+        stale_before = timezone.now() - options['only_stale'] if options['only_stale'] else None
+        if options['owner'] and options['concurrency'] is not None:
+            raise CommandError("--concurrency only applies when refreshing existing projects (no OWNER)")
+
+        started = time.perf_counter()
+        if options['owner']:
+            created, updated, skipped = self.import_owner(
+                options['owner'], stale_before, options['limit'],
+            )
+        else:
+            created, skipped = 0, 0
+            updated = self.refresh_projects(stale_before, options['limit'], options['concurrency'])
+        elapsed = time.perf_counter() - started
+
+        prefix = "[dry run] Would have" if self.dry_run else "Done:"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} created {created}, updated {updated}, skipped {skipped} in {elapsed:.2f}s"
+        ))
+        self.stdout.write(
+            "Timing: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.timings.items())
+        )
+
+    def _is_stale(self, project, stale_before):
+        return stale_before is None or project.last_synced_at is None or project.last_synced_at < stale_before
+
+    def refresh_projects(self, stale_before, limit, concurrency):
+        """Re-fetches existing projects, stalest first, in CHUNK_SIZE rounds."""
+        from projects.models import Project
+        from projects.utils import apply_project_metadata, fetch_projects_data, save_synced_projects
+
+        queryset = Project.objects.exclude(github_repo_url='').order_by(F('last_synced_at').asc(nulls_first=True))
+        if stale_before:
+            queryset = queryset.filter(Q(last_synced_at__isnull=True) | Q(last_synced_at__lt=stale_before))
+        if limit:
+            queryset = queryset[:limit]
+        projects = list(queryset)
+        total = len(projects)
+        self.stdout.write(f"Refreshing {total} projects")
+
+        updated = 0
+        for start in range(0, total, CHUNK_SIZE):
+            chunk = projects[start:start + CHUNK_SIZE]
+
+            phase_start = time.perf_counter()
+            data = fetch_projects_data(chunk, interactive=True, concurrency=concurrency, store=not self.dry_run)
+            self.timings['fetch'] += time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            synced = [p for p in chunk if apply_project_metadata(p, data.get(p.github_repo_url))]
+            self.timings['apply'] += time.perf_counter() - phase_start
+
+            self._write(synced, save_synced_projects)
+            updated += len(synced)
+            self.stdout.write(
+                f"  [{start + len(chunk)}/{total}] fetched {len(data)}, updated {len(synced)}"
+            )
+        return updated
+
+    def import_owner(self, owner, stale_before, limit):
+        """Creates or refreshes projects page by page from the owner's repo listing."""
+        from projects.models import Project
+        from projects.services import GitHubService
+        from projects.utils import apply_project_metadata, save_synced_projects
+
+        existing = {}
+        for project in Project.objects.exclude(github_repo_url=''):
+            parsed = GitHubService.parse_repo_url(project.github_repo_url)
+            if parsed:
+                existing[(parsed[0].lower(), parsed[1].lower())] = project
+        slugs = set(Project.objects.values_list('slug', flat=True))
+
+        created = updated = skipped = seen = 0
+        pages = GitHubService.iter_user_public_repos(owner)
+        page_number = 0
+        while limit is None or seen < limit:
+            phase_start = time.perf_counter()
+            batch = next(pages, None)
+            self.timings['fetch'] += time.perf_counter() - phase_start
+            if batch is None:
+                break
+            page_number += 1
+            if limit is not None:
+                batch = batch[:limit - seen]
+            seen += len(batch)
+
+            phase_start = time.perf_counter()
+            new, synced = [], []
+            for repo in batch:
+                data = GitHubService.normalize_rest_repo(repo)
+                project = existing.get((repo['owner']['login'].lower(), repo['name'].lower()))
+                if project is None:
+                    project = Project(
+                        name=repo['name'],
+                        slug=self._unique_slug(repo['name'], slugs),
+                        description=repo.get('description') or '',
+                        github_repo_url=repo['html_url'],
+                    )
+                    apply_project_metadata(project, data)
+                    new.append(project)
+                elif self._is_stale(project, stale_before):
+                    apply_project_metadata(project, data)
+                    synced.append(project)
+                else:
+                    skipped += 1
+            self.timings['apply'] += time.perf_counter() - phase_start
+
+            self._write(synced, save_synced_projects, new)
+            created += len(new)
+            updated += len(synced)
+            self.stdout.write(
+                f"  page {page_number}: {len(batch)} repos, {len(new)} new, {len(synced)} updated"
+            )
+        return created, updated, skipped
+
+    @staticmethod
+    def _unique_slug(name, slugs):
+        base_slug = slugify(name) or 'project'
+        slug, counter = base_slug, 1
+        while slug in slugs:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        slugs.add(slug)
+        return slug
+
+    def _write(self, synced, save_synced_projects, new=()):
+        """Writes one round (unless --dry-run) and records the time spent."""
+        from projects.models import Project
+
+        if self.dry_run:
+            if self.verbosity > 1:
+                for project in new:
+                    self.stdout.write(f"    + {project.github_repo_url}")
+            return
+
+        phase_start = time.perf_counter()
+        if new:
+            with transaction.atomic():
+                Project.objects.bulk_create(new, batch_size=100)
+            invalidate_model(Project)
+        save_synced_projects(synced)
+        self.timings['write'] += time.perf_counter() - phase_start
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-17 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubValidator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=255, unique=True)),
+                ('etag', models.CharField(blank=True, default='', max_length=255)),
+                ('last_modified', models.CharField(blank=True, default='', max_length=64)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+                ('modified_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
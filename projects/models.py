@@ -1,7 +1,6 @@
 import logging
 from django.db import models
 from django.utils.text import slugify
-from django.core.cache import cache
 from .services import GitHubService
 
 logger = logging.getLogger(__name__)
@@ -180,7 +179,6 @@ class Project(models.Model):
                 counter += 1
             self.slug = slug
         super().save(*args, **kwargs)
-        cache.delete('homepage_context')
         
         # Auto-post to Facebook if new and credentials exist
         if is_new:
@@ -192,14 +190,26 @@ class Project(models.Model):
                 # We don't want to fail the save if FB posting fails
                 logger.error(f"Failed to queue initial FB post for project {self.name}: {e}")
 
-
-    def delete(self, *args, **kwargs):
-        super().delete(*args, **kwargs)
-        cache.delete('homepage_context')
-
     def __str__(self):
         return self.name
 
     def get_absolute_url(self):
         from django.urls import reverse
         return reverse("projects:detail", kwargs={"slug": self.slug})
+
+
+class GitHubValidator(models.Model):
+    """
+    HTTP validators (ETag / Last-Modified) for a GitHub API resource.
+    Stored in the database rather than the cache so conditional requests
+    survive cache pruning and worker restarts.
+    """
+    resource = models.CharField(max_length=255, unique=True)
+    etag = models.CharField(max_length=255, blank=True, default='')
+    last_modified = models.CharField(max_length=64, blank=True, default='')
+    payload = models.JSONField(default=dict, blank=True)
+    checked_at = models.DateTimeField(auto_now=True)
+    modified_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.resource
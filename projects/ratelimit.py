@@ -0,0 +1,180 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubRateBudget:
+    """
+    Shared view of the GitHub token's rate-limit budget.
+    Every response's X-RateLimit-* / Retry-After headers are recorded in the
+    database cache so web workers, the huey consumer and admin actions all
+    spend from the same, up-to-date budget.
+
+    Fetch worker threads (see run_concurrently) never touch the cache: they
+    read and update a process-local copy, which the calling thread persists
+    with flush() once the pool is done. The circuit breakers their requests
+    pass through defer to the calling thread the same way (circuit.worker()).
+    """
+
+    CACHE_PREFIX = "github_ratelimit"
+    RESOURCES = ('core', 'graphql')
+
+    _local = {}
+    _lock = threading.Lock()
+    _thread = threading.local()
+    # Last value persisted per resource, to avoid one cache write per API call
+    _last_written = {}
+
+    @classmethod
+    def _key(cls, resource):
+        return f"{cls.CACHE_PREFIX}:{resource}"
+
+    @classmethod
+    @contextmanager
+    def worker(cls):
+        """Marks the current thread as a fetch worker (no cache access)."""
+        cls._thread.in_worker = True
+        try:
+            yield
+        finally:
+            cls._thread.in_worker = False
+
+    @classmethod
+    def _in_worker(cls):
+        return getattr(cls._thread, 'in_worker', False)
+
+    @staticmethod
+    def _merge(current, incoming):
+        """Combines two views of a window; within the same window the lowest count wins."""
+        merged = dict(current)
+        if incoming.get('reset') is not None:
+            if merged.get('reset') == incoming['reset'] and merged.get('remaining') is not None:
+                merged['remaining'] = min(merged['remaining'], incoming['remaining'])
+            elif incoming['reset'] >= (merged.get('reset') or 0):
+                merged['remaining'] = incoming['remaining']
+                merged['reset'] = incoming['reset']
+        if incoming.get('blocked_until'):
+            merged['blocked_until'] = max(incoming['blocked_until'], merged.get('blocked_until', 0))
+        return merged
+
+    @classmethod
+    def record(cls, response):
+        """Updates the shared budget from a GitHub API response."""
+        headers = getattr(response, 'headers', None) or {}
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        now = int(time.time())
+
+        incoming = {}
+        try:
+            incoming['remaining'] = int(headers['X-RateLimit-Remaining'])
+            incoming['reset'] = int(headers['X-RateLimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            incoming = {}
+
+        if response.status_code in [403, 429]:
+            retry_after = headers.get('Retry-After')
+            if retry_after and str(retry_after).isdigit():
+                incoming['blocked_until'] = now + int(retry_after)
+            elif incoming.get('remaining') == 0:
+                incoming['blocked_until'] = incoming['reset']
+
+        if not incoming:
+            return
+
+        if incoming.get('blocked_until'):
+            logger.warning(
+                f"GitHub Rate Limit Hit ({resource}). Deferring calls until "
+                f"{datetime.fromtimestamp(incoming['blocked_until'], tz=dt_timezone.utc).isoformat()}"
+            )
+
+        with cls._lock:
+            cls._local[resource] = cls._merge(cls._local.get(resource, {}), incoming)
+
+        if not cls._in_worker():
+            cls._persist(resource, force=bool(incoming.get('blocked_until')))
+
+    @classmethod
+    def _persist(cls, resource, force=False):
+        """Writes the local view of `resource` to the shared cache."""
+        with cls._lock:
+            state = dict(cls._local.get(resource, {}))
+        if not state:
+            return
+
+        last = cls._last_written.get(resource)
+        remaining = state.get('remaining', 0)
+        if (not force and last and last[0] == state.get('reset')
+                and last[1] - remaining < 10 and remaining > cls.reserve()):
+            return
+
+        state = cls._merge(cache.get(cls._key(resource)) or {}, state)
+        now = int(time.time())
+        expires_at = max(state.get('reset') or 0, state.get('blocked_until', 0))
+        cache.set(cls._key(resource), state, max(expires_at - now, 0) + 60)
+        with cls._lock:
+            cls._local[resource] = state
+        cls._last_written[resource] = (state.get('reset'), state.get('remaining', 0))
+
+    @classmethod
+    def flush(cls):
+        """Persists budget observed by worker threads. Call from the thread that ran the pool."""
+        for resource in list(cls._local):
+            cls._persist(resource, force=True)
+
+    @classmethod
+    def state(cls, resource='core'):
+        """Returns the recorded budget, dropping windows that have already reset."""
+        if cls._in_worker():
+            with cls._lock:
+                state = dict(cls._local.get(resource, {}))
+        else:
+            state = cls._merge(cache.get(cls._key(resource)) or {}, cls._local.get(resource, {}))
+            with cls._lock:
+                cls._local[resource] = state
+
+        now = int(time.time())
+        if state.get('reset') and state['reset'] <= now:
+            state = {k: v for k, v in state.items() if k not in ('remaining', 'reset')}
+        if state.get('blocked_until', 0) <= now:
+            state.pop('blocked_until', None)
+        return state
+
+    @staticmethod
+    def reserve(interactive=False):
+        """Calls kept back for interactive (admin / command) use."""
+        if interactive:
+            return 0
+        return getattr(settings, 'GITHUB_RATELIMIT_RESERVE', 100)
+
+    @classmethod
+    def remaining(cls, resource='core', interactive=False):
+        """Calls that may still be spent, or None when the budget is unknown."""
+        state = cls.state(resource)
+        if state.get('blocked_until'):
+            return 0
+        if state.get('remaining') is None:
+            return None
+        return max(state['remaining'] - cls.reserve(interactive), 0)
+
+    @classmethod
+    def can_spend(cls, cost=1, resource='core', interactive=False):
+        """True if `cost` calls fit in the shared budget (unknown budgets are allowed)."""
+        available = cls.remaining(resource, interactive)
+        return available is None or available >= cost
+
+    @classmethod
+    def resume_at(cls, resource='core'):
+        """When deferred work should run again: just after the block or reset window ends."""
+        state = cls.state(resource)
+        resume = max(state.get('blocked_until', 0), state.get('reset') or 0, int(time.time()))
+        return datetime.fromtimestamp(resume + 5, tz=dt_timezone.utc)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a sync must stop because the GitHub budget ran out mid-run."""
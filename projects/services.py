@@ -1,22 +1,80 @@
 import os
 import re
-import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
+from kiri_project import circuit, http_client
+from .ratelimit import GitHubRateBudget
 
 logger = logging.getLogger(__name__)
 
 
+def run_concurrently(fn, items, concurrency=None):
+    """
+    Calls fn(item) for every item on a bounded thread pool and returns the
+    results in input order. Wall-clock time follows the slowest calls rather
+    than their sum. `fn` must not write to the database.
+    """
+    items = list(items)
+    if concurrency is None:
+        concurrency = getattr(settings, 'GITHUB_SYNC_CONCURRENCY', 4)
+    workers = max(1, min(concurrency, len(items)))
+    if workers == 1:
+        return [fn(item) for item in items]
+
+    # Workers read the rate budget and the circuit state from local snapshots
+    # taken here and report back through them; both are persisted once they finish
+    for resource in GitHubRateBudget.RESOURCES:
+        GitHubRateBudget.state(resource)
+    circuit.breaker_for(GitHubService.api_url('')).is_open()
+
+    def call(item):
+        with GitHubRateBudget.worker(), circuit.worker():
+            return fn(item)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='github-fetch') as pool:
+            return list(pool.map(call, items))
+    finally:
+        GitHubRateBudget.flush()
+        circuit.flush()
+
+
 class GitHubService:
     """
     Centralized service for GitHub interactions.
     Handles URL parsing, API fetching, and caching.
     """
 
-    BASE_API_URL = "https://api.github.com/repos"
+    GRAPHQL_BATCH_SIZE = 25
+    GRAPHQL_PAGE_SIZE = 50
+
+    REPO_FIELDS = """
+        name
+        description
+        url
+        stargazerCount
+        forkCount
+        pushedAt
+        createdAt
+        owner { login }
+        primaryLanguage { name }
+        defaultBranchRef { name }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+    """
+    README_FIELDS = """
+        readme: object(expression: "HEAD:README.md") { ... on Blob { oid text } }
+        readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { oid text } }
+    """
+    # Blob SHAs only, so unchanged READMEs are never downloaded
+    README_OID_FIELDS = """
+        readme: object(expression: "HEAD:README.md") { ... on Blob { oid } }
+        readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { oid } }
+    """
 
     @staticmethod
     def parse_repo_url(url):
@@ -46,9 +104,33 @@ class GitHubService:
 
         return None
 
+    @staticmethod
+    def api_url(path):
+        """Absolute API URL for `path` under settings.GITHUB_API_URL."""
+        base = getattr(settings, 'GITHUB_API_URL', 'https://api.github.com')
+        return f"{base}/{path.lstrip('/')}"
+
+    @staticmethod
+    def _headers():
+        """Default request headers, including the token when configured."""
+        headers = {
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': 'Kiri-Research-Labs',
+        }
+        github_token = os.environ.get('GITHUB_TOKEN', '')
+        if github_token:
+            headers['Authorization'] = f'token {github_token}'
+        return headers
+
     @classmethod
     def fetch_repo_data(cls, repo_url):
-        """Fetches metadata for a repo with caching."""
+        """
+        Fetches metadata for a repo with caching.
+        Sends stored ETag/Last-Modified validators so an unchanged repo answers
+        304 (not counted against the rate limit) and the stored payload is reused.
+        """
+        from .models import GitHubValidator
+
         parsed = cls.parse_repo_url(repo_url)
         if not parsed:
             return None
@@ -59,77 +141,336 @@ class GitHubService:
         if cached_data:
             return cached_data
 
-        api_url = f"{cls.BASE_API_URL}/{owner}/{repo}"
-        headers = {
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': 'Kiri-Research-Labs',
+        validator = GitHubValidator.objects.filter(resource=f"repos/{owner}/{repo}").first()
+        result, validator_defaults = cls._request_repo(owner, repo, validator)
+        cls._store_repo_result(owner, repo, validator, result, validator_defaults)
+        return result
+
+    @classmethod
+    def fetch_repos_concurrent(cls, repo_urls, concurrency=None, store=True):
+        """
+        REST counterpart of fetch_repos_graphql: fetches many repos on a bounded
+        thread pool. Worker threads only do HTTP; cache and validator writes
+        happen here afterwards, in one transaction, so SQLite keeps a single writer.
+        With store=False (dry runs) nothing is written.
+        Returns {repo_url: data} for the repos that could be fetched.
+        """
+        from .models import GitHubValidator
+
+        targets = {}
+        for url in repo_urls:
+            parsed = cls.parse_repo_url(url)
+            if parsed:
+                targets[url] = parsed
+
+        cache_keys = {f"github_meta:{owner}:{repo}": url for url, (owner, repo) in targets.items()}
+        results = {cache_keys[key]: data for key, data in cache.get_many(list(cache_keys)).items() if data}
+
+        pending = [(url, owner_repo) for url, owner_repo in targets.items() if url not in results]
+        if not pending:
+            return results
+
+        validators = {
+            v.resource: v for v in GitHubValidator.objects.filter(
+                resource__in=[f"repos/{owner}/{repo}" for _, (owner, repo) in pending]
+            )
         }
-        github_token = os.environ.get('GITHUB_TOKEN', '')
-        if github_token:
-            headers['Authorization'] = f'token {github_token}'
+
+        def fetch(item):
+            owner, repo = item[1]
+            return cls._request_repo(owner, repo, validators.get(f"repos/{owner}/{repo}"))
+
+        now = timezone.now()
+        created, updated, checked, to_cache = [], [], [], {}
+        for (url, (owner, repo)), (result, validator_defaults) in zip(
+            pending, run_concurrently(fetch, pending, concurrency)
+        ):
+            if not result:
+                continue
+            results[url] = result
+            to_cache[f"github_meta:{owner}:{repo}"] = result
+
+            resource = f"repos/{owner}/{repo}"
+            validator = validators.get(resource)
+            if validator_defaults and validator:
+                for field, value in validator_defaults.items():
+                    setattr(validator, field, value)
+                validator.checked_at = now
+                updated.append(validator)
+            elif validator_defaults:
+                created.append(GitHubValidator(resource=resource, **validator_defaults))
+            elif validator:
+                validator.checked_at = now
+                checked.append(validator)
+
+        if not store:
+            return results
+
+        # All validator writes for the run share one short transaction
+        with transaction.atomic():
+            GitHubValidator.objects.bulk_create(created, batch_size=100)
+            GitHubValidator.objects.bulk_update(
+                updated, ['etag', 'last_modified', 'payload', 'modified_at', 'checked_at'], batch_size=100
+            )
+            GitHubValidator.objects.bulk_update(checked, ['checked_at'], batch_size=100)
+        cache.set_many(to_cache, 3600)
+
+        return results
+
+    @classmethod
+    def _request_repo(cls, owner, repo, validator=None):
+        """
+        Performs the HTTP request for one repo without touching the database,
+        so it is safe to call from worker threads.
+        Returns (result, validator_defaults); validator_defaults is only set
+        when GitHub answered 200 and fresh validators should be stored.
+        """
+        api_url = cls.api_url(f"repos/{owner}/{repo}")
+        headers = cls._headers()
+
+        if validator and validator.payload:
+            if validator.etag:
+                headers['If-None-Match'] = validator.etag
+            if validator.last_modified:
+                headers['If-Modified-Since'] = validator.last_modified
+
+        if not GitHubRateBudget.can_spend(interactive=True):
+            return None, None
 
         try:
-            response = requests.get(api_url, headers=headers, timeout=10)
+            response = http_client.get(api_url, headers=headers, timeout=10)
+            GitHubRateBudget.record(response)
 
             if response.status_code in [403, 429]:
-                logger.warning("GitHub Rate Limit Hit.")
-                return None
+                return None, None
+
+            if response.status_code == 304 and validator:
+                result = dict(validator.payload)
+                result['last_updated'] = timezone.now().isoformat()
+                result['not_modified'] = True
+                return result, None
 
             if response.status_code == 200:
-                data = response.json()
-                result = {
-                    'stars_count': data.get('stargazers_count', 0),
-                    'forks_count': data.get('forks_count', 0),
-                    'language': data.get('language') or '',
-                    'description': data.get('description', ''),
-                    'topics': data.get('topics', []),
-                    'last_updated': timezone.now().isoformat(),
+                result = cls.normalize_rest_repo(response.json())
+                return result, {
+                    'etag': response.headers.get('ETag', ''),
+                    'last_modified': response.headers.get('Last-Modified', ''),
+                    'payload': result,
+                    'modified_at': timezone.now(),
                 }
-                cache.set(cache_key, result, 3600)
-                return result
 
         except Exception as e:
-            logger.error(f"GitHub API Error for {repo_url}: {e}")
-            return None
+            logger.error(f"GitHub API Error for {owner}/{repo}: {e}")
 
-        return None
+        return None, None
 
-    @classmethod
-    def fetch_user_public_repos(cls, username):
-        """Fetches all public repos for a GitHub user. Used by sync management command."""
-        headers = {
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': 'Kiri-Research-Labs',
+    @staticmethod
+    def normalize_rest_repo(data):
+        """Maps a REST repository payload (single repo or listing entry) onto project metadata."""
+        return {
+            'stars_count': data.get('stargazers_count', 0),
+            'forks_count': data.get('forks_count', 0),
+            'language': data.get('language') or '',
+            'description': data.get('description', ''),
+            'topics': data.get('topics', []),
+            'last_updated': timezone.now().isoformat(),
         }
-        github_token = os.environ.get('GITHUB_TOKEN', '')
-        if github_token:
-            headers['Authorization'] = f'token {github_token}'
 
-        repos = []
+    @staticmethod
+    def _store_repo_result(owner, repo, validator, result, validator_defaults):
+        """Persists validators and caches the result of _request_repo."""
+        from .models import GitHubValidator
+
+        if not result:
+            return
+
+        if validator_defaults:
+            GitHubValidator.objects.update_or_create(
+                resource=f"repos/{owner}/{repo}", defaults=validator_defaults
+            )
+        elif validator:
+            validator.save(update_fields=['checked_at'])
+        cache.set(f"github_meta:{owner}:{repo}", result, 3600)
+
+    @classmethod
+    def iter_user_public_repos(cls, username, per_page=100):
+        """
+        Yields a user's (or organization's) public repos one page at a time, so
+        callers can process each page while the next is still to be fetched.
+        Stops early when the rate-limit budget runs out.
+        """
+        headers = cls._headers()
         page = 1
 
         while True:
+            if not GitHubRateBudget.can_spend(interactive=True):
+                logger.warning(f"GitHub budget exhausted; stopping repo listing for {username} at page {page}")
+                return
             try:
-                response = requests.get(
-                    f"https://api.github.com/users/{username}/repos",
-                    params={'type': 'public', 'per_page': 100, 'page': page},
+                response = http_client.get(
+                    cls.api_url(f"users/{username}/repos"),
+                    params={'type': 'public', 'per_page': per_page, 'page': page},
                     headers=headers,
                     timeout=15,
                 )
+                GitHubRateBudget.record(response)
                 if response.status_code != 200:
-                    break
-
+                    return
                 batch = response.json()
-                if not batch:
-                    break
-
-                repos.extend(batch)
-                page += 1
-
-                if len(batch) < 100:
-                    break
             except Exception as e:
                 logger.error(f"Error fetching repos for {username}: {e}")
+                return
+
+            if not batch:
+                return
+            yield batch
+            if len(batch) < per_page:
+                return
+            page += 1
+
+    @classmethod
+    def fetch_user_public_repos(cls, username):
+        """Fetches all public repos for a GitHub user as one list."""
+        return [repo for batch in cls.iter_user_public_repos(username) for repo in batch]
+
+    # ── GraphQL batch mode ──
+
+    @classmethod
+    def _graphql(cls, query, variables=None):
+        """
+        Runs a GraphQL query and returns its `data` dict, or None on failure.
+        GraphQL needs an authenticated token, so this returns None without one
+        and callers fall back to the REST endpoints.
+        """
+        headers = cls._headers()
+        if 'Authorization' not in headers:
+            return None
+        if not GitHubRateBudget.can_spend(resource='graphql', interactive=True):
+            return None
+
+        try:
+            response = http_client.post(
+                cls.api_url('graphql'),
+                json={'query': query, 'variables': variables or {}},
+                headers=headers,
+                timeout=15,
+            )
+            GitHubRateBudget.record(response)
+            if response.status_code in [403, 429]:
+                return None
+            if response.status_code != 200:
+                logger.error(f"GitHub GraphQL Error: {response.status_code} - {response.text}")
+                return None
+
+            payload = response.json()
+            if payload.get('errors'):
+                # Partial results are still usable (e.g. one missing repo)
+                logger.warning(f"GitHub GraphQL returned errors: {payload['errors']}")
+            return payload.get('data')
+        except Exception as e:
+            logger.error(f"GitHub GraphQL Error: {e}")
+            return None
+
+    @staticmethod
+    def _normalize_graphql_repo(node):
+        """Maps a GraphQL Repository node onto the REST-shaped dicts used by the sync code."""
+        readme = node.get('readme') or node.get('readmeLower') or {}
+        return {
+            'name': node['name'],
+            'owner_login': node['owner']['login'],
+            'html_url': node['url'],
+            'stars_count': node.get('stargazerCount', 0),
+            'forks_count': node.get('forkCount', 0),
+            'language': (node.get('primaryLanguage') or {}).get('name') or '',
+            'description': node.get('description') or '',
+            'topics': [t['topic']['name'] for t in (node.get('repositoryTopics') or {}).get('nodes', [])],
+            'pushed_at': node.get('pushedAt'),
+            'created_at': node.get('createdAt'),
+            'default_branch': (node.get('defaultBranchRef') or {}).get('name') or 'main',
+            'readme': readme.get('text'),
+            'readme_sha': readme.get('oid', ''),
+            'last_updated': timezone.now().isoformat(),
+        }
+
+    @classmethod
+    def fetch_repos_graphql(cls, repo_urls, with_readme=False, concurrency=None):
+        """
+        Fetches metadata for many repos using aliased `repository(...)` queries,
+        GRAPHQL_BATCH_SIZE repos per round trip.
+        Returns {repo_url: data} for the repos GitHub answered, or None if
+        GraphQL is unavailable so callers can fall back to REST.
+        """
+        targets = []
+        for url in repo_urls:
+            parsed = cls.parse_repo_url(url)
+            if parsed:
+                targets.append((url, parsed))
+
+        fields = cls.REPO_FIELDS + (cls.README_FIELDS if with_readme else '')
+        batches = [
+            targets[start:start + cls.GRAPHQL_BATCH_SIZE]
+            for start in range(0, len(targets), cls.GRAPHQL_BATCH_SIZE)
+        ]
+
+        def fetch(batch):
+            params, selections, variables = [], [], {}
+            for i, (url, (owner, repo)) in enumerate(batch):
+                params.append(f"$o{i}: String!, $n{i}: String!")
+                selections.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {fields} }}")
+                variables[f'o{i}'] = owner
+                variables[f'n{i}'] = repo
+
+            query = f"query({', '.join(params)}) {{ {' '.join(selections)} }}"
+            return cls._graphql(query, variables)
+
+        results = {}
+        answered = False
+        for batch, data in zip(batches, run_concurrently(fetch, batches, concurrency)):
+            if data is None:
+                continue
+            answered = True
+            for i, (url, _) in enumerate(batch):
+                node = data.get(f'r{i}')
+                if node:
+                    results[url] = cls._normalize_graphql_repo(node)
+
+        # Nothing answered at all means GraphQL is unusable; let callers use REST
+        return results if answered else None
+
+    @classmethod
+    def fetch_org_repos_graphql(cls, org, with_readme=True, readme_text=True):
+        """
+        Fetches every repository of an organization (optionally with README
+        blob SHA and text) via `organization.repositories` pagination.
+        With readme_text=False only the blob SHA is fetched and `readme` is None.
+        Returns a list of normalized repo dicts, or None if GraphQL is unavailable.
+        """
+        fields = cls.REPO_FIELDS
+        if with_readme:
+            fields += cls.README_FIELDS if readme_text else cls.README_OID_FIELDS
+        query = f"""
+            query($org: String!, $first: Int!, $after: String) {{
+                organization(login: $org) {{
+                    repositories(first: $first, after: $after, orderBy: {{field: NAME, direction: ASC}}) {{
+                        pageInfo {{ hasNextPage endCursor }}
+                        nodes {{ {fields} }}
+                    }}
+                }}
+            }}
+        """
+
+        repos = []
+        cursor = None
+        while True:
+            data = cls._graphql(query, {'org': org, 'first': cls.GRAPHQL_PAGE_SIZE, 'after': cursor})
+            if data is None or not data.get('organization'):
+                return None
+
+            connection = data['organization']['repositories']
+            repos.extend(cls._normalize_graphql_repo(node) for node in connection['nodes'] if node)
+
+            if not connection['pageInfo']['hasNextPage']:
                 break
+            cursor = connection['pageInfo']['endCursor']
 
         return repos
@@ -108,7 +108,7 @@ class ProjectTaskTests(TestCase):
             github_repo_url='https://github.com/kiri-labs/test-project'
         )
 
-    @patch('requests.post')
+    @patch('kiri_project.http_client.post')
     def test_post_project_to_facebook(self, mock_post):
         from kiri_project.tasks import post_to_facebook
         mock_response = MagicMock()
@@ -127,3 +127,441 @@ class ProjectTaskTests(TestCase):
             message = kwargs['data']['message']
             self.assertIn('https://kiri.ng/projects/test-project/', message)
             self.assertEqual(kwargs['headers']['Authorization'], 'Bearer abc')
+
+
+class GitHubConditionalRequestTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def _response(self, status_code, json_data=None, headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.json.return_value = json_data or {}
+        response.headers = headers or {}
+        return response
+
+    @patch('kiri_project.http_client.get')
+    def test_validators_stored_and_304_reuses_payload(self, mock_get):
+        from django.core.cache import cache
+        from .models import GitHubValidator
+        from .services import GitHubService
+
+        mock_get.return_value = self._response(
+            200,
+            {'stargazers_count': 7, 'forks_count': 2, 'language': 'Python', 'topics': ['edge']},
+            {'ETag': 'W/"abc"', 'Last-Modified': 'Tue, 01 Sep 2026 10:00:00 GMT'},
+        )
+        data = GitHubService.fetch_repo_data('https://github.com/kiri-labs/demo')
+        self.assertEqual(data['stars_count'], 7)
+        validator = GitHubValidator.objects.get(resource='repos/kiri-labs/demo')
+        self.assertEqual(validator.etag, 'W/"abc"')
+
+        cache.clear()
+        mock_get.return_value = self._response(304)
+        data = GitHubService.fetch_repo_data('https://github.com/kiri-labs/demo')
+        headers = mock_get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], 'W/"abc"')
+        self.assertTrue(data['not_modified'])
+        self.assertEqual(data['stars_count'], 7)
+        mock_get.return_value.json.assert_not_called()
+
+
+    @patch('kiri_project.http_client.get')
+    def test_304_applies_payload_stored_without_project_update(self, mock_get):
+        from .models import GitHubValidator
+        from .utils import sync_project_metadata
+
+        # Validator written by a run that never saved the project (e.g. a dry run)
+        GitHubValidator.objects.create(
+            resource='repos/kiri-labs/stale', etag='W/"v1"',
+            payload={'stars_count': 42, 'forks_count': 5, 'language': 'Rust', 'description': 'Stale', 'topics': ['ml']},
+        )
+        project = Project.objects.create(name='Stale', github_repo_url='https://github.com/kiri-labs/stale')
+        mock_get.return_value = self._response(304)
+
+        self.assertTrue(sync_project_metadata(project))
+
+        project.refresh_from_db()
+        self.assertEqual((project.stars_count, project.forks_count, project.language), (42, 5, 'Rust'))
+        self.assertEqual(project.topics, 'ml')
+        self.assertIsNotNone(project.last_synced_at)
+
+class GitHubGraphQLTests(TestCase):
+    @patch('kiri_project.http_client.post')
+    def test_fetch_repos_graphql_batches_aliased_queries(self, mock_post):
+        from .services import GitHubService
+
+        node = {
+            'name': 'demo', 'description': 'Demo repo', 'url': 'https://github.com/kiri-labs/demo',
+            'stargazerCount': 11, 'forkCount': 3, 'pushedAt': '2026-09-01T10:00:00Z',
+            'createdAt': '2026-01-01T10:00:00Z', 'owner': {'login': 'kiri-labs'},
+            'primaryLanguage': {'name': 'Python'}, 'defaultBranchRef': {'name': 'main'},
+            'repositoryTopics': {'nodes': [{'topic': {'name': 'tinyml'}}]},
+        }
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {'data': {'r0': node, 'r1': None}}
+        mock_post.return_value = response
+
+        urls = ['https://github.com/kiri-labs/demo', 'https://github.com/kiri-labs/missing']
+        with patch.dict(os.environ, {'GITHUB_TOKEN': 'token'}):
+            results = GitHubService.fetch_repos_graphql(urls)
+
+        self.assertEqual(mock_post.call_count, 1)
+        body = mock_post.call_args.kwargs['json']
+        self.assertIn('r1: repository(owner: $o1, name: $n1)', body['query'])
+        self.assertEqual(body['variables']['n0'], 'demo')
+        self.assertEqual(results[urls[0]]['stars_count'], 11)
+        self.assertEqual(results[urls[0]]['topics'], ['tinyml'])
+        self.assertNotIn(urls[1], results)
+
+    def test_graphql_requires_token(self):
+        from .services import GitHubService
+        with patch.dict(os.environ, {'GITHUB_TOKEN': ''}):
+            self.assertIsNone(GitHubService.fetch_repos_graphql(['https://github.com/kiri-labs/demo']))
+
+
+class ConcurrentFetchTests(TestCase):
+    def test_run_concurrently_preserves_order_and_cap(self):
+        import threading
+        import time
+        from .services import run_concurrently
+
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def work(n):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            return n * 2
+
+        self.assertEqual(run_concurrently(work, range(8), concurrency=3), [n * 2 for n in range(8)])
+        self.assertLessEqual(state['peak'], 3)
+        self.assertGreater(state['peak'], 1)
+
+    @patch('kiri_project.http_client.get')
+    def test_fetch_repos_concurrent_stores_validators(self, mock_get):
+        from django.core.cache import cache
+        from .models import GitHubValidator
+        from .services import GitHubService
+        cache.clear()
+
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {'stargazers_count': 5, 'forks_count': 1}
+        response.headers = {'ETag': '"v1"'}
+        mock_get.return_value = response
+
+        urls = [f'https://github.com/kiri-labs/repo-{i}' for i in range(4)]
+        results = GitHubService.fetch_repos_concurrent(urls, concurrency=4)
+
+        self.assertEqual(set(results), set(urls))
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual(GitHubValidator.objects.filter(etag='"v1"').count(), 4)
+
+    def test_workers_defer_circuit_state_to_the_caller(self):
+        import threading
+        from django.core.cache import cache
+        from kiri_project import circuit
+        from .services import GitHubService, run_concurrently
+        cache.clear()
+        circuit.reset()
+        self.addCleanup(circuit.reset)
+        breaker = circuit.breaker_for(GitHubService.api_url(''))
+
+        worker_calls = []
+
+        def track(method):
+            def wrapper(*args, **kwargs):
+                if threading.current_thread().name.startswith('github-fetch'):
+                    worker_calls.append(method.__name__)
+                return method(*args, **kwargs)
+            return wrapper
+
+        with self.settings(CIRCUIT_FAILURE_THRESHOLD=2), \
+                patch.object(cache, 'get', track(cache.get)), patch.object(cache, 'set', track(cache.set)):
+            run_concurrently(lambda n: breaker.allow() and breaker.record_failure(), range(4), concurrency=4)
+
+        self.assertEqual(worker_calls, [])
+        # Published by the calling thread once the pool is done
+        self.assertEqual(cache.get(breaker.key)['state'], circuit.OPEN)
+
+
+class RateBudgetTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from .ratelimit import GitHubRateBudget
+        cache.clear()
+        GitHubRateBudget._local.clear()
+        GitHubRateBudget._last_written.clear()
+
+    def tearDown(self):
+        from .ratelimit import GitHubRateBudget
+        GitHubRateBudget._local.clear()
+        GitHubRateBudget._last_written.clear()
+
+    def _response(self, status_code, headers):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = headers
+        return response
+
+    def test_budget_recorded_from_headers_with_reserve(self):
+        import time
+        from .ratelimit import GitHubRateBudget
+        reset = int(time.time()) + 600
+        GitHubRateBudget.record(self._response(200, {
+            'X-RateLimit-Remaining': '150', 'X-RateLimit-Reset': str(reset),
+        }))
+        with self.settings(GITHUB_RATELIMIT_RESERVE=100):
+            self.assertEqual(GitHubRateBudget.remaining(), 50)
+            self.assertTrue(GitHubRateBudget.can_spend(50))
+            self.assertFalse(GitHubRateBudget.can_spend(51))
+            self.assertTrue(GitHubRateBudget.can_spend(150, interactive=True))
+
+    def test_retry_after_blocks_until_window_passes(self):
+        import time
+        from .ratelimit import GitHubRateBudget
+        GitHubRateBudget.record(self._response(429, {'Retry-After': '120'}))
+        self.assertFalse(GitHubRateBudget.can_spend(interactive=True))
+        self.assertGreaterEqual(GitHubRateBudget.resume_at().timestamp(), time.time() + 120)
+
+    def test_sync_deferred_when_budget_exhausted(self):
+        import time
+        from kiri_project.tasks import sync_github_stats
+        from .ratelimit import GitHubRateBudget
+        Project.objects.create(name='Starred', description='d', github_repo_url='https://github.com/kiri-labs/starred')
+        reset = int(time.time()) + 900
+        for resource in ('core', 'graphql'):
+            GitHubRateBudget.record(self._response(403, {
+                'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset), 'X-RateLimit-Resource': resource,
+            }))
+
+        with patch.object(type(sync_github_stats), 'schedule') as mock_schedule, \
+                patch('kiri_project.http_client.get') as mock_get:
+            sync_github_stats.call_local()
+            self.assertFalse(mock_get.called)
+            self.assertEqual(mock_schedule.call_count, 1)
+            self.assertGreaterEqual(mock_schedule.call_args.kwargs['eta'].timestamp(), reset)
+
+
+class StaleProjectSchedulerTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from .ratelimit import GitHubRateBudget
+        cache.clear()
+        GitHubRateBudget._local.clear()
+
+    def tearDown(self):
+        from .ratelimit import GitHubRateBudget
+        GitHubRateBudget._local.clear()
+        GitHubRateBudget._last_written.clear()
+
+    def _project(self, name, hours_ago, **kwargs):
+        from datetime import timedelta
+        from django.utils import timezone
+        project = Project.objects.create(
+            name=name, description='d', github_repo_url=f'https://github.com/kiri-labs/{name}', **kwargs
+        )
+        synced = timezone.now() - timedelta(hours=hours_ago) if hours_ago is not None else None
+        Project.objects.filter(pk=project.pk).update(last_synced_at=synced)
+        return project
+
+    def test_picks_never_synced_then_weighted_oldest(self):
+        from .utils import select_stale_projects
+        self._project('archived-old', 10, status='archived')
+        self._project('featured-recent', 3, is_featured=True)
+        self._project('never', None)
+        self._project('fresh', 0.5)
+
+        chosen = [p.name for p in select_stale_projects(limit=3)]
+        self.assertEqual(chosen, ['never', 'featured-recent', 'archived-old'])
+
+    def test_limit_capped_by_remaining_budget(self):
+        import time
+        from .ratelimit import GitHubRateBudget
+        from .utils import select_stale_projects
+        for i in range(5):
+            self._project(f'repo-{i}', None)
+
+        response = MagicMock(status_code=200, headers={
+            'X-RateLimit-Remaining': '102', 'X-RateLimit-Reset': str(int(time.time()) + 600),
+        })
+        GitHubRateBudget.record(response)
+        with self.settings(GITHUB_RATELIMIT_RESERVE=100), patch.dict(os.environ, {'GITHUB_TOKEN': ''}):
+            self.assertEqual(len(select_stale_projects(limit=5)), 2)
+
+
+class BulkProjectSyncTests(TestCase):
+    @patch('projects.services.GitHubService.fetch_repos_graphql')
+    def test_sync_writes_projects_with_one_bulk_update(self, mock_graphql):
+        from kiri_project.tasks import _sync_projects
+        projects = [
+            Project.objects.create(name=f'bulk-{i}', description='d', github_repo_url=f'https://github.com/kiri-labs/bulk-{i}')
+            for i in range(3)
+        ]
+        mock_graphql.return_value = {
+            p.github_repo_url: {'stars_count': 9, 'forks_count': 1, 'language': 'C', 'description': '', 'topics': []}
+            for p in projects
+        }
+
+        with patch.object(Project, 'save') as mock_save:
+            updated, errors = _sync_projects(projects)
+            self.assertFalse(mock_save.called)
+
+        self.assertEqual((updated, errors), (3, 0))
+        self.assertEqual(set(Project.objects.values_list('stars_count', flat=True)), {9})
+        self.assertFalse(Project.objects.filter(last_synced_at__isnull=True).exists())
+
+
+class SyncGithubCommandTests(TestCase):
+    def _listing(self, names):
+        return [{
+            'name': name, 'owner': {'login': 'kiri-labs'}, 'html_url': f'https://github.com/kiri-labs/{name}',
+            'description': f'{name} repo', 'stargazers_count': 5, 'forks_count': 1, 'language': 'Python', 'topics': [],
+        } for name in names]
+
+    def _call(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('sync_github', *args, stdout=out)
+        return out.getvalue()
+
+    @patch('projects.services.GitHubService.iter_user_public_repos')
+    def test_import_streams_pages_and_respects_limit_and_dry_run(self, mock_pages):
+        pages_fetched = []
+
+        def pages(owner):
+            for page in (self._listing(['a', 'b']), self._listing(['c', 'd']), self._listing(['e'])):
+                pages_fetched.append(page)
+                yield page
+        mock_pages.side_effect = pages
+
+        output = self._call('kiri-labs', '--dry-run')
+        self.assertIn('Would have created 5', output)
+        self.assertFalse(Project.objects.exists())
+
+        pages_fetched.clear()
+        self._call('kiri-labs', '--limit', '3')
+        self.assertEqual(sorted(Project.objects.values_list('name', flat=True)), ['a', 'b', 'c'])
+        self.assertEqual(len(pages_fetched), 2)
+        self.assertEqual(Project.objects.get(name='a').stars_count, 5)
+
+    @patch('projects.utils.fetch_projects_data')
+    def test_refresh_only_stale(self, mock_fetch):
+        from datetime import timedelta
+        from django.utils import timezone
+        fresh = Project.objects.create(name='fresh', description='d', github_repo_url='https://github.com/kiri-labs/fresh')
+        stale = Project.objects.create(name='stale', description='d', github_repo_url='https://github.com/kiri-labs/stale')
+        Project.objects.filter(pk=fresh.pk).update(last_synced_at=timezone.now() - timedelta(minutes=10))
+        Project.objects.filter(pk=stale.pk).update(last_synced_at=timezone.now() - timedelta(days=2))
+        mock_fetch.side_effect = lambda projects, **kwargs: {
+            p.github_repo_url: {'stars_count': 42, 'forks_count': 0, 'language': '', 'description': '', 'topics': []}
+            for p in projects
+        }
+
+        self._call('--only-stale', '1d', '--concurrency', '2')
+
+        self.assertEqual([p.name for p in mock_fetch.call_args.args[0]], ['stale'])
+        self.assertEqual(mock_fetch.call_args.kwargs['concurrency'], 2)
+        self.assertEqual(Project.objects.get(pk=stale.pk).stars_count, 42)
+        self.assertEqual(Project.objects.get(pk=fresh.pk).stars_count, 0)
+
+    @patch('kiri_project.http_client.get')
+    @patch('projects.services.GitHubService.fetch_repos_graphql', return_value=None)
+    def test_dry_run_writes_nothing(self, mock_graphql, mock_get):
+        from django.core.cache import cache
+        from .models import GitHubValidator
+        cache.clear()
+        Project.objects.create(name='dry', description='d', github_repo_url='https://github.com/kiri-labs/dry')
+        response = MagicMock(status_code=200, headers={'ETag': 'W/"dry"'})
+        response.json.return_value = {'stargazers_count': 8, 'forks_count': 1, 'language': 'Go', 'topics': []}
+        mock_get.return_value = response
+
+        output = self._call('--dry-run')
+
+        self.assertIn('Would have created 0, updated 1', output)
+        self.assertTrue(mock_get.called)
+        self.assertFalse(GitHubValidator.objects.exists())
+        self.assertIsNone(cache.get('github_meta:kiri-labs:dry'))
+        self.assertEqual(Project.objects.get(name='dry').stars_count, 0)
+
+    def test_concurrency_rejected_for_owner_import(self):
+        from django.core.management.base import CommandError
+        with self.assertRaises(CommandError):
+            self._call('kiri-labs', '--concurrency', '4')
+
+
+class ProjectListPaginationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from django.utils import timezone
+
+        cache.clear()
+        Project.objects.bulk_create([
+            Project(name=f"Paged {n:02d}", slug=f"paged-{n:02d}", description="Keyset paging demo")
+            for n in range(30)
+        ])
+        # Ties on created_at are broken by id
+        now = timezone.now()
+        for n, project in enumerate(Project.objects.order_by('id')):
+            Project.objects.filter(pk=project.pk).update(created_at=now - timezone.timedelta(minutes=n // 4))
+
+    def walk(self, params=None):
+        """Follows next cursors; returns the pages' project names."""
+        url = reverse('projects:list')
+        pages, params = [], dict(params or {})
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            pages.append([project.name for project in response.context['projects']])
+            cursor = response.context['page_obj'].next_cursor
+            if not cursor:
+                return pages, response
+            params['cursor'] = cursor
+
+    def test_cursors_walk_every_project_once_in_order(self):
+        pages, _ = self.walk()
+        self.assertEqual([len(page) for page in pages], [12, 12, 6])
+        expected = [p.name for p in Project.objects.order_by('-created_at', '-id')]
+        self.assertEqual(sum(pages, []), expected)
+
+        # Back from the last page
+        response = self.client.get(reverse('projects:list'), {'cursor': self.walk()[1].context['page_obj'].previous_cursor})
+        self.assertEqual([project.name for project in response.context['projects']], pages[1])
+        self.assertTrue(response.context['page_obj'].has_previous())
+        self.assertContains(response, "30 projects")
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse('projects:list')
+        first = self.client.get(url)
+        cursor = first.context['page_obj'].next_cursor
+        with CaptureQueriesContext(connection) as page_one:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as page_two:
+            self.client.get(url, {'cursor': cursor})
+        self.assertEqual(len(page_one), len(page_two))
+        for query in page_one.captured_queries + page_two.captured_queries:
+            self.assertNotIn('OFFSET', query['sql'])
+            self.assertNotIn('COUNT(', query['sql'])
+
+    def test_search_results_page_in_rank_order(self):
+        pages, _ = self.walk({'q': 'paged'})
+        self.assertEqual([len(page) for page in pages], [12, 12, 6])
+        self.assertEqual(len(set(sum(pages, []))), 30)
+
+    def test_invalid_cursor_is_not_found(self):
+        from core.pagination import encode_cursor
+
+        url = reverse('projects:list')
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'cursor': encode_cursor('next', ['soon', 'x'])}).status_code, 404)
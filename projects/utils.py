@@ -1,37 +1,179 @@
+import math
+import logging
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
+from .ratelimit import GitHubRateBudget
 from .services import GitHubService
+from kiri_project.caching import invalidate_model
 
+logger = logging.getLogger(__name__)
 
-def sync_project_metadata(project):
+# Featured and active projects count as "older" than they are, so they are
+# picked first and refreshed more often
+SYNC_PRIORITY_WEIGHTS = {'featured': 4, 'active': 2, 'default': 1}
+
+# Project fields written by a GitHub sync
+SYNC_FIELDS = [
+    'stars_count', 'forks_count', 'language',
+    'description', 'topics', 'last_synced_at',
+]
+
+
+def needs_sync(project):
+    """True if the project has not been synced within the last hour."""
+    return not (project.last_synced_at and timezone.now() - project.last_synced_at < timedelta(hours=1))
+
+
+def sync_capacity():
+    """
+    How many projects the remaining background budget can sync this run,
+    or None when the budget is unknown. GraphQL answers a whole batch per point.
+    """
+    core = GitHubRateBudget.remaining()
+    if core is None:
+        return None
+    if 'Authorization' not in GitHubService._headers():
+        return core
+    graphql = GitHubRateBudget.remaining(resource='graphql')
+    if graphql is None:
+        return None
+    return core + graphql * GitHubService.GRAPHQL_BATCH_SIZE
+
+
+def select_stale_projects(limit=None):
+    """
+    Picks the projects most in need of a sync: never-synced first, then the
+    oldest last_synced_at weighted by SYNC_PRIORITY_WEIGHTS.
+
+    The run size grows with the project count so that every project is
+    refreshed at least every GITHUB_SYNC_MAX_AGE_HOURS, and shrinks to what
+    the remaining rate-limit budget allows.
+    """
+    from .models import Project
+
+    now = timezone.now()
+    candidates = list(
+        Project.objects.exclude(github_repo_url='')
+        .exclude(last_synced_at__gte=now - timedelta(hours=1))
+        .values_list('id', 'last_synced_at', 'is_featured', 'status')
+    )
+    if not candidates:
+        return []
+
+    if limit is None:
+        runs_per_window = max(
+            getattr(settings, 'GITHUB_SYNC_MAX_AGE_HOURS', 24) // getattr(settings, 'GITHUB_POLL_INTERVAL_HOURS', 1), 1
+        )
+        total = Project.objects.exclude(github_repo_url='').count()
+        limit = max(getattr(settings, 'GITHUB_SYNC_BATCH_SIZE', 20), math.ceil(total / runs_per_window))
+
+    capacity = sync_capacity()
+    if capacity is not None:
+        limit = min(limit, capacity)
+    if limit <= 0:
+        return []
+
+    def staleness(row):
+        _, last_synced_at, is_featured, status = row
+        if last_synced_at is None:
+            return math.inf
+        if is_featured:
+            weight = SYNC_PRIORITY_WEIGHTS['featured']
+        elif status == Project.Status.ACTIVE:
+            weight = SYNC_PRIORITY_WEIGHTS['active']
+        else:
+            weight = SYNC_PRIORITY_WEIGHTS['default']
+        return (now - last_synced_at).total_seconds() * weight
+
+    candidates.sort(key=staleness, reverse=True)
+    chosen_ids = [row[0] for row in candidates[:limit]]
+    projects = Project.objects.in_bulk(chosen_ids)
+    return [projects[pk] for pk in chosen_ids if pk in projects]
+
+
+def fetch_projects_data(projects, interactive=False, concurrency=None, store=True):
+    """
+    Fetch phase of a project sync: GraphQL batches for the whole list, with
+    concurrent REST requests for anything GraphQL could not answer, trimmed
+    to the remaining budget. With store=False, REST validators and cached
+    responses are not written. Returns {github_repo_url: data}.
+    """
+    repo_urls = [p.github_repo_url for p in projects if p.github_repo_url]
+    if not repo_urls:
+        return {}
+
+    batch_data = GitHubService.fetch_repos_graphql(repo_urls, concurrency=concurrency) or {}
+    missing = [url for url in repo_urls if url not in batch_data]
+    if missing:
+        budget = GitHubRateBudget.remaining(interactive=interactive)
+        if budget is not None and budget < len(missing):
+            logger.warning(f"GitHub budget allows {budget} of {len(missing)} REST fetches this run")
+            missing = missing[:budget]
+        batch_data.update(GitHubService.fetch_repos_concurrent(missing, concurrency, store=store))
+    return batch_data
+
+
+def apply_project_metadata(project, data):
+    """
+    Copies GitHub data onto a Project instance without saving it.
+    Returns True if the instance was updated.
+    """
+    if not data:
+        return False
+
+    # A 304 carries the payload stored with its validator, which is applied
+    # like a 200: the validator may have been stored by a run that never
+    # updated this project (a dry run, a failed save, or a fetch for a
+    # project that was then skipped)
+    project.last_synced_at = timezone.now()
+    project.stars_count = data['stars_count']
+    project.forks_count = data['forks_count']
+    project.language = data['language'] or ''
+
+    if not project.description:
+        project.description = data['description'] or ''
+
+    if not project.topics and data.get('topics'):
+        # Convert list to comma-separated string
+        topics = data['topics']
+        if isinstance(topics, list):
+            project.topics = ', '.join(topics)
+        else:
+            project.topics = str(topics)
+
+    return True
+
+
+def sync_project_metadata(project, data=None):
     """
     Updates a Project instance with data from GitHub.
+    `data` may be supplied by a batch fetch (GraphQL); otherwise it is fetched over REST.
     Returns True if updated, False otherwise.
     """
-    if project.last_synced_at and timezone.now() - project.last_synced_at < timedelta(hours=1):
+    if not needs_sync(project):
+        return False
+
+    if data is None:
+        data = GitHubService.fetch_repo_data(project.github_repo_url)
+    if not apply_project_metadata(project, data):
         return False
 
-    data = GitHubService.fetch_repo_data(project.github_repo_url)
-    if data:
-        project.stars_count = data['stars_count']
-        project.forks_count = data['forks_count']
-        project.language = data['language'] or ''
-
-        if not project.description:
-            project.description = data['description'] or ''
-
-        if not project.topics and data.get('topics'):
-            # Convert list to comma-separated string
-            topics = data['topics']
-            if isinstance(topics, list):
-                project.topics = ', '.join(topics)
-            else:
-                project.topics = str(topics)
-
-        project.last_synced_at = timezone.now()
-        project.save(update_fields=[
-            'stars_count', 'forks_count', 'language',
-            'description', 'topics', 'last_synced_at',
-        ])
-        return True
-    return False
+    project.save(update_fields=SYNC_FIELDS)
+    return True
+
+
+def save_synced_projects(projects):
+    """
+    Writes a sync run's projects with one bulk_update inside a single short
+    transaction, then bumps the Project cache tag once. Bypasses Project.save,
+    whose per-instance hooks are not needed for metadata refreshes.
+    """
+    from .models import Project
+
+    if not projects:
+        return
+    with transaction.atomic():
+        Project.objects.bulk_update(projects, SYNC_FIELDS, batch_size=100)
+    invalidate_model(Project)
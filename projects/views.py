@@ -6,6 +6,7 @@ from django.contrib.auth.decorators import login_not_required
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
+from core.pagination import KeysetPaginationMixin
 from .models import Project
 from .forms import ProjectSubmissionForm
 
@@ -19,11 +20,12 @@ class StaffRequiredMixin(UserPassesTestMixin):
 # ── Public Views ──
 
 @method_decorator(login_not_required, name='dispatch')
-class ProjectListView(ListView):
+class ProjectListView(KeysetPaginationMixin, ListView):
     model = Project
     template_name = 'projects/project_list.html'
     context_object_name = 'projects'
     paginate_by = 12
+    keyset = ('-created_at', '-id')
 
     def get_queryset(self):
         qs = Project.objects.all()
@@ -41,10 +43,28 @@ class ProjectListView(ListView):
         # Search
         q = self.request.GET.get('q')
         if q:
-            qs = qs.filter(name__icontains=q)
+            qs = self.search(qs, q)
 
         return qs
 
+    @staticmethod
+    def search(qs, q):
+        """Full-text matches (name, description, topics, stack), best first."""
+        from django.db.models import Case, When
+        from core import search
+
+        ids = search.matching_ids(q, 'project')
+        if ids is None:
+            return qs.filter(name__icontains=q)
+        if not ids:
+            return qs.none()
+        rank = Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)])
+        return qs.filter(pk__in=ids).annotate(search_rank=rank)
+
+    def get_keyset(self, queryset):
+        # Full-text results page in rank order
+        return ('search_rank',) if 'search_rank' in queryset.query.annotations else self.keyset
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['categories'] = Project.Category.choices
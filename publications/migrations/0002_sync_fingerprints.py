@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-17 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='pushed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='readme_sha',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
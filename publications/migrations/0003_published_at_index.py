@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-17 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publications', '0002_sync_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['-published_at'], name='publication_publish_a8988a_idx'),
+        ),
+    ]
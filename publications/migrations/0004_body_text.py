@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-17 06:56
+
+from django.db import migrations, models
+
+
+def fill_body_text(apps, schema_editor):
+    from core.search import html_to_text
+
+    Publication = apps.get_model('publications', 'Publication')
+    publications = list(Publication.objects.only('html_content'))
+    for publication in publications:
+        publication.body_text = html_to_text(publication.html_content)
+    Publication.objects.bulk_update(publications, ['body_text'], batch_size=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publications', '0003_published_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='body_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_body_text, migrations.RunPython.noop),
+    ]
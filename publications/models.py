@@ -8,19 +8,36 @@ class Publication(models.Model):
     slug = models.SlugField(max_length=255, unique=True)
     description = models.TextField(blank=True)
     html_content = models.TextField()
+    # Plain text of html_content, kept for the full-text search index (core.search)
+    body_text = models.TextField(blank=True, default='', editable=False)
     github_url = models.URLField()
     topics = models.CharField(max_length=255, blank=True)
     published_at = models.DateTimeField(default=timezone.now)
+    # Sync fingerprints: unchanged values mean the README need not be re-fetched or re-rendered
+    readme_sha = models.CharField(max_length=64, blank=True, default='')
+    pushed_at = models.DateTimeField(null=True, blank=True)
     last_synced_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-published_at']
+        indexes = [
+            models.Index(fields=['-published_at']),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        from core.search import html_to_text
+
+        self.body_text = html_to_text(self.html_content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'html_content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'body_text'}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse('publications:detail', kwargs={'slug': self.slug})
 
@@ -41,6 +41,22 @@ class PublicationViewsTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Test Title')
 
+    def test_list_pages_by_cursor(self):
+        from django.utils import timezone
+        Publication.objects.bulk_create([
+            Publication(repo_name=f"paged-{n}", title=f"Paged {n}", slug=f"paged-{n}", html_content='',
+                        github_url=f"https://github.com/kiri-labs/paged-{n}",
+                        published_at=timezone.now() - timezone.timedelta(days=n + 1))
+            for n in range(12)
+        ])
+        first = self.client.get(reverse('publications:list'))
+        self.assertEqual(len(first.context['publications']), 12)
+        self.assertContains(first, "13 publications")
+
+        second = self.client.get(reverse('publications:list'), {'cursor': first.context['page_obj'].next_cursor})
+        self.assertEqual([pub.title for pub in second.context['publications']], ["Paged 11"])
+        self.assertFalse(second.context['page_obj'].has_next())
+
     def test_detail_view(self):
         response = self.client.get(reverse('publications:detail', kwargs={'slug': self.pub.slug}))
         self.assertEqual(response.status_code, 200)
@@ -93,6 +109,112 @@ class MarkdownUtilsTest(TestCase):
         self.assertIn("codehilite", html)
         self.assertNotIn("```", html)
 
+    def test_reused_engine_matches_fresh_render(self):
+        import markdown
+        from .utils import MARKDOWN_EXTENSIONS
+        raw = "# Intro\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\n```python\nx = 1\n```"
+        expected = markdown.markdown(raw, extensions=MARKDOWN_EXTENSIONS)
+        # Heading ids must not carry over from a previous document
+        for _ in range(2):
+            self.assertEqual(process_markdown("owner", "repo", "main", raw, use_cache=False), expected)
+
+    def test_identical_input_renders_once(self):
+        from django.core.cache import caches
+        from . import utils
+        utils.clear_render_cache()
+        caches['markdown'].clear()
+        with patch('publications.utils.get_markdown_engine', wraps=utils.get_markdown_engine) as mock_engine:
+            first = process_markdown("owner", "cached-repo", "main", "# Cached")
+            second = process_markdown("owner", "cached-repo", "main", "# Cached")
+            # A fresh process still finds the render in the shared cache
+            utils.clear_render_cache()
+            third = process_markdown("owner", "cached-repo", "main", "# Cached")
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(mock_engine.call_count, 1)
+
+    def test_renders_stay_out_of_the_default_cache(self):
+        from django.core.cache import caches
+        from . import utils
+        utils.clear_render_cache()
+        shared = caches['shared']
+        shared.clear()
+
+        process_markdown("owner", "own-cache", "main", "# One\n\nText.\n\n## Two\n\nMore text.\n")
+
+        self.assertEqual(shared.entry_count(), 0)
+        self.assertGreater(caches['markdown'].entry_count(), 0)
+
+
+class BlockRenderingTests(TestCase):
+    ARTICLE = (
+        "# Intro\n\nFirst paragraph.\n\n```python\nx = 1\n```\n\n"
+        "## Usage\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\n```bash\necho hi\n```\n\n## Usage\n\nDone.\n"
+    )
+
+    def setUp(self):
+        from django.core.cache import caches
+        from .utils import clear_render_cache
+        clear_render_cache()
+        caches['markdown'].clear()
+
+    def _normalize(self, html):
+        return "\n".join(line for line in html.split("\n") if line.strip())
+
+    def test_block_render_matches_whole_document(self):
+        import markdown
+        from .utils import MARKDOWN_EXTENSIONS, render_blocks
+        html = render_blocks(self.ARTICLE)
+        self.assertEqual(
+            self._normalize(html), self._normalize(markdown.markdown(self.ARTICLE, extensions=MARKDOWN_EXTENSIONS))
+        )
+        self.assertIn('id="usage_1"', html)
+
+    def test_edit_only_rerenders_changed_block(self):
+        from . import utils
+        utils.render_blocks(self.ARTICLE)
+        edited = self.ARTICLE.replace("First paragraph.", "First paragraph, revised.")
+        with patch('publications.utils.get_markdown_engine', wraps=utils.get_markdown_engine) as mock_engine:
+            html = utils.render_blocks(edited)
+        self.assertEqual(mock_engine.call_count, 1)
+        self.assertIn("revised", html)
+
+    def test_fence_after_paragraph_line_is_not_split(self):
+        import markdown
+        from .utils import MARKDOWN_EXTENSIONS, render_blocks, split_blocks
+        text = "# Setup\n\nInstall:\n```bash\npip install x\n\n# configure\n```\n\n## Next\n\nDone.\n"
+        self.assertEqual(split_blocks(text)[1:], ["## Next\n\nDone."])
+        html = render_blocks(text)
+        self.assertEqual(
+            self._normalize(html), self._normalize(markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS))
+        )
+        self.assertNotIn('id="configure"', html)
+        self.assertNotIn('```', html)
+
+    def test_raw_html_block_is_not_split(self):
+        import markdown
+        from .utils import MARKDOWN_EXTENSIONS, render_blocks, split_blocks
+        text = "# A\n\n<details>\n<summary>More</summary>\n\n# Inside\n\nbody\n</details>\n\n## B\n\nEnd.\n"
+        self.assertIn("<details>\n<summary>More</summary>\n\n# Inside\n\nbody\n</details>", split_blocks(text))
+        self.assertEqual(
+            self._normalize(render_blocks(text)),
+            self._normalize(markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)),
+        )
+
+    def test_split_that_renders_differently_falls_back(self):
+        from . import utils
+        text = "Install:\n```bash\npip install x\n\n# configure\n```\n\n# Next\n\nDone.\n"
+        bad_split = ["Install:\n```bash\npip install x", "# configure\n```", "# Next\n\nDone."]
+        self.assertFalse(utils._blocks_add_up(bad_split))
+        with patch('publications.utils.split_blocks', return_value=bad_split):
+            self.assertIsNone(utils.render_blocks(text))
+
+    def test_reference_links_fall_back_to_whole_document(self):
+        from .utils import render_blocks
+        self.assertIsNone(render_blocks("# A\n\nSee [docs][1].\n\n# B\n\n[1]: https://example.com\n"))
+        self.assertIsNone(render_blocks("[TOC]\n\n# A\n\n# B\n"))
+        self.assertIsNone(render_blocks("# A\n\n```python\nnever closed\n"))
+
 class PublicationTaskTests(TestCase):
     def setUp(self):
         self.pub = Publication.objects.create(
@@ -103,7 +225,7 @@ class PublicationTaskTests(TestCase):
             github_url='https://github.com/kiri-labs/test-pub'
         )
 
-    @patch('requests.post')
+    @patch('kiri_project.http_client.post')
     def test_post_publication_to_facebook(self, mock_post):
         from kiri_project.tasks import post_to_facebook
         mock_response = MagicMock()
@@ -122,3 +244,212 @@ class PublicationTaskTests(TestCase):
             message = kwargs['data']['message']
             self.assertIn('https://kiri.ng/publications/test-pub/', message)
             self.assertEqual(kwargs['headers']['Authorization'], 'Bearer abc')
+
+
+class PublicationSyncTests(TestCase):
+    @patch('kiri_project.tasks.post_to_facebook')
+    @patch('projects.services.GitHubService.fetch_org_repos_graphql')
+    def test_sync_uses_graphql_repos(self, mock_fetch, mock_fb):
+        from kiri_project.tasks import sync_publications
+        mock_fetch.return_value = [{
+            'name': 'edge-notes',
+            'owner_login': 'kiri-labs',
+            'html_url': 'https://github.com/kiri-labs/edge-notes',
+            'description': 'Notes',
+            'topics': ['kiri-article'],
+            'pushed_at': '2026-09-01T10:00:00Z',
+            'created_at': '2026-01-01T10:00:00Z',
+            'default_branch': 'main',
+            'readme': '# Edge Notes',
+            'readme_sha': 'abc123',
+        }]
+
+        sync_publications.call_local()
+
+        pub = Publication.objects.get(repo_name='edge-notes')
+        self.assertIn('Edge Notes', pub.html_content)
+        self.assertEqual(pub.topics, 'kiri-article')
+        self.assertTrue(mock_fb.called)
+
+    @patch('kiri_project.tasks.post_to_facebook')
+    @patch('projects.services.GitHubService.fetch_org_repos_graphql')
+    def test_sync_updates_creates_and_prunes_in_bulk(self, mock_fetch, mock_fb):
+        from kiri_project.tasks import sync_publications
+        Publication.objects.create(
+            repo_name='kept', title='Old', slug='kept', html_content='', github_url='https://github.com/kiri-labs/kept'
+        )
+        Publication.objects.create(
+            repo_name='gone', title='Gone', slug='gone', html_content='', github_url='https://github.com/kiri-labs/gone'
+        )
+        base = {
+            'owner_login': 'kiri-labs', 'description': '', 'topics': [], 'pushed_at': '2026-09-01T10:00:00Z',
+            'created_at': None, 'default_branch': 'main', 'readme': '# Hi', 'readme_sha': 'x',
+        }
+        mock_fetch.return_value = [
+            dict(base, name='kept', html_url='https://github.com/kiri-labs/kept'),
+            dict(base, name='fresh', html_url='https://github.com/kiri-labs/fresh'),
+        ]
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            sync_publications.call_local()
+        writes = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE')) and 'publications_publication' in q['sql']
+        ]
+        self.assertEqual(len(writes), 3)
+
+        self.assertEqual(
+            sorted(Publication.objects.values_list('repo_name', flat=True)), ['fresh', 'kept']
+        )
+        self.assertEqual(Publication.objects.get(repo_name='kept').title, 'Kept')
+        self.assertEqual(mock_fb.call_count, 1)
+
+    @patch('kiri_project.tasks.post_to_facebook')
+    @patch('kiri_project.tasks._fetch_readme_rest')
+    @patch('projects.services.GitHubService.fetch_repos_graphql', return_value={})
+    @patch('projects.services.GitHubService.fetch_org_repos_graphql')
+    def test_new_repo_with_failed_readme_does_not_abort_sync(self, mock_fetch, mock_texts, mock_rest, mock_fb):
+        from kiri_project.tasks import README_UNAVAILABLE, sync_publications
+        base = {
+            'owner_login': 'kiri-labs', 'description': '', 'topics': [], 'pushed_at': '2026-09-01T10:00:00Z',
+            'created_at': None, 'default_branch': 'main',
+        }
+        mock_fetch.return_value = [
+            dict(base, name='broken', html_url='https://github.com/kiri-labs/broken', readme=None, readme_sha='b1'),
+            dict(base, name='healthy', html_url='https://github.com/kiri-labs/healthy', readme='# Healthy', readme_sha='h1'),
+        ]
+        mock_rest.return_value = (README_UNAVAILABLE, '')
+
+        result = sync_publications.call_local()
+
+        self.assertEqual(list(Publication.objects.values_list('repo_name', flat=True)), ['healthy'])
+        self.assertIn('Healthy', Publication.objects.get(repo_name='healthy').html_content)
+        self.assertEqual(result['skipped'], 1)
+
+    @patch('kiri_project.http_client.get')
+    @patch('projects.services.GitHubService.fetch_repos_graphql', return_value={})
+    @patch('projects.services.GitHubService.fetch_org_repos_graphql')
+    def test_readme_with_other_filename_is_fetched_over_rest(self, mock_fetch, mock_texts, mock_get):
+        import base64
+        from django.utils.dateparse import parse_datetime
+        from kiri_project.tasks import sync_publications
+        Publication.objects.create(
+            repo_name='rst-notes', title='Rst Notes', slug='rst-notes', html_content='<p>old</p>', readme_sha='deadbeef',
+            github_url='https://github.com/kiri-labs/rst-notes', pushed_at=parse_datetime('2026-08-01T10:00:00Z'),
+        )
+        # GraphQL only looks for README.md / readme.md, so it reports no blob for Readme.markdown
+        mock_fetch.return_value = [{
+            'name': 'rst-notes', 'owner_login': 'kiri-labs', 'html_url': 'https://github.com/kiri-labs/rst-notes',
+            'description': 'Notes', 'topics': [], 'pushed_at': '2026-09-01T10:00:00Z', 'created_at': None,
+            'default_branch': 'main', 'readme': None, 'readme_sha': '',
+        }]
+        response = MagicMock(status_code=200, headers={})
+        response.json.return_value = {'content': base64.b64encode(b'# Field Notes').decode(), 'sha': 'cafe01'}
+        mock_get.return_value = response
+
+        sync_publications.call_local()
+
+        self.assertTrue(mock_get.call_args.args[0].endswith('repos/kiri-labs/rst-notes/readme'))
+        pub = Publication.objects.get(repo_name='rst-notes')
+        self.assertIn('Field Notes', pub.html_content)
+        self.assertEqual(pub.readme_sha, 'cafe01')
+
+    @patch('kiri_project.tasks._fetch_readme_rest')
+    @patch('projects.services.GitHubService.fetch_org_repos_graphql')
+    def test_empty_sha_removes_readme_only_once_rest_confirms(self, mock_fetch, mock_rest):
+        from django.utils.dateparse import parse_datetime
+        from kiri_project.tasks import sync_publications
+        Publication.objects.create(
+            repo_name='gone-readme', title='Gone Readme', slug='gone-readme', html_content='<p>kept</p>',
+            readme_sha='deadbeef', github_url='https://github.com/kiri-labs/gone-readme',
+            pushed_at=parse_datetime('2026-08-01T10:00:00Z'),
+        )
+        mock_fetch.side_effect = lambda *args, **kwargs: [{
+            'name': 'gone-readme', 'owner_login': 'kiri-labs', 'html_url': 'https://github.com/kiri-labs/gone-readme',
+            'description': 'Notes', 'topics': [], 'pushed_at': '2026-09-01T10:00:00Z', 'created_at': None,
+            'default_branch': 'main', 'readme': None, 'readme_sha': '',
+        }]
+
+        # Not confirmed (no README text came back): the stored README stays
+        with patch('kiri_project.tasks._fill_changed_readmes'):
+            sync_publications.call_local()
+        pub = Publication.objects.get(repo_name='gone-readme')
+        self.assertEqual((pub.html_content, pub.readme_sha), ('<p>kept</p>', 'deadbeef'))
+
+        # REST /readme answered 404: the README really was removed
+        mock_rest.return_value = ('', '')
+        sync_publications.call_local()
+        pub = Publication.objects.get(repo_name='gone-readme')
+        self.assertEqual((pub.html_content, pub.readme_sha), ('', ''))
+
+    @patch('publications.utils.process_markdown')
+    @patch('projects.services.GitHubService.fetch_repos_graphql')
+    @patch('projects.services.GitHubService.fetch_org_repos_graphql')
+    def test_sync_skips_unchanged_readmes(self, mock_fetch, mock_readmes, mock_render):
+        from django.utils.dateparse import parse_datetime
+        from kiri_project.tasks import sync_publications
+        pushed_at = '2026-09-01T10:00:00Z'
+        Publication.objects.create(
+            repo_name='stable', title='Stable', slug='stable', html_content='<p>cached</p>',
+            github_url='https://github.com/kiri-labs/stable', description='Same', topics='kiri-article',
+            published_at=parse_datetime(pushed_at), pushed_at=parse_datetime(pushed_at), readme_sha='abc123',
+        )
+        mock_fetch.return_value = [{
+            'name': 'stable', 'owner_login': 'kiri-labs', 'html_url': 'https://github.com/kiri-labs/stable',
+            'description': 'Same', 'topics': ['kiri-article'], 'pushed_at': pushed_at, 'created_at': None,
+            'default_branch': 'main', 'readme': None, 'readme_sha': 'abc123',
+        }]
+
+        stats = sync_publications.call_local()
+
+        self.assertEqual(stats['skipped'], 1)
+        self.assertEqual(stats['rendered'], 0)
+        mock_readmes.assert_not_called()
+        mock_render.assert_not_called()
+        self.assertEqual(Publication.objects.get(repo_name='stable').html_content, '<p>cached</p>')
+
+    @patch('kiri_project.http_client.get')
+    @patch('projects.services.GitHubService.fetch_org_repos_graphql', return_value=None)
+    def test_failed_readme_download_keeps_content(self, mock_graphql, mock_get):
+        import requests
+        from django.utils.dateparse import parse_datetime
+        from kiri_project.tasks import sync_publications
+        old_push = parse_datetime('2026-08-01T10:00:00Z')
+        Publication.objects.create(
+            repo_name='flaky', title='Flaky', slug='flaky', html_content='<p>kept</p>', readme_sha='abc123',
+            github_url='https://github.com/kiri-labs/flaky', published_at=old_push, pushed_at=old_push,
+        )
+        repos = MagicMock(status_code=200, headers={})
+        repos.json.return_value = [{
+            'name': 'flaky', 'owner': {'login': 'kiri-labs'}, 'html_url': 'https://github.com/kiri-labs/flaky',
+            'description': 'New description', 'topics': [], 'pushed_at': '2026-09-01T10:00:00Z',
+            'created_at': None, 'default_branch': 'main',
+        }]
+
+        def get(url, **kwargs):
+            if url.endswith('/readme'):
+                raise requests.ConnectionError("reset by peer")
+            return repos
+        mock_get.side_effect = get
+
+        sync_publications.call_local()
+
+        pub = Publication.objects.get(repo_name='flaky')
+        self.assertEqual(pub.html_content, '<p>kept</p>')
+        self.assertEqual(pub.readme_sha, 'abc123')
+        self.assertEqual(pub.pushed_at, old_push)
+        self.assertEqual(pub.description, 'New description')
+
+    @patch('kiri_project.http_client.get')
+    @patch('projects.services.GitHubService.fetch_repos_graphql', return_value={})
+    def test_repo_resync_logs_network_errors(self, mock_graphql, mock_get):
+        import requests
+        from kiri_project.tasks import sync_publication_repo
+        mock_get.side_effect = requests.ConnectionError("reset by peer")
+
+        with self.assertLogs('kiri_project.tasks', level='ERROR'):
+            sync_publication_repo.call_local('flaky')
+
+        self.assertFalse(Publication.objects.filter(repo_name='flaky').exists())
@@ -1,32 +1,290 @@
 import re
+import hashlib
+import threading
+from collections import OrderedDict
 import markdown
 
-def process_markdown(owner, repo_name, default_branch, raw_markdown):
+MARKDOWN_EXTENSIONS = ['fenced_code', 'codehilite', 'tables', 'toc']
+# Without Pygments: cheap enough to check that a block split renders like the whole document
+LAYOUT_EXTENSIONS = ['fenced_code', 'tables', 'toc']
+
+# Matches ![alt](path) where path does not start with http or data:
+IMAGE_LINK_RE = re.compile(r'!\[([^\]]*)\]\((?!http|data:)(.*?)\)')
+# Matches [text](path) where path does not start with http, mailto:, or #
+DOC_LINK_RE = re.compile(r'\[([^\]]+)\]\((?!http|mailto:|#)(.*?)\)')
+
+# Block splitting for incremental rendering
+FENCE_OPEN_RE = re.compile(r'^(`{3,}|~{3,})[^`\n]*$')
+ATX_HEADING_RE = re.compile(r'^#{1,6}(\s|$)')
+HTML_BLOCK_OPEN_RE = re.compile(r'^<([a-zA-Z][a-zA-Z0-9-]*)[\s>/]')
+# Markup that only renders correctly with the whole document in view
+GLOBAL_MARKUP_RE = re.compile(r'^ {0,3}(\[TOC\]\s*$|\[[^\]]+\]:\s)', re.MULTILINE)
+HEADING_ID_RE = re.compile(r'<(h[1-6]) id="([^"]*)"')
+
+# Rendered documents and blocks kept per process, keyed by a hash of the render inputs
+RENDER_CACHE_SIZE = 1024
+# Shared copy in the "markdown" cache alias so other processes (huey, management commands) reuse renders
+RENDER_CACHE_ALIAS = 'markdown'
+RENDER_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+_engines = threading.local()
+_render_cache = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+def get_markdown_engine():
     """
-    Transforms raw GitHub markdown into safe, premium HTML.
-    Rewrites relative image and document links to absolute GitHub URLs.
+    Returns this thread's Markdown instance, reset and ready for a new document.
+    Building one loads every extension and compiles its patterns, so it is reused.
     """
-    
+    engine = getattr(_engines, 'markdown', None)
+    if engine is None:
+        engine = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        _engines.markdown = engine
+    return engine.reset()
+
+
+def _layout_engine():
+    engine = getattr(_engines, 'layout', None)
+    if engine is None:
+        engine = markdown.Markdown(extensions=LAYOUT_EXTENSIONS)
+        _engines.layout = engine
+    return engine.reset()
+
+
+def render_cache_key(owner, repo_name, default_branch, raw_markdown):
+    """Content hash of everything that affects the rendered HTML."""
+    payload = "\0".join((owner, repo_name, default_branch, raw_markdown))
+    return f"md_render:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def _shared_render_cache():
+    from django.core.cache import caches
+    return caches[RENDER_CACHE_ALIAS]
+
+
+def _cache_get(key):
+    with _render_cache_lock:
+        html_content = _render_cache.get(key)
+        if html_content is not None:
+            _render_cache.move_to_end(key)
+    if html_content is not None:
+        return html_content
+
+    html_content = _shared_render_cache().get(key)
+    if html_content is not None:
+        _cache_put(key, html_content, shared=False)
+    return html_content
+
+
+def _cache_put(key, html_content, shared=True):
+    with _render_cache_lock:
+        _render_cache[key] = html_content
+        _render_cache.move_to_end(key)
+        while len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+    if shared:
+        _shared_render_cache().set(key, html_content, RENDER_CACHE_TIMEOUT)
+
+
+def _cache_get_many(keys):
+    """Looks blocks up locally first, then in the shared cache with a single query."""
+    found = {}
+    with _render_cache_lock:
+        for key in keys:
+            if key in _render_cache:
+                _render_cache.move_to_end(key)
+                found[key] = _render_cache[key]
+    missing = [key for key in keys if key not in found]
+    if missing:
+        shared = _shared_render_cache().get_many(missing)
+        for key, html_content in shared.items():
+            _cache_put(key, html_content, shared=False)
+        found.update(shared)
+    return found
+
+
+def _cache_put_many(entries):
+    """Stores several renders locally and in the shared cache with a single write."""
+    if not entries:
+        return
+    for key, html_content in entries.items():
+        _cache_put(key, html_content, shared=False)
+    _shared_render_cache().set_many(entries, RENDER_CACHE_TIMEOUT)
+
+
+def clear_render_cache():
+    """Empties the per-process render cache (the shared copy expires on its own)."""
+    with _render_cache_lock:
+        _render_cache.clear()
+
+
+def rewrite_relative_links(owner, repo_name, default_branch, raw_markdown):
+    """Rewrites relative image and document links to absolute GitHub URLs."""
     # 1. Rewrite relative image links
-    # Matches ![alt](path) where path does not start with http or data:
-    image_regex = r'!\[([^\]]*)\]\((?!http|data:)(.*?)\)'
     image_repl = rf'![\1](https://raw.githubusercontent.com/{owner}/{repo_name}/{default_branch}/\2)'
-    markdown_text = re.sub(image_regex, image_repl, raw_markdown)
-    
+    markdown_text = IMAGE_LINK_RE.sub(image_repl, raw_markdown)
+
     # 2. Rewrite relative document links
-    # Matches [text](path) where path does not start with http, mailto:, or #
-    link_regex = r'\[([^\]]+)\]\((?!http|mailto:|#)(.*?)\)'
     link_repl = rf'[\1](https://github.com/{owner}/{repo_name}/blob/{default_branch}/\2)'
-    markdown_text = re.sub(link_regex, link_repl, markdown_text)
-    
+    markdown_text = DOC_LINK_RE.sub(link_repl, markdown_text)
+
     # Clean up any double slashes that might have been inadvertently created
     # e.g., if the relative path started with a slash: /docs/setup.md
-    markdown_text = markdown_text.replace(f"{default_branch}//", f"{default_branch}/")
-    
-    # 3. Compilation
-    html_content = markdown.markdown(
-        markdown_text,
-        extensions=['fenced_code', 'codehilite', 'tables', 'toc']
-    )
-    
+    return markdown_text.replace(f"{default_branch}//", f"{default_branch}/")
+
+
+def split_blocks(markdown_text):
+    """
+    Splits a document into top-level blocks, breaking only before a fenced
+    code block or ATX heading that follows a blank line. Fences are tracked on
+    every line, and nothing inside a fence or a raw HTML block (up to its
+    matching close tag) is ever split. Returns None if a fence or HTML block
+    is never closed.
+    """
+    blocks, current = [], []
+    fence = None
+    html_tag, html_depth = None, 0
+    prev_blank = True
+
+    def flush():
+        text = "\n".join(current).strip("\n")
+        if text:
+            blocks.append(text)
+        current.clear()
+
+    for line in markdown_text.split("\n"):
+        if fence:
+            current.append(line)
+            if line.rstrip() == fence:
+                fence = None
+            prev_blank = False
+            continue
+        if html_tag:
+            current.append(line)
+            html_depth += _tag_balance(html_tag, line)
+            if html_depth <= 0:
+                html_tag = None
+            prev_blank = not line.strip()
+            continue
+
+        fence_match = FENCE_OPEN_RE.match(line)
+        html_match = HTML_BLOCK_OPEN_RE.match(line) if prev_blank else None
+        if prev_blank and (fence_match or html_match or ATX_HEADING_RE.match(line)):
+            flush()
+        current.append(line)
+        if fence_match:
+            fence = fence_match.group(1)
+        elif html_match:
+            html_depth = _tag_balance(html_match.group(1), line)
+            if html_depth > 0:
+                html_tag = html_match.group(1)
+        prev_blank = not line.strip()
+
+    if fence or html_tag:
+        return None
+    flush()
+    return blocks
+
+
+def _tag_balance(tag, line):
+    """Opening minus closing `tag` tags on a line."""
+    opened = len(re.findall(rf'<{tag}[\s>/]', line + ' ', re.IGNORECASE))
+    closed = len(re.findall(rf'</{tag}\s*>', line, re.IGNORECASE))
+    return opened - closed
+
+
+def _layout(html_content):
+    """Rendered HTML without blank lines, which stitching blocks may add or drop."""
+    return "\n".join(line for line in html_content.split("\n") if line.strip())
+
+
+def _pair_adds_up(first, second):
+    """True if two neighbouring blocks rendered separately lay out like the two rendered together."""
+    together = _layout_engine().convert(f"{first}\n\n{second}")
+    apart = _dedupe_heading_ids(f"{_layout_engine().convert(first)}\n{_layout_engine().convert(second)}")
+    return _layout(together) == _layout(apart)
+
+
+def _blocks_add_up(blocks):
+    """
+    True if rendering `blocks` separately lays out like the whole document,
+    checked without Pygments for every pair of neighbouring blocks: blocks
+    only start at a heading, fence or HTML block after a blank line, so a
+    block can only change how the next one parses. Each pair's result is
+    cached by content hash, so an edit only re-checks the pairs around it.
+    """
+    pairs = {
+        f"md_pair:{hashlib.sha256(f'{first}\0{second}'.encode()).hexdigest()}": (first, second)
+        for first, second in zip(blocks, blocks[1:])
+    }
+    checked = _cache_get_many(set(pairs))
+    fresh = {}
+    for key, (first, second) in pairs.items():
+        if key not in checked:
+            checked[key] = fresh[key] = _pair_adds_up(first, second)
+        if not checked[key]:
+            break
+    _cache_put_many(fresh)
+    return all(checked.get(key) for key in pairs)
+
+
+def _dedupe_heading_ids(html_content):
+    """Re-numbers heading ids across stitched blocks exactly as a whole-document toc run would."""
+    from markdown.extensions.toc import unique
+
+    used_ids = set()
+    return HEADING_ID_RE.sub(lambda m: f'<{m.group(1)} id="{unique(m.group(2), used_ids)}"', html_content)
+
+
+def render_blocks(markdown_text):
+    """
+    Renders a document block by block, reusing the cached HTML of every block
+    whose text is unchanged so only new or edited blocks (and their code
+    samples) go through Pygments. Returns None when the document needs a
+    whole-document render, including when its blocks don't lay out like the
+    whole document.
+    """
+    if GLOBAL_MARKUP_RE.search(markdown_text):
+        return None
+    blocks = split_blocks(markdown_text)
+    if not blocks or len(blocks) < 2:
+        return None
+
+    if not _blocks_add_up(blocks):
+        return None
+    keys = [f"md_block:{hashlib.sha256(block.encode()).hexdigest()}" for block in blocks]
+    rendered = _cache_get_many(set(keys))
+    fresh = {}
+    for key, block in zip(keys, blocks):
+        if key not in rendered:
+            rendered[key] = get_markdown_engine().convert(block)
+            fresh[key] = rendered[key]
+    _cache_put_many(fresh)
+
+    return _dedupe_heading_ids("\n".join(rendered[key] for key in keys))
+
+
+def process_markdown(owner, repo_name, default_branch, raw_markdown, use_cache=True):
+    """
+    Transforms raw GitHub markdown into safe, premium HTML.
+    Rewrites relative image and document links to absolute GitHub URLs.
+    Identical input is served from the render cache instead of re-rendering,
+    and unchanged blocks of an edited document reuse their cached HTML.
+    """
+    key = render_cache_key(owner, repo_name, default_branch, raw_markdown) if use_cache else None
+    if key:
+        html_content = _cache_get(key)
+        if html_content is not None:
+            return html_content
+
+    markdown_text = rewrite_relative_links(owner, repo_name, default_branch, raw_markdown)
+
+    # 3. Compilation, block by block where possible
+    html_content = render_blocks(markdown_text)
+    if html_content is None:
+        html_content = get_markdown_engine().convert(markdown_text)
+
+    if key:
+        _cache_put(key, html_content)
     return html_content
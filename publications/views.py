@@ -6,6 +6,7 @@ from django.utils.decorators import method_decorator
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from core.pagination import KeysetPaginationMixin
 from .models import Publication
 from kiri_project.tasks import sync_publications
 
@@ -14,11 +15,12 @@ class StaffRequiredMixin(UserPassesTestMixin):
         return self.request.user.is_staff
 
 @method_decorator(login_not_required, name='dispatch')
-class PublicationListView(ListView):
+class PublicationListView(KeysetPaginationMixin, ListView):
     model = Publication
     template_name = 'publications/publication_list.html'
     context_object_name = 'publications'
     paginate_by = 12
+    keyset = ('-published_at', '-id')
 
 @method_decorator(login_not_required, name='dispatch')
 class PublicationDetailView(DetailView):
@@ -0,0 +1,134 @@
+"""
+Precompiled, in-memory index of tools.registry.
+The registry only changes with a deploy, so it is compiled once per process
+into immutable lookups: word prefixes for typeahead, trigrams for typo
+tolerance, and entries carrying their URL, escaped name and truncated
+description ready for the Spotlight API and the tools hub.
+"""
+import re
+from collections import namedtuple
+from functools import cache
+from types import MappingProxyType
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.text import Truncator
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Weight of a match in each field; typo matches count half
+FIELD_WEIGHTS = (('name', 4), ('title', 2), ('category', 2), ('description', 1))
+# pg_trgm's default similarity threshold
+MIN_SIMILARITY = 0.3
+# Shorter words are only matched as prefixes
+FUZZY_MIN_LENGTH = 3
+SUMMARY_CHARS = 100
+
+ToolEntry = namedtuple(
+    'ToolEntry', 'slug name name_html description summary summary_html url icon category color_classes',
+)
+
+
+def trigrams(word):
+    """Trigrams of a word padded like pg_trgm's ('  w', ' wo', 'wor', ..., 'rd ')."""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a, b):
+    return len(a & b) / len(a | b)
+
+
+class ToolIndex:
+    """Immutable lookups over the tool registry. Build with ToolIndex.build() or use tool_index()."""
+
+    __slots__ = ('entries', 'categories', '_prefixes', '_words', '_word_trigrams', '_trigrams')
+
+    def __init__(self, entries, categories, prefixes, words, word_trigrams, trigram_words):
+        self.entries = entries
+        self.categories = categories
+        self._prefixes = prefixes
+        self._words = words
+        self._word_trigrams = word_trigrams
+        self._trigrams = trigram_words
+
+    @classmethod
+    def build(cls, tools):
+        from .views import COLOR_CLASSES, DEFAULT_COLOR
+
+        entries, categories = [], {}
+        words = {}
+        for position, (slug, tool) in enumerate(tools.items()):
+            summary = Truncator(tool.get('description', '')).chars(SUMMARY_CHARS)
+            entry = ToolEntry(
+                slug, tool['name'], escape(tool['name']), tool.get('description', ''), summary, escape(summary),
+                reverse('tools:tool_detail', args=[slug]), tool.get('icon', 'fa-toolbox'), tool['category'],
+                COLOR_CLASSES.get(tool.get('color', ''), DEFAULT_COLOR),
+            )
+            entries.append(entry)
+            categories.setdefault(entry.category, []).append(entry)
+            for field, weight in FIELD_WEIGHTS:
+                for word in TOKEN_RE.findall(tool.get(field, '').lower()):
+                    weights = words.setdefault(word, {})
+                    weights[position] = max(weights.get(position, 0), weight)
+
+        prefixes, word_trigrams, trigram_words = {}, {}, {}
+        for word, weights in words.items():
+            for end in range(1, len(word) + 1):
+                merged = prefixes.setdefault(word[:end], {})
+                for position, weight in weights.items():
+                    merged[position] = max(merged.get(position, 0), weight)
+            word_trigrams[word] = trigrams(word)
+            for trigram in word_trigrams[word]:
+                trigram_words.setdefault(trigram, []).append(word)
+
+        def freeze(table):
+            return MappingProxyType({key: tuple(value.items()) for key, value in table.items()})
+
+        return cls(
+            tuple(entries),
+            MappingProxyType({category: tuple(items) for category, items in categories.items()}),
+            freeze(prefixes),
+            freeze(words),
+            MappingProxyType(word_trigrams),
+            MappingProxyType({trigram: tuple(found) for trigram, found in trigram_words.items()}),
+        )
+
+    def _fuzzy(self, term):
+        """Entries containing a word similar to `term`, at half weight."""
+        grams = trigrams(term)
+        candidates = {word for trigram in grams for word in self._trigrams.get(trigram, ())}
+        found = {}
+        for word in candidates:
+            if similarity(grams, self._word_trigrams[word]) >= MIN_SIMILARITY:
+                for position, weight in self._words[word]:
+                    found[position] = max(found.get(position, 0), weight / 2)
+        return found
+
+    def search(self, text, limit=5):
+        """
+        Tools matching every word of `text`, best first: each word matches
+        as a prefix or, failing that, as a likely typo of an indexed word.
+        """
+        scores = None
+        for term in TOKEN_RE.findall(text.lower()):
+            matches = dict(self._prefixes.get(term, ()))
+            if not matches and len(term) >= FUZZY_MIN_LENGTH:
+                matches = self._fuzzy(term)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {position: score + matches[position] for position, score in scores.items() if position in matches}
+            if not scores:
+                return []
+        if not scores:
+            return []
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))
+        return [self.entries[position] for position in ranked[:limit]]
+
+
+@cache
+def tool_index():
+    """The process-wide index of tools.registry.TOOLS, compiled on first use (after the URLconf is loaded)."""
+    from .registry import TOOLS
+
+    return ToolIndex.build(TOOLS)
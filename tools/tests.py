@@ -23,3 +23,29 @@ class ToolsViewTests(TestCase):
                 response.status_code, 200, 
                 f"Tool page for '{slug}' (template: {TOOLS[slug]['template']}) failed to render"
             )
+
+
+class ToolIndexTests(TestCase):
+    """The precompiled tool index behind Spotlight and the hub."""
+
+    def test_prefix_typo_and_multi_word_matches(self):
+        from .search import tool_index
+
+        index = tool_index()
+        self.assertEqual(index.search("json")[0].slug, 'json-formatter')
+        self.assertEqual(index.search("rege")[0].slug, 'regex-tester')
+        self.assertEqual(index.search("formater")[0].slug, 'json-formatter')
+        self.assertEqual(index.search("regex json"), [])
+        self.assertEqual(index.search("zzzz"), [])
+
+        entry = index.search("base64")[0]
+        self.assertEqual(entry.url, reverse('tools:tool_detail', args=['base64']))
+        self.assertLessEqual(len(entry.summary), 100)
+        self.assertIs(tool_index(), index)
+
+    def test_hub_lists_every_tool_once(self):
+        response = self.client.get(reverse('tools:index'))
+        self.assertEqual(response.context['tool_count'], len(TOOLS))
+        listed = [tool.slug for tools in response.context['categories'].values() for tool in tools]
+        self.assertEqual(sorted(listed), sorted(TOOLS))
+        self.assertContains(response, reverse('tools:tool_detail', args=['json-formatter']))
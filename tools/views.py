@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_not_required
 from .registry import TOOLS
+from .search import tool_index
 
 # Static class map for Tailwind JIT compatibility.
 # Dynamic classes like bg-{{ color }}-500/5 are purged by Tailwind v4.
@@ -107,22 +108,11 @@ DEFAULT_COLOR = {
 
 @login_not_required
 def index(request):
-    """Tools Hub - displays all available tools grouped by category."""
-    categories = {}
-    tool_count = 0
-    for slug, tool in TOOLS.items():
-        cat = tool['category']
-        if cat not in categories:
-            categories[cat] = []
-        tool_with_slug = tool.copy()
-        tool_with_slug['slug'] = slug
-        tool_with_slug['color_classes'] = COLOR_CLASSES.get(tool.get('color', ''), DEFAULT_COLOR)
-        categories[cat].append(tool_with_slug)
-        tool_count += 1
-
+    """Tools Hub - displays all available tools grouped by category (precompiled once, see tools/search.py)."""
+    tools = tool_index()
     return render(request, 'tools/index.html', {
-        'categories': categories,
-        'tool_count': tool_count,
+        'categories': tools.categories,
+        'tool_count': len(tools.entries),
     })
 
 